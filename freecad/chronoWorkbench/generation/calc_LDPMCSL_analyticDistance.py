@@ -0,0 +1,95 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to calculate the closed-form signed
+## distance from a set of points to the surface of a built-in primitive
+## geometry (see gen_LDPMCSL_analyticField). Solids of revolution are
+## measured in their meridian plane and prisms as the extrusion of their
+## polygon.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_analyticDistance(fieldShape, fieldParams, points):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - fieldShape:       Shape of the geometry (1: box, 2: cone or cylinder,
+                        3: sphere, 4: regular prism)
+    - fieldParams:      Parameters of the shape (see gen_LDPMCSL_analyticField)
+    - points:           (x, y, z) coordinates of the query points
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - distance:         Signed distance of each point to the surface
+                        (positive inside, negative outside)
+    --------------------------------------------------------------------------
+    """
+
+    points = np.atleast_2d(points)[:, 0:3]
+    p = fieldParams
+
+    if fieldShape == 1:
+
+        # Box from its minimum and maximum corners
+        q = np.maximum(p[0:3] - points, points - p[3:6])
+        return -(np.linalg.norm(np.maximum(q, 0), axis=1) + np.minimum(np.max(q, axis=1), 0))
+
+    if fieldShape == 3:
+
+        # Sphere from its center and radius
+        return p[3] - np.linalg.norm(points - p[0:3], axis=1)
+
+    if fieldShape == 2:
+
+        # Distance to the bottom cap, the side and the top cap in the meridian
+        # plane (radius, height) of the cone
+        planeR = np.hypot(points[:,0] - p[0], points[:,1] - p[1])
+        planeZ = points[:,2]
+        segments = [(0, p[2], p[4], p[2]), (p[4], p[2], p[5], p[3]), (p[5], p[3], 0, p[3])]
+        distance = np.full(len(points), np.inf)
+        for [r0, z0, r1, z1] in segments:
+            [dr, dz] = [r1 - r0, z1 - z0]
+            t = np.clip(((planeR - r0)*dr + (planeZ - z0)*dz)/max(dr*dr + dz*dz, 1e-300), 0, 1)
+            distance = np.minimum(distance, np.hypot(planeR - r0 - t*dr, planeZ - z0 - t*dz))
+        inside = (planeZ > p[2]) & (planeZ < p[3]) & \
+            (planeR < p[4] + (p[5] - p[4])*(planeZ - p[2])/(p[3] - p[2]))
+        return np.where(inside, distance, -distance)
+
+    # Regular prism: signed distance to the polygon in the plane, then to the
+    # caps
+    [sides, apothem] = [int(p[5]), p[4]*np.cos(np.pi/p[5])]
+    vertexAngle = p[6] + 2*np.pi*np.arange(sides + 1)/sides
+    vertices = p[4]*np.column_stack((np.cos(vertexAngle), np.sin(vertexAngle)))
+    normalAngle = vertexAngle[0:sides] + np.pi/sides
+    planeX = points[:,0] - p[0]
+    planeY = points[:,1] - p[1]
+
+    edgeGap = apothem - (np.outer(planeX, np.cos(normalAngle)) + np.outer(planeY, np.sin(normalAngle)))
+    outsideDistance = np.full(len(points), np.inf)
+    for k in range(sides):
+        [dx, dy] = vertices[k+1] - vertices[k]
+        t = np.clip(((planeX - vertices[k,0])*dx + (planeY - vertices[k,1])*dy)/(dx*dx + dy*dy), 0, 1)
+        outsideDistance = np.minimum(outsideDistance, np.hypot(planeX - vertices[k,0] - t*dx,\
+            planeY - vertices[k,1] - t*dy))
+    planeDistance = np.where(np.all(edgeGap > 0, axis=1), np.min(edgeGap, axis=1), -outsideDistance)
+    capDistance = np.minimum(points[:,2] - p[2], p[3] - points[:,2])
+
+    return np.where((planeDistance > 0) & (capDistance > 0), np.minimum(planeDistance, capDistance),\
+        -np.hypot(np.maximum(-planeDistance, 0), np.maximum(-capDistance, 0)))
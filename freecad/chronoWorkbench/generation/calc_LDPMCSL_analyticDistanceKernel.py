@@ -0,0 +1,111 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the compiled kernel to calculate the closed-form
+## signed distance from one point to the surface of a built-in primitive
+## geometry. It is the single point version of calc_LDPMCSL_analyticDistance
+## and is only used when Numba is installed.
+##
+## ===========================================================================
+
+import math
+
+from freecad.chronoWorkbench.util.cwJit                                  import cwJit
+
+
+def calc_LDPMCSL_analyticDistanceKernel(fieldShape, fieldParams, x, y, z):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - fieldShape:       Shape of the geometry (see
+                        calc_LDPMCSL_analyticDistance)
+    - fieldParams:      Parameters of the shape (see gen_LDPMCSL_analyticField)
+    - x, y, z:          Coordinates of the query point
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - signedDistance:   Distance from the point to the surface (positive
+                        inside, negative outside)
+    --------------------------------------------------------------------------
+    """
+
+    p = fieldParams
+
+    if fieldShape == 1:
+
+        # Box from its minimum and maximum corners
+        qx = max(p[0] - x, x - p[3])
+        qy = max(p[1] - y, y - p[4])
+        qz = max(p[2] - z, z - p[5])
+        outside = math.sqrt(max(qx, 0.0)**2 + max(qy, 0.0)**2 + max(qz, 0.0)**2)
+        return -(outside + min(max(qx, qy, qz), 0.0))
+
+    if fieldShape == 3:
+
+        # Sphere from its center and radius
+        return p[3] - math.sqrt((x - p[0])**2 + (y - p[1])**2 + (z - p[2])**2)
+
+    if fieldShape == 2:
+
+        # Distance to the bottom cap, the side and the top cap in the meridian
+        # plane (radius, height) of the cone
+        planeR = math.sqrt((x - p[0])**2 + (y - p[1])**2)
+        distance = math.inf
+        for segment in range(3):
+            if segment == 0:
+                r0, z0, r1, z1 = 0.0, p[2], p[4], p[2]
+            elif segment == 1:
+                r0, z0, r1, z1 = p[4], p[2], p[5], p[3]
+            else:
+                r0, z0, r1, z1 = p[5], p[3], 0.0, p[3]
+            dr = r1 - r0
+            dz = z1 - z0
+            t = min(max(((planeR - r0)*dr + (z - z0)*dz)/max(dr*dr + dz*dz, 1e-300), 0.0), 1.0)
+            distance = min(distance, math.sqrt((planeR - r0 - t*dr)**2 + (z - z0 - t*dz)**2))
+        if z > p[2] and z < p[3] and planeR < p[4] + (p[5] - p[4])*(z - p[2])/(p[3] - p[2]):
+            return distance
+        return -distance
+
+    # Regular prism: signed distance to the polygon in the plane, then to the
+    # caps
+    sides = int(p[5])
+    apothem = p[4]*math.cos(math.pi/p[5])
+    planeX = x - p[0]
+    planeY = y - p[1]
+    insideGap = math.inf
+    outsideDistance = math.inf
+    for k in range(sides):
+        angle0 = p[6] + 2*math.pi*k/sides
+        angle1 = p[6] + 2*math.pi*(k + 1)/sides
+        insideGap = min(insideGap, apothem - planeX*math.cos(angle0 + math.pi/sides) \
+            - planeY*math.sin(angle0 + math.pi/sides))
+        vx = p[4]*math.cos(angle0)
+        vy = p[4]*math.sin(angle0)
+        dx = p[4]*math.cos(angle1) - vx
+        dy = p[4]*math.sin(angle1) - vy
+        t = min(max(((planeX - vx)*dx + (planeY - vy)*dy)/(dx*dx + dy*dy), 0.0), 1.0)
+        outsideDistance = min(outsideDistance, math.sqrt((planeX - vx - t*dx)**2 + (planeY - vy - t*dy)**2))
+    planeDistance = insideGap if insideGap > 0 else -outsideDistance
+    capDistance = min(z - p[2], p[3] - z)
+
+    if planeDistance > 0 and capDistance > 0:
+        return min(planeDistance, capDistance)
+    return -math.sqrt(max(-planeDistance, 0.0)**2 + max(-capDistance, 0.0)**2)
+
+
+# Compiled kernel (None if Numba is not installed)
+calc_LDPMCSL_analyticDistanceKernelJit = cwJit(calc_LDPMCSL_analyticDistanceKernel)
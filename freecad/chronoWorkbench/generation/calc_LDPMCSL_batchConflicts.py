@@ -0,0 +1,108 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to find all pairs of overlapping
+## particles within a batch of particles placed concurrently. The particles
+## are sorted into grid cells and all neighboring cells are searched at
+## once, without a loop over the particles. For a wide grading the
+## particles are split into diameter bands with cells sized for each pair
+## of bands.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_batchConflicts(nodes, diameters, parOffset):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - nodes:            (x, y, z) coordinates of the particles in the batch
+    - diameters:        Diameters of the particles in the batch
+    - parOffset:        Minimum offset between particles
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - pairI:            First particle of each overlapping pair
+    - pairJ:            Second particle of each overlapping pair (pairI < pairJ)
+    --------------------------------------------------------------------------
+    """
+
+    nodes = np.asarray(nodes)[:, 0:3]
+    diameters = np.asarray(diameters)
+    nPar = len(nodes)
+
+    if nPar < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Diameter bands within a factor 2 of each other. Each pair of bands is
+    # searched on cells as large as the largest interaction distance between
+    # the two bands, so the small particles of a wide grading are not
+    # compared with every particle in a cell sized for the largest ones
+    maxDiameter = np.max(diameters)
+    band = np.minimum(np.floor(np.log2(maxDiameter/np.maximum(diameters, 1e-3*maxDiameter))), 8).astype(np.int64)
+    bands = np.unique(band)
+    bandMax = np.zeros(np.max(bands) + 1)
+    np.maximum.at(bandMax, band, diameters)
+    gridMin = np.min(nodes, axis=0)
+
+    pairI = []
+    pairJ = []
+    for bandA in bands:
+        for bandB in bands[bands >= bandA]:
+
+            # Cells padded by one cell so the neighbor keys stay positive
+            cellSize = (bandMax[bandA] + bandMax[bandB])/2 + parOffset
+            cellIndex = np.floor((nodes - gridMin)/cellSize).astype(np.int64) + 1
+            gridDims = np.max(cellIndex, axis=0) + 2
+            cellKey = (cellIndex[:,0]*gridDims[1] + cellIndex[:,1])*gridDims[2] + cellIndex[:,2]
+
+            memberA = np.flatnonzero(band == bandA)
+            memberB = np.flatnonzero(band == bandB)
+            order = memberB[np.argsort(cellKey[memberB], kind='stable')]
+            sortedKey = cellKey[order]
+
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+
+                    # Range of sorted particles in the three neighboring cells
+                    # along z, which have consecutive keys
+                    neighborKey = cellKey[memberA] + (dx*gridDims[1] + dy)*gridDims[2]
+                    lo = np.searchsorted(sortedKey, neighborKey - 1, side='left')
+                    hi = np.searchsorted(sortedKey, neighborKey + 1, side='right')
+                    counts = hi - lo
+                    total = np.sum(counts)
+                    if total == 0:
+                        continue
+
+                    # Expand the ranges into candidate pairs
+                    first = np.repeat(memberA, counts)
+                    rangeStart = np.repeat(lo - np.cumsum(counts) + counts, counts)
+                    second = order[rangeStart + np.arange(total)]
+
+                    keep = first < second if bandA == bandB else first != second
+                    pairI.append(np.minimum(first, second)[keep])
+                    pairJ.append(np.maximum(first, second)[keep])
+
+    pairI = np.concatenate(pairI + [np.zeros(0, dtype=np.int64)])
+    pairJ = np.concatenate(pairJ + [np.zeros(0, dtype=np.int64)])
+
+    # Keep the pairs that are too close
+    distance = np.linalg.norm(nodes[pairI] - nodes[pairJ], axis=1)
+    overlap = distance - diameters[pairI]/2 - diameters[pairJ]/2 - parOffset < 0
+
+    return pairI[overlap], pairJ[overlap]
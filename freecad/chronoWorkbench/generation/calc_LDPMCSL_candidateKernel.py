@@ -0,0 +1,170 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the compiled kernel that tests candidate positions of
+## a particle one after the other: overlap with the placed particles of the
+## neighboring cells, then surface clearance from the depth of the tet of
+## the candidate, the signed distance field (closed-form for built-in
+## primitives) or, where neither can decide,
+## from the exact surface distance. It works on the arrays of the cell
+## list, distance field and surface hierarchy directly and is only used
+## when Numba is installed (see cwJit).
+##
+## ===========================================================================
+
+import math
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_analyticDistanceKernel import calc_LDPMCSL_analyticDistanceKernelJit
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistanceKernel import calc_LDPMCSL_surfaceDistanceKernelJit
+from freecad.chronoWorkbench.util.cwJit                                  import cwJit
+
+
+def calc_LDPMCSL_candidateKernel(candidates, parDiameter, parOffset, required, nodes,
+    parDiameterList, cellMin, levelReach, cellSize, cellDims, cellStart, cellTable, cellCount,
+    candidateDepth, fieldMin, fieldSpacing, fieldValues, fieldShape, fieldParams, fieldError,
+    surfaceArrays):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - candidates:       (x, y, z) coordinates of the candidates, in order
+    - parDiameter:      Diameter of the particle
+    - parOffset:        Minimum offset between particles
+    - required:         Required distance from the surface
+    - nodes:            List of nodes
+    - parDiameterList:  List of particle diameters
+    - cellMin, levelReach, cellSize, cellDims, cellStart, cellTable, cellCount:
+                        Arrays of the cell list (see gen_LDPMCSL_cellList)
+    - candidateDepth:   Lower bound of the distance from each candidate to
+                        the surface (-inf where it is not known)
+    - fieldMin, fieldSpacing, fieldValues:
+                        Arrays of the signed distance field (see
+                        gen_LDPMCSL_distanceField), fieldValues is empty if
+                        there is no distance field
+    - fieldShape, fieldParams, fieldError:
+                        Closed-form distance of a built-in primitive (see
+                        gen_LDPMCSL_analyticField), fieldShape is 0 if
+                        there is none
+    - surfaceArrays:    Tuple of the arrays of the surface hierarchy, in the
+                        order of calc_LDPMCSL_surfaceDistanceKernel
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - index:            Index of the first valid candidate (-1 if there is
+                        none)
+    --------------------------------------------------------------------------
+    """
+
+    errorBound = math.sqrt(3.0) * fieldSpacing
+
+    for c in range(candidates.shape[0]):
+
+        x = candidates[c,0]
+        y = candidates[c,1]
+        z = candidates[c,2]
+
+        # Check the placed particles of the cells within reach on each level
+        overlap = False
+        for level in range(len(levelReach)):
+            reach = parDiameter/2 + levelReach[level]
+            size = cellSize[level]
+            loI = min(max(int(math.floor((x - reach - cellMin[0]) / size)), 0), cellDims[level,0] - 1)
+            loJ = min(max(int(math.floor((y - reach - cellMin[1]) / size)), 0), cellDims[level,1] - 1)
+            loK = min(max(int(math.floor((z - reach - cellMin[2]) / size)), 0), cellDims[level,2] - 1)
+            hiI = min(max(int(math.floor((x + reach - cellMin[0]) / size)), 0), cellDims[level,0] - 1)
+            hiJ = min(max(int(math.floor((y + reach - cellMin[1]) / size)), 0), cellDims[level,1] - 1)
+            hiK = min(max(int(math.floor((z + reach - cellMin[2]) / size)), 0), cellDims[level,2] - 1)
+            for i in range(loI, hiI+1):
+                for j in range(loJ, hiJ+1):
+                    for k in range(loK, hiK+1):
+                        cell = cellStart[level] + (i * cellDims[level,1] + j) * cellDims[level,2] + k
+                        for slot in range(cellCount[cell]):
+                            par = cellTable[cell, slot]
+                            dx = x - nodes[par,0]
+                            dy = y - nodes[par,1]
+                            dz = z - nodes[par,2]
+                            if math.sqrt(dx*dx + dy*dy + dz*dz) - parDiameter/2 \
+                                - parDiameterList[par]/2 - parOffset < 0:
+                                overlap = True
+                                break
+                        if overlap:
+                            break
+                    if overlap:
+                        break
+                if overlap:
+                    break
+            if overlap:
+                break
+
+        if overlap:
+            continue
+
+        # Candidates in tets deep enough inside are clear of the surface
+        if candidateDepth[c] >= required:
+            return c
+
+        # Closed-form distance of a built-in primitive, the exact surface
+        # distance only decides within the gap between the mesh and the surface
+        if fieldShape > 0:
+            distance = calc_LDPMCSL_analyticDistanceKernelJit(fieldShape, fieldParams, x, y, z)
+            if distance - fieldError >= required:
+                return c
+            if distance + fieldError >= required and \
+                calc_LDPMCSL_surfaceDistanceKernelJit(x, y, z, *surfaceArrays) >= required:
+                return c
+            continue
+
+        # Without a distance field the exact surface distance decides
+        if fieldValues.size == 0:
+            if calc_LDPMCSL_surfaceDistanceKernelJit(x, y, z, *surfaceArrays) >= required:
+                return c
+            continue
+
+        # Trilinear interpolation of the distance field (points outside the
+        # grid are outside the geometry)
+        localX = (x - fieldMin[0]) / fieldSpacing
+        localY = (y - fieldMin[1]) / fieldSpacing
+        localZ = (z - fieldMin[2]) / fieldSpacing
+        fieldI = int(math.floor(localX))
+        fieldJ = int(math.floor(localY))
+        fieldK = int(math.floor(localZ))
+        if fieldI < 0 or fieldI >= fieldValues.shape[0] - 1 or \
+            fieldJ < 0 or fieldJ >= fieldValues.shape[1] - 1 or \
+            fieldK < 0 or fieldK >= fieldValues.shape[2] - 1:
+            continue
+        tx = min(max(localX - fieldI, 0.0), 1.0)
+        ty = min(max(localY - fieldJ, 0.0), 1.0)
+        tz = min(max(localZ - fieldK, 0.0), 1.0)
+
+        distance = 0.0
+        for a in range(2):
+            for b in range(2):
+                for e in range(2):
+                    weight = (tx if a == 1 else 1 - tx) * (ty if b == 1 else 1 - ty) \
+                        * (tz if e == 1 else 1 - tz)
+                    distance += weight * fieldValues[fieldI+a, fieldJ+b, fieldK+e]
+
+        if distance - errorBound >= required:
+            return c
+        if distance + errorBound >= required and \
+            calc_LDPMCSL_surfaceDistanceKernelJit(x, y, z, *surfaceArrays) >= required:
+            return c
+
+    return -1
+
+
+# Compiled kernel (None if Numba is not installed)
+calc_LDPMCSL_candidateKernelJit = cwJit(calc_LDPMCSL_candidateKernel)
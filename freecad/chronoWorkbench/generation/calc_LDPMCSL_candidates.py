@@ -0,0 +1,90 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to draw candidate positions of a
+## particle. Candidates are drawn in fixed blocks from the random stream of
+## the particle, so candidate k of a particle is always the same point for
+## a given seed, whichever function or process tests it. Candidates drawn
+## in a tet get the depth of the tet, if it is known, so that deep
+## candidates can skip the surface checks.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_tetSamples          import calc_LDPMCSL_tetSamples
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+
+
+def calc_LDPMCSL_candidates(vertices, tets, tetSampler, seed, parIndex, start, count):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - vertices:         Vertices of the mesh
+    - tets:             Tets of the mesh
+    - tetSampler:       Volume-weighted tet sampler of the mesh (or None)
+    - seed:             Random seed of the generation (or None)
+    - parIndex:         Index of the particle in the particle list
+    - start:            Index of the first candidate to return
+    - count:            Number of candidates to return
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - candidates:       (x, y, z) coordinates of candidates start to
+                        start+count-1 of the particle
+    - candidateDepth:   Lower bound of the distance from each candidate to
+                        the surface (-inf where it is not known, see
+                        update_LDPMCSL_tetDepth)
+    --------------------------------------------------------------------------
+    """
+
+    blockSize = 64
+
+    firstBlock = start // blockSize
+    lastBlock = (start + count - 1) // blockSize
+
+    blocks = []
+    depths = []
+    for block in range(firstBlock, lastBlock+1):
+
+        rng = gen_LDPMCSL_randomStream(seed, 1, parIndex, block)
+
+        # Uniform point selection in the volume, or random point selection
+        # in random tet prism containers
+        if tetSampler is not None:
+            [points, tetIndex] = calc_LDPMCSL_tetSamples(tetSampler, blockSize, rng)
+            blocks.append(points)
+            if 'tetDepth' in tetSampler:
+                depths.append(tetSampler['tetDepth'][tetIndex])
+            else:
+                depths.append(np.full(blockSize, -np.inf))
+        else:
+            randomN = rng.random((blockSize,4))
+            tetIndex = (randomN[:,0] * len(tets)).astype(int)
+            tetVerts = vertices[tets[tetIndex]-1][:,:,0:3]
+
+            tetMin = np.amin(tetVerts, axis=1)
+            tetMax = np.amax(tetVerts, axis=1)
+
+            blocks.append(randomN[:,1:4] * (tetMax - tetMin) + tetMin)
+            depths.append(np.full(blockSize, -np.inf))
+
+    offset = start - firstBlock*blockSize
+    candidates = np.concatenate(blocks)[offset:offset+count]
+    candidateDepth = np.concatenate(depths)[offset:offset+count]
+
+    return candidates, candidateDepth
@@ -0,0 +1,81 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to collect, for a set of points at once,
+## all placed particles that can interact with a particle centered at each
+## point, searching each level of the cell list over the cells within reach
+## for the diameter band of that level
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_cellNeighborPairs(cellList, points, parDiameters):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - cellList:         Cell list (see gen_LDPMCSL_cellList)
+    - points:           (x, y, z) coordinates of the query points
+    - parDiameters:     Diameter of the particle centered at each point
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - pairPoints:       Index of the query point of each pair
+    - pairParticles:    Index of the placed particle of each pair
+    --------------------------------------------------------------------------
+    """
+
+    points = np.atleast_2d(points)[:, 0:3]
+    parDiameters = np.ravel(parDiameters) + np.zeros(len(points))
+
+    cellPoints = []
+    cells = []
+    for level in range(len(cellList['levelDiameter'])):
+
+        cellDims = cellList['cellDims'][level]
+        reach = (parDiameters/2 + cellList['levelReach'][level])[:, np.newaxis]
+
+        # Range of cells within reach of each point (limited to the grid)
+        lo = np.floor((points - reach - cellList['cellMin']) / cellList['cellSize'][level]).astype(int)
+        hi = np.floor((points + reach - cellList['cellMin']) / cellList['cellSize'][level]).astype(int)
+        lo = np.clip(lo, 0, cellDims - 1)
+        hi = np.clip(hi, 0, cellDims - 1)
+
+        # Offsets covering the widest range, masked to the range of each point
+        span = np.max(hi - lo, axis=0) + 1 if len(points) > 0 else np.ones(3, dtype=int)
+        offsets = np.array([[i,j,k] for i in range(span[0]) for j in range(span[1]) for k in range(span[2])])
+        neighborIJK = lo[:, np.newaxis, :] + offsets[np.newaxis, :, :]
+        valid = np.all(neighborIJK <= hi[:, np.newaxis, :], axis=2)
+
+        cellPoints.append(np.nonzero(valid)[0])
+        neighborIJK = neighborIJK[valid]
+        cells.append(cellList['cellStart'][level] + (neighborIJK[:,0] * cellDims[1]\
+            + neighborIJK[:,1]) * cellDims[2] + neighborIJK[:,2])
+
+    cellPoints = np.concatenate(cellPoints)
+    cells = np.concatenate(cells)
+
+    # Gather only the occupied part of each cell
+    maxCount = cellList['cellCount'][cells].max() if len(cells) > 0 else 0
+    table = cellList['cellTable'][cells, :maxCount]
+    occupied = table >= 0
+
+    pairPoints = np.broadcast_to(cellPoints[:, np.newaxis], table.shape)[occupied]
+    pairParticles = table[occupied]
+
+    return pairPoints, pairParticles
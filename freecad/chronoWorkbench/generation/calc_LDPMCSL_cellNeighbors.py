@@ -0,0 +1,66 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to collect the indices of all placed
+## particles that can interact with a particle centered at a point. Each
+## level of the cell list is searched over the cells within reach of the
+## particle for the diameter band of that level.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_cellNeighbors(cellList, center, parDiameter):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - cellList:         Cell list (see gen_LDPMCSL_cellList)
+    - center:           (x, y, z) position of the point
+    - parDiameter:      Diameter of the particle centered at the point
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - neighbors:        Indices of the particles in the cells within reach
+    --------------------------------------------------------------------------
+    """
+
+    center = np.ravel(center)[0:3]
+
+    cells = []
+    for level in range(len(cellList['levelDiameter'])):
+
+        cellDims = cellList['cellDims'][level]
+        reach = parDiameter/2 + cellList['levelReach'][level]
+
+        # Range of cells within reach (limited to the grid)
+        lo = np.floor((center - reach - cellList['cellMin']) / cellList['cellSize'][level]).astype(int)
+        hi = np.floor((center + reach - cellList['cellMin']) / cellList['cellSize'][level]).astype(int)
+        lo = np.clip(lo, 0, cellDims - 1)
+        hi = np.clip(hi, 0, cellDims - 1)
+
+        i, j, k = np.meshgrid(np.arange(lo[0], hi[0]+1), np.arange(lo[1], hi[1]+1),
+            np.arange(lo[2], hi[2]+1), indexing='ij')
+        cells.append(cellList['cellStart'][level] + ((i * cellDims[1] + j) * cellDims[2] + k).ravel())
+
+    cells = np.concatenate(cells)
+
+    # Gather only the occupied part of each cell
+    maxCount = cellList['cellCount'][cells].max()
+    neighbors = cellList['cellTable'][cells, :maxCount].ravel()
+
+    return neighbors[neighbors >= 0]
@@ -0,0 +1,74 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to interpolate the signed distance field
+## at a set of points. Since the signed distance changes by at most the
+## distance moved, the interpolated value is within sqrt(3) grid spacings
+## of the exact value, which is returned as the error bound. The
+## closed-form distance of a built-in primitive (see
+## gen_LDPMCSL_analyticField) is evaluated directly instead.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_analyticDistance    import calc_LDPMCSL_analyticDistance
+
+
+def calc_LDPMCSL_distanceFieldLookup(distanceField, points):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - distanceField:    Signed distance field (see gen_LDPMCSL_distanceField
+                        or gen_LDPMCSL_analyticField)
+    - points:           (x, y, z) coordinates of the query points
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - distance:         Interpolated signed distance of each point (-inf for
+                        points outside the grid, which are outside the
+                        geometry)
+    - errorBound:       Maximum difference from the exact signed distance
+    --------------------------------------------------------------------------
+    """
+
+    if 'fieldShape' in distanceField:
+        return calc_LDPMCSL_analyticDistance(distanceField['fieldShape'], distanceField['fieldParams'],\
+            points), distanceField['fieldError']
+
+    values = distanceField['fieldValues']
+    spacing = distanceField['fieldSpacing']
+    points = np.atleast_2d(points)[:, 0:3]
+
+    # Grid cell containing each point and local coordinates in the cell
+    local = (points - distanceField['fieldMin']) / spacing
+    cell = np.floor(local).astype(int)
+    inGrid = np.all((cell >= 0) & (cell < np.array(values.shape) - 1), axis=1)
+    cell = np.clip(cell, 0, np.array(values.shape) - 2)
+    t = np.clip(local - cell, 0, 1)
+
+    # Trilinear interpolation of the 8 corner values
+    distance = np.zeros(len(points))
+    for corner in range(8):
+        offset = np.array([(corner >> 2) & 1, (corner >> 1) & 1, corner & 1])
+        weight = np.prod(np.where(offset == 1, t, 1 - t), axis=1)
+        distance += weight * values[cell[:,0]+offset[0], cell[:,1]+offset[1], cell[:,2]+offset[2]]
+
+    distance[~inGrid] = -np.inf
+    errorBound = np.sqrt(3) * spacing
+
+    return distance, errorBound
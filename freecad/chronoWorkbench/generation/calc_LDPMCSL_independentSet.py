@@ -0,0 +1,59 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to select a maximal subset of particles
+## without conflicts from a batch of particles placed concurrently. Lower
+## indices (larger particles) win, which gives the same subset as keeping
+## the particles one by one in order, but in a few vectorized rounds.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_independentSet(nPar, pairI, pairJ):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - nPar:             Number of particles in the batch
+    - pairI:            First particle of each conflicting pair
+    - pairJ:            Second particle of each conflicting pair (pairI < pairJ)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - keep:             Boolean array, True for the particles that are kept
+    --------------------------------------------------------------------------
+    """
+
+    keep = np.zeros(nPar, dtype=bool)
+    undecided = np.ones(nPar, dtype=bool)
+
+    while np.any(undecided):
+
+        # Particles with an undecided conflict of lower index must wait
+        active = undecided[pairI] & undecided[pairJ]
+        waiting = np.zeros(nPar, dtype=bool)
+        waiting[pairJ[active]] = True
+
+        selected = undecided & ~waiting
+        keep[selected] = True
+        undecided[selected] = False
+
+        # Particles in conflict with a kept particle are dropped
+        undecided[pairJ[selected[pairI]]] = False
+
+    return keep
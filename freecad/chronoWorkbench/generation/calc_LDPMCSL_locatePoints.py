@@ -0,0 +1,73 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to find the tet containing each of a
+## set of points using the tet tree.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_locatePoints(tetTree, points):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - tetTree:          Tet tree (see gen_LDPMCSL_tetTree)
+    - points:           (x, y, z) coordinates of the query points
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - tetIDs:           Index of the tet containing each point (0-based
+                        row of meshTets, -1 if outside the mesh)
+    --------------------------------------------------------------------------
+    """
+
+    tree = tetTree['tree']
+    points = np.atleast_2d(points)[:, 0:3]
+    tetIDs = -np.ones(len(points), dtype=np.int64)
+
+    # Traverse the tree for all points at once, keeping the nodes whose box
+    # contains the point
+    pts = np.arange(len(points))
+    nodes = np.zeros(len(points), dtype=np.int64)
+    while len(pts) > 0:
+        keep = np.all((points[pts] >= tree['nodeMin'][nodes]) &
+            (points[pts] <= tree['nodeMax'][nodes]), axis=1) & (tetIDs[pts] < 0)
+        pts = pts[keep]
+        nodes = nodes[keep]
+
+        leaf = tree['nodeLeft'][nodes] < 0
+        if leaf.any():
+
+            # Expand each (point, leaf) pair into (point, tet) pairs
+            counts = tree['nodeCount'][nodes[leaf]]
+            pairPts = np.repeat(pts[leaf], counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            tets = tree['primOrder'][np.repeat(tree['nodeStart'][nodes[leaf]], counts) + offsets]
+
+            # Barycentric coordinates of each point in each candidate tet
+            bary = np.einsum('ijk,ik->ij', tetTree['tetInverse'][tets],
+                points[pairPts] - tetTree['tetOrigin'][tets])
+            inside = np.all(bary >= 0, axis=1) & (np.sum(bary, axis=1) <= 1) & \
+                tetTree['tetValid'][tets]
+            tetIDs[pairPts[inside]] = tets[inside]
+
+        pts = np.concatenate((pts[~leaf], pts[~leaf]))
+        nodes = np.concatenate((tree['nodeLeft'][nodes[~leaf]], tree['nodeRight'][nodes[~leaf]]))
+
+    return tetIDs
@@ -0,0 +1,47 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to calculate a hash of the surface mesh
+## that identifies cached data generated for the same geometry.
+##
+## ===========================================================================
+
+import hashlib
+import numpy as np
+
+
+def calc_LDPMCSL_meshHash(surfaceNodes, surfaceFaces, *extras):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - surfaceNodes:     (x, y, z) coordinates of the surface mesh nodes
+    - surfaceFaces:     Surface triangles
+    - extras:           Additional values the cached data depends on
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - meshHash:         Hexadecimal hash string
+    --------------------------------------------------------------------------
+    """
+
+    meshHash = hashlib.sha1()
+    meshHash.update(np.ascontiguousarray(surfaceNodes, dtype=np.float64).tobytes())
+    meshHash.update(np.ascontiguousarray(surfaceFaces, dtype=np.int64).tobytes())
+    for extra in extras:
+        meshHash.update(repr(extra).encode())
+
+    return meshHash.hexdigest()
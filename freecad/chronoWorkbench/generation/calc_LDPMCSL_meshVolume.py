@@ -21,6 +21,8 @@
 
 import numpy as np
 
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_tetVolumes          import calc_LDPMCSL_tetVolumes
+
 
 
 def calc_LDPMCSL_meshVolume(vertices, tets):
@@ -37,18 +39,8 @@ def calc_LDPMCSL_meshVolume(vertices, tets):
     --------------------------------------------------------------------------
     """
 
-    # Convert tets to integer array
-    tets = tets.astype(int)
-    
-    # Get coordinates of vertices for each tetrahedron
-    coord1 = vertices[tets[:, 0] - 1]
-    coord2 = vertices[tets[:, 1] - 1]
-    coord3 = vertices[tets[:, 2] - 1]
-    coord4 = vertices[tets[:, 3] - 1]
-
     # Calculate the volume of all tetrahedrons in one go
-    tetVolume = np.abs(np.sum(np.cross((coord2 - coord4),(coord3 - coord4))*(
-        coord1 - coord4), axis=1)) / 6
+    tetVolume = calc_LDPMCSL_tetVolumes(vertices, tets)
 
     # Return the sum of all tetrahedron volumes
     return np.sum(tetVolume)
@@ -0,0 +1,55 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to calculate a hash of the mix design and
+## grading parameters that identifies cached data generated from the same
+## values. Numbers, lists and arrays are hashed as 64-bit floats, so 300 and
+## 300.0 or a list and an array of the same values give the same hash.
+##
+## ===========================================================================
+
+import hashlib
+import numpy as np
+
+
+def calc_LDPMCSL_mixHash(*values):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - values:           Values the cached data depends on (numbers, lists,
+                        arrays, strings or None)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - mixHash:          Hexadecimal hash string
+    --------------------------------------------------------------------------
+    """
+
+    mixHash = hashlib.sha1()
+    for value in values:
+        if value is None or isinstance(value, str):
+            mixHash.update(repr(value).encode())
+            continue
+        try:
+            value = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            mixHash.update(repr(value).encode())
+            continue
+        mixHash.update(repr(value.shape).encode())
+        mixHash.update(np.ascontiguousarray(value).tobytes())
+
+    return mixHash.hexdigest()
@@ -0,0 +1,206 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to fill the free space between the placed
+## particles with points at least one spacing apart (Poisson-disk sampling,
+## after Bridson). The points are grown from the active points of a
+## background grid with one point per cell, all active points at once: the
+## valid candidates in the shell around them are kept one spacing apart as
+## for the batches of the parallel placement. A new seed is drawn in the
+## volume when no point is active, until the seeds drawn in a row without a
+## valid one use up the seed budget. The fill stops as soon as it holds enough points.
+##
+## ===========================================================================
+
+import math
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_batchConflicts      import calc_LDPMCSL_batchConflicts
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_cellNeighborPairs   import calc_LDPMCSL_cellNeighborPairs
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_independentSet      import calc_LDPMCSL_independentSet
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistance     import calc_LDPMCSL_surfaceDistance
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_tetSamples          import calc_LDPMCSL_tetSamples
+from freecad.chronoWorkbench.generation.check_LDPMCSL_candidates         import check_LDPMCSL_candidates
+from freecad.chronoWorkbench.generation.check_LDPMCSL_surfaceClearance   import check_LDPMCSL_surfaceClearance
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+
+
+def calc_LDPMCSL_poissonDisk(parDiameter, minPar, parOffset, spacing, minC, maxC, tetSampler, nodes, parDiameterList,
+    cellList, surfaceBVH, distanceField, seed, nPoints=None, fillIndex=0, nTrials=30, maxSeeds=None,
+    initialPoints=None, chunkSize=20000):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - parDiameter:      Diameter the points are checked for (largest diameter
+                        of the particles that will take them)
+    - minPar:           Minimum particle diameter
+    - parOffset:        Minimum offset between particles
+    - spacing:          Minimum distance between the points (at least
+                        parDiameter + parOffset)
+    - minC:             Minimum coordinates of the geometry
+    - maxC:             Maximum coordinates of the geometry
+    - tetSampler:       Volume-weighted tet sampler of the mesh
+    - nodes:            (x, y, z) coordinates of each particle
+    - parDiameterList:  Diameter of each particle
+    - cellList:         Cell list of the placed particles
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - seed:             Random seed of the generation
+    - nPoints:          Number of points after which the fill stops
+    - fillIndex:        Index of the fill (to draw it from its own streams)
+    - nTrials:          Number of candidates around each active point
+    - maxSeeds:         Number of seeds drawn in a row without a valid one
+                        after which the fill stops (default 64*nTrials)
+    - initialPoints:    Points of an earlier fill at a larger spacing to go
+                        on from (optional)
+    - chunkSize:        Number of candidates checked at once against the grid
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - points:           (x, y, z) coordinates of the points, in the order
+                        they were generated, after the initial points (at
+                        most nPoints)
+    --------------------------------------------------------------------------
+    """
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+    spacing = max(spacing, parDiameter + parOffset)
+    required = parDiameter/2 + 1.1*minPar/2
+    if maxSeeds is None:
+        maxSeeds = 64*nTrials
+
+    # Background grid with at most one point per cell (the points within one
+    # spacing of a cell are in the 5x5x5 cells around it), padded by two
+    # cells so the neighbors of any cell are found by flat offsets
+    cellSize = spacing/math.sqrt(3)
+    gridDims = np.floor((maxC - minC)/cellSize).astype(int) + 5
+    grid = np.full(np.prod(gridDims), -1, dtype=np.int64)
+    offsets = np.array([(i*gridDims[1] + j)*gridDims[2] + k for i in range(-2,3) for j in range(-2,3) for k in range(-2,3)])
+
+    def gridCell(candidates):
+        cellIndex = np.floor((candidates - minC)/cellSize).astype(np.int64) + 2
+        return (cellIndex[:,0]*gridDims[1] + cellIndex[:,1])*gridDims[2] + cellIndex[:,2]
+
+    points = np.zeros((0,3))
+    pointDepth = np.zeros(0)
+    active = np.zeros(0, dtype=int)
+    if initialPoints is not None and len(initialPoints) > 0:
+        points = np.asarray(initialPoints, dtype=float)[:, 0:3]
+        pointDepth = calc_LDPMCSL_surfaceDistance(surfaceBVH, points)
+        active = np.arange(len(points))
+        grid[gridCell(points)] = active
+
+    def spacedCandidates(candidates):
+
+        # Inside the grid, in a free cell and at least one spacing from the
+        # points
+        valid = np.all((candidates >= minC) & (candidates < maxC), axis=1)
+        cell = gridCell(candidates)
+        valid[valid] = grid[cell[valid]] < 0
+        for start in range(0, len(candidates), chunkSize):
+            index = np.flatnonzero(valid[start:start+chunkSize]) + start
+            neighbor = grid[cell[index][:, np.newaxis] + offsets[np.newaxis, :]]
+            [row, column] = np.nonzero(neighbor >= 0)
+            tooClose = np.linalg.norm(candidates[index[row]] - points[neighbor[row, column]], axis=1) < spacing
+            valid[index[row[tooClose]]] = False
+
+        return valid
+
+    def validCandidates(candidates, depthBound):
+
+        valid = spacedCandidates(candidates)
+
+        # Clear of the placed particles and of the surface (candidates deep
+        # enough inside skip the surface check)
+        survivors = np.flatnonzero(valid)
+        [pairCand, pairPar] = calc_LDPMCSL_cellNeighborPairs(cellList, candidates[survivors], parDiameter)
+        overlap = np.linalg.norm(candidates[survivors[pairCand]] - nodes[pairPar], axis=1) \
+            - parDiameter/2 - parDiameterList[pairPar]/2 - parOffset < 0
+        valid[survivors[pairCand[overlap]]] = False
+        survivors = np.flatnonzero(valid)
+        if len(survivors) > 0:
+            valid[survivors] = check_LDPMCSL_surfaceClearance(surfaceBVH, candidates[survivors],\
+                np.full(len(survivors), parDiameter), minPar, distanceField, depthBound[survivors])
+
+        return valid
+
+    growthRound = 0
+    failedSeeds = 0
+    seedBatch = 64
+    while nPoints is None or len(points) < nPoints:
+
+        rng = gen_LDPMCSL_randomStream(seed, 7, fillIndex, growthRound)
+        growthRound = growthRound + 1
+
+        # One seed in the volume when no point is left to grow from (the
+        # first valid candidate, drawn in batches that grow while no seed is
+        # found, as for the serial placement), or the valid
+        # candidates in the shell between one and two spacings of each
+        # active point
+        if len(active) == 0:
+            if failedSeeds >= maxSeeds:
+                break
+            [candidates, tetIndex] = calc_LDPMCSL_tetSamples(tetSampler, min(seedBatch, maxSeeds), rng)
+            depthBound = tetSampler['tetDepth'][tetIndex] if 'tetDepth' in tetSampler \
+                else np.full(len(candidates), -np.inf)
+            spaced = np.flatnonzero(spacedCandidates(candidates))
+            index = -1
+            if len(spaced) > 0:
+                index = check_LDPMCSL_candidates(candidates[spaced], parDiameter, minPar, parOffset, nodes,\
+                    parDiameterList, cellList, surfaceBVH, distanceField, depthBound[spaced])
+            if index < 0:
+                failedSeeds = failedSeeds + len(candidates)
+                seedBatch = min(2*seedBatch, 64*nTrials)
+                continue
+            failedSeeds = 0
+            seedBatch = max(seedBatch//2, 64)
+            newPoints = candidates[spaced[index:index+1]]
+            newDepth = depthBound[spaced[index:index+1]]
+        else:
+            direction = rng.normal(size=(len(active), nTrials, 3))
+            direction = direction/np.linalg.norm(direction, axis=2)[:, :, np.newaxis]
+            radius = spacing*np.cbrt(1 + 7*rng.random((len(active), nTrials, 1)))
+            candidates = (points[active][:, np.newaxis, :] + radius*direction).reshape(-1, 3)
+            depthBound = (pointDepth[active][:, np.newaxis] - radius[:, :, 0]).ravel()
+            valid = validCandidates(candidates, depthBound).reshape(len(active), nTrials)
+            active = active[np.any(valid, axis=1)]
+            newPoints = candidates[valid.ravel()]
+            newDepth = depthBound[valid.ravel()]
+
+        # Keep the new points at least one spacing apart, and no more than
+        # the points left to fill
+        [pairI, pairJ] = calc_LDPMCSL_batchConflicts(newPoints, np.full(len(newPoints), spacing), 0)
+        keep = np.flatnonzero(calc_LDPMCSL_independentSet(len(newPoints), pairI, pairJ))
+        if nPoints is not None:
+            keep = keep[0:nPoints - len(points)]
+        [newPoints, newDepth] = [newPoints[keep], newDepth[keep]]
+
+        if len(newPoints) == 0:
+            continue
+        grid[gridCell(newPoints)] = len(points) + np.arange(len(newPoints))
+        active = np.concatenate((active, len(points) + np.arange(len(newPoints))))
+        points = np.concatenate((points, newPoints))
+
+        # Depth of the new points, from the point they grew from, or exact
+        # where their candidates may reach the surface
+        refresh = np.flatnonzero(newDepth < required + 2*spacing)
+        if len(refresh) > 0:
+            newDepth[refresh] = calc_LDPMCSL_surfaceDistance(surfaceBVH, newPoints[refresh])
+        pointDepth = np.concatenate((pointDepth, newDepth))
+
+    return points
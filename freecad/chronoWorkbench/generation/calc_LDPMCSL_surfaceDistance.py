@@ -0,0 +1,128 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to calculate the exact signed distance
+## from a set of points to the surface mesh using the surface bounding
+## volume hierarchy. Distances are positive inside the geometry and
+## negative outside. When Numba is installed the points are run through the
+## compiled kernel one after the other instead of the vectorized traversal.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistanceBatchKernel import calc_LDPMCSL_surfaceDistanceBatchKernelJit
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_triangleClosestPoint import calc_LDPMCSL_triangleClosestPoint
+
+
+def calc_LDPMCSL_surfaceDistance(surfaceBVH, points):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - surfaceBVH:       Surface bounding volume hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    - points:           (x, y, z) coordinates of the query points
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - signedDistance:   Distance from each point to the surface (positive
+                        inside, negative outside)
+    --------------------------------------------------------------------------
+    """
+
+    tree = surfaceBVH['tree']
+    points = np.atleast_2d(points)[:, 0:3]
+    nPoints = len(points)
+
+    if calc_LDPMCSL_surfaceDistanceBatchKernelJit is not None:
+        return calc_LDPMCSL_surfaceDistanceBatchKernelJit(np.ascontiguousarray(points, dtype=np.float64),\
+            tree['nodeMin'], tree['nodeMax'], tree['nodeLeft'], tree['nodeRight'], tree['nodeStart'],\
+            tree['nodeCount'], tree['primOrder'], surfaceBVH['triA'], surfaceBVH['triB'],\
+            surfaceBVH['triC'], surfaceBVH['triNodes'], surfaceBVH['triEdges'],\
+            surfaceBVH['faceNormal'], surfaceBVH['edgeNormal'], surfaceBVH['vertexNormal'])
+
+    bestDist2 = np.full(nPoints, np.inf)
+    bestTri = np.zeros(nPoints, dtype=np.int64)
+    bestFeature = np.zeros(nPoints, dtype=np.int64)
+    bestPoint = np.zeros((nPoints, 3))
+
+    def boxDist2(pts, nodes):
+        gap = np.maximum(np.maximum(tree['nodeMin'][nodes] - points[pts],
+            points[pts] - tree['nodeMax'][nodes]), 0)
+        return np.einsum('ij,ij->i', gap, gap)
+
+    def testLeaves(pts, nodes):
+
+        # Expand each (point, leaf) pair into (point, triangle) pairs
+        counts = tree['nodeCount'][nodes]
+        pairPts = np.repeat(pts, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        tris = tree['primOrder'][np.repeat(tree['nodeStart'][nodes], counts) + offsets]
+
+        closest, feature = calc_LDPMCSL_triangleClosestPoint(points[pairPts],
+            surfaceBVH['triA'][tris], surfaceBVH['triB'][tris], surfaceBVH['triC'][tris])
+        dist2 = np.sum((points[pairPts] - closest)**2, axis=1)
+
+        # Keep the closest triangle of each point if it improves the best one
+        order = np.lexsort((dist2, pairPts))
+        first = order[np.r_[True, pairPts[order][1:] != pairPts[order][:-1]]]
+        first = first[dist2[first] < bestDist2[pairPts[first]]]
+        p = pairPts[first]
+        bestDist2[p] = dist2[first]
+        bestTri[p] = tris[first]
+        bestFeature[p] = feature[first]
+        bestPoint[p] = closest[first]
+
+    # Descend greedily to one leaf per point to get an initial upper bound
+    pts = np.arange(nPoints)
+    nodes = np.zeros(nPoints, dtype=np.int64)
+    internal = tree['nodeLeft'][nodes] >= 0
+    while internal.any():
+        left = tree['nodeLeft'][nodes[internal]]
+        right = tree['nodeRight'][nodes[internal]]
+        goLeft = boxDist2(pts[internal], left) <= boxDist2(pts[internal], right)
+        nodes[internal] = np.where(goLeft, left, right)
+        internal = tree['nodeLeft'][nodes] >= 0
+    testLeaves(pts, nodes)
+
+    # Traverse the tree for all points at once, pruning nodes farther away
+    # than the closest triangle found so far
+    nodes = np.zeros(nPoints, dtype=np.int64)
+    while len(pts) > 0:
+        keep = boxDist2(pts, nodes) < bestDist2[pts]
+        pts = pts[keep]
+        nodes = nodes[keep]
+
+        leaf = tree['nodeLeft'][nodes] < 0
+        if leaf.any():
+            testLeaves(pts[leaf], nodes[leaf])
+
+        pts = np.concatenate((pts[~leaf], pts[~leaf]))
+        nodes = np.concatenate((tree['nodeLeft'][nodes[~leaf]], tree['nodeRight'][nodes[~leaf]]))
+
+    # Pseudonormal of the closest feature gives the side of the surface
+    normal = surfaceBVH['faceNormal'][bestTri]
+    for code in range(3):
+        onFeature = bestFeature == code
+        normal[onFeature] = surfaceBVH['vertexNormal'][surfaceBVH['triNodes'][bestTri[onFeature], code]]
+        onFeature = bestFeature == code + 3
+        normal[onFeature] = surfaceBVH['edgeNormal'][surfaceBVH['triEdges'][bestTri[onFeature], code]]
+
+    side = np.einsum('ij,ij->i', points - bestPoint, normal)
+    signedDistance = np.sqrt(bestDist2) * np.where(side > 0, -1, 1)
+
+    return signedDistance
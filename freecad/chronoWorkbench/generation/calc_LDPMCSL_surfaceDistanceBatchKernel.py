@@ -0,0 +1,63 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the compiled kernel to calculate the exact signed
+## distance from a set of points to the surface mesh, one point after the
+## other with calc_LDPMCSL_surfaceDistanceKernel. It is only used when Numba
+## is installed.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistanceKernel import calc_LDPMCSL_surfaceDistanceKernelJit
+from freecad.chronoWorkbench.util.cwJit                                  import cwJit
+
+
+def calc_LDPMCSL_surfaceDistanceBatchKernel(points, nodeMin, nodeMax, nodeLeft, nodeRight,
+    nodeStart, nodeCount, primOrder, triA, triB, triC, triNodes, triEdges, faceNormal,
+    edgeNormal, vertexNormal):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - points:           (x, y, z) coordinates of the query points
+    - nodeMin, nodeMax, nodeLeft, nodeRight, nodeStart, nodeCount, primOrder:
+                        Arrays of the tree (see gen_LDPMCSL_aabbTree)
+    - triA, triB, triC, triNodes, triEdges, faceNormal, edgeNormal,
+      vertexNormal:     Arrays of the surface hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - signedDistance:   Distance from each point to the surface (positive
+                        inside, negative outside)
+    --------------------------------------------------------------------------
+    """
+
+    signedDistance = np.empty(points.shape[0])
+    for p in range(points.shape[0]):
+        signedDistance[p] = calc_LDPMCSL_surfaceDistanceKernelJit(points[p,0], points[p,1], points[p,2],\
+            nodeMin, nodeMax, nodeLeft, nodeRight, nodeStart, nodeCount, primOrder, triA, triB, triC,\
+            triNodes, triEdges, faceNormal, edgeNormal, vertexNormal)
+
+    return signedDistance
+
+
+# Compiled kernel (None if Numba is not installed)
+calc_LDPMCSL_surfaceDistanceBatchKernelJit = None
+if calc_LDPMCSL_surfaceDistanceKernelJit is not None:
+    calc_LDPMCSL_surfaceDistanceBatchKernelJit = cwJit(calc_LDPMCSL_surfaceDistanceBatchKernel)
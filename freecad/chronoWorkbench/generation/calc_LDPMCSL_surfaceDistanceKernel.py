@@ -0,0 +1,161 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the compiled kernel to calculate the exact signed
+## distance from one point to the surface mesh. It is the single point
+## version of calc_LDPMCSL_surfaceDistance, traversing the tree depth first
+## (nearest child first) and is only used when Numba is installed.
+##
+## ===========================================================================
+
+import math
+import numpy as np
+
+from freecad.chronoWorkbench.util.cwJit                                  import cwJit
+
+
+def calc_LDPMCSL_surfaceDistanceKernel(x, y, z, nodeMin, nodeMax, nodeLeft, nodeRight,
+    nodeStart, nodeCount, primOrder, triA, triB, triC, triNodes, triEdges, faceNormal,
+    edgeNormal, vertexNormal):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - x, y, z:          Coordinates of the query point
+    - nodeMin, nodeMax, nodeLeft, nodeRight, nodeStart, nodeCount, primOrder:
+                        Arrays of the tree (see gen_LDPMCSL_aabbTree)
+    - triA, triB, triC, triNodes, triEdges, faceNormal, edgeNormal,
+      vertexNormal:     Arrays of the surface hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - signedDistance:   Distance from the point to the surface (positive
+                        inside, negative outside)
+    --------------------------------------------------------------------------
+    """
+
+    bestDist2 = math.inf
+    bestTri = 0
+    bestFeature = 6
+    bestX = x
+    bestY = y
+    bestZ = z
+
+    stack = np.empty(256, dtype=np.int64)
+    stack[0] = 0
+    top = 1
+    while top > 0:
+        top = top - 1
+        node = stack[top]
+
+        # Skip nodes farther away than the closest triangle found so far
+        gap2 = 0.0
+        for d, p in enumerate((x, y, z)):
+            gap = max(nodeMin[node,d] - p, p - nodeMax[node,d], 0.0)
+            gap2 += gap*gap
+        if gap2 >= bestDist2:
+            continue
+
+        # Visit the nearest child first
+        if nodeLeft[node] >= 0:
+            left = nodeLeft[node]
+            right = nodeRight[node]
+            leftGap2 = 0.0
+            rightGap2 = 0.0
+            for d, p in enumerate((x, y, z)):
+                gap = max(nodeMin[left,d] - p, p - nodeMax[left,d], 0.0)
+                leftGap2 += gap*gap
+                gap = max(nodeMin[right,d] - p, p - nodeMax[right,d], 0.0)
+                rightGap2 += gap*gap
+            if leftGap2 <= rightGap2:
+                stack[top] = right
+                stack[top+1] = left
+            else:
+                stack[top] = left
+                stack[top+1] = right
+            top = top + 2
+            continue
+
+        # Closest point on each triangle of the leaf (Ericson, Real-Time
+        # Collision Detection, Section 5.1.5)
+        for slot in range(nodeStart[node], nodeStart[node] + nodeCount[node]):
+            tri = primOrder[slot]
+            ax = triA[tri,0]
+            ay = triA[tri,1]
+            az = triA[tri,2]
+            abx = triB[tri,0] - ax
+            aby = triB[tri,1] - ay
+            abz = triB[tri,2] - az
+            acx = triC[tri,0] - ax
+            acy = triC[tri,1] - ay
+            acz = triC[tri,2] - az
+            apx = x - ax
+            apy = y - ay
+            apz = z - az
+
+            d1 = abx*apx + aby*apy + abz*apz
+            d2 = acx*apx + acy*apy + acz*apz
+            d3 = d1 - (abx*abx + aby*aby + abz*abz)
+            d4 = d2 - (acx*abx + acy*aby + acz*abz)
+            d5 = d1 - (abx*acx + aby*acy + abz*acz)
+            d6 = d2 - (acx*acx + acy*acy + acz*acz)
+
+            va = d3*d6 - d5*d4
+            vb = d5*d2 - d1*d6
+            vc = d1*d4 - d3*d2
+
+            if d1 <= 0 and d2 <= 0:
+                s, t, feature = 0.0, 0.0, 0
+            elif d3 >= 0 and d4 <= d3:
+                s, t, feature = 1.0, 0.0, 1
+            elif vc <= 0 and d1 >= 0 and d3 <= 0:
+                s, t, feature = d1 / (d1 - d3), 0.0, 3
+            elif d6 >= 0 and d5 <= d6:
+                s, t, feature = 0.0, 1.0, 2
+            elif vb <= 0 and d2 >= 0 and d6 <= 0:
+                s, t, feature = 0.0, d2 / (d2 - d6), 5
+            elif va <= 0 and (d4 - d3) >= 0 and (d5 - d6) >= 0:
+                w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+                s, t, feature = 1.0 - w, w, 4
+            else:
+                denom = 1 / (va + vb + vc)
+                s, t, feature = vb*denom, vc*denom, 6
+
+            cx = ax + abx*s + acx*t
+            cy = ay + aby*s + acy*t
+            cz = az + abz*s + acz*t
+            dist2 = (x - cx)**2 + (y - cy)**2 + (z - cz)**2
+            if dist2 < bestDist2:
+                bestDist2, bestTri, bestFeature = dist2, tri, feature
+                bestX, bestY, bestZ = cx, cy, cz
+
+    # Pseudonormal of the closest feature gives the side of the surface
+    if bestFeature < 3:
+        normal = vertexNormal[triNodes[bestTri, bestFeature]]
+    elif bestFeature < 6:
+        normal = edgeNormal[triEdges[bestTri, bestFeature - 3]]
+    else:
+        normal = faceNormal[bestTri]
+
+    side = (x - bestX)*normal[0] + (y - bestY)*normal[1] + (z - bestZ)*normal[2]
+    if side > 0:
+        return -math.sqrt(bestDist2)
+    return math.sqrt(bestDist2)
+
+
+# Compiled kernel (None if Numba is not installed)
+calc_LDPMCSL_surfaceDistanceKernelJit = cwJit(calc_LDPMCSL_surfaceDistanceKernel)
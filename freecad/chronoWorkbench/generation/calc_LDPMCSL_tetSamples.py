@@ -0,0 +1,58 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to draw points uniformly in the volume of
+## the mesh: a tet is drawn from the alias table and a point is drawn inside
+## it with uniform barycentric coordinates.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_tetSamples(tetSampler, nSamples, rng=None):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - tetSampler:       Tet sampler (see gen_LDPMCSL_tetSampler)
+    - nSamples:         Number of points to draw
+    - rng:              Numpy random generator (optional)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - points:           (x, y, z) coordinates of the points
+    - tetIndex:         Index of the tet of each point
+    --------------------------------------------------------------------------
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    aliasProb = tetSampler['aliasProb']
+
+    # Draw the tets from the alias table
+    column = rng.integers(len(aliasProb), size=nSamples)
+    keep = rng.random(nSamples) < aliasProb[column]
+    tetIndex = np.where(keep, column, tetSampler['aliasIndex'][column])
+
+    # Normalized exponential variables give uniform barycentric coordinates
+    bary = -np.log(1 - rng.random((nSamples, 4)))
+    bary = bary / np.sum(bary, axis=1)[:, np.newaxis]
+
+    points = np.einsum('ij,ijk->ik', bary, tetSampler['tetCoords'][tetIndex])
+
+    return points, tetIndex
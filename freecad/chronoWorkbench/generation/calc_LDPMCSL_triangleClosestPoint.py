@@ -0,0 +1,95 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to calculate the closest point on a set
+## of triangles to a set of points (one point per triangle), along with the
+## triangle feature (vertex, edge or face) the closest point lies on.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def calc_LDPMCSL_triangleClosestPoint(points, a, b, c):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - points:           (x, y, z) coordinates of each query point
+    - a:                First vertex of each triangle
+    - b:                Second vertex of each triangle
+    - c:                Third vertex of each triangle
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - closest:          Closest point on each triangle
+    - feature:          Feature containing the closest point (0, 1, 2 for
+                        vertices a, b, c; 3, 4, 5 for edges ab, bc, ca;
+                        6 for the face)
+    --------------------------------------------------------------------------
+    """
+
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+
+    d1 = np.einsum('ij,ij->i', ab, ap)
+    d2 = np.einsum('ij,ij->i', ac, ap)
+    d3 = np.einsum('ij,ij->i', ab, bp)
+    d4 = np.einsum('ij,ij->i', ac, bp)
+    d5 = np.einsum('ij,ij->i', ab, cp)
+    d6 = np.einsum('ij,ij->i', ac, cp)
+
+    va = d3*d6 - d5*d4
+    vb = d5*d2 - d1*d6
+    vc = d1*d4 - d3*d2
+
+    # Voronoi regions of the triangle features (Ericson, Real-Time Collision
+    # Detection, Section 5.1.5)
+    inA = (d1 <= 0) & (d2 <= 0)
+    inB = (d3 >= 0) & (d4 <= d3)
+    inC = (d6 >= 0) & (d5 <= d6)
+    inAB = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+    inCA = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+    inBC = (va <= 0) & ((d4 - d3) >= 0) & ((d5 - d6) >= 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = 1 / (va + vb + vc)
+        tAB = d1 / (d1 - d3)
+        tCA = d2 / (d2 - d6)
+        tBC = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+
+    # Start from the face projection and overwrite with the edge and vertex
+    # regions in reverse order of precedence
+    closest = a + ab*(vb*denom)[:,None] + ac*(vc*denom)[:,None]
+    feature = np.full(len(points), 6, dtype=np.int64)
+
+    closest[inBC] = (b + (c - b)*tBC[:,None])[inBC]
+    feature[inBC] = 4
+    closest[inCA] = (a + ac*tCA[:,None])[inCA]
+    feature[inCA] = 5
+    closest[inC] = c[inC]
+    feature[inC] = 2
+    closest[inAB] = (a + ab*tAB[:,None])[inAB]
+    feature[inAB] = 3
+    closest[inB] = b[inB]
+    feature[inB] = 1
+    closest[inA] = a[inA]
+    feature[inA] = 0
+
+    return closest, feature
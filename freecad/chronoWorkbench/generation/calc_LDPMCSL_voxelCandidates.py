@@ -0,0 +1,74 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to draw candidate positions of a
+## sub-particle (multi-material) in the voxels of its material. As for
+## calc_LDPMCSL_candidates, candidates are drawn in fixed blocks from the
+## random stream of the particle, so candidate k of a particle is always
+## the same point for a given seed, whichever function or process tests it.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+
+
+def calc_LDPMCSL_voxelCandidates(voxelTable, seed, materialIndex, parIndex, start, count):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - voxelTable:       Voxel centers of the material (see
+                        gen_LDPMCSL_voxelTable)
+    - seed:             Random seed of the generation (or None)
+    - materialIndex:    Index of the material (0 aggregate, 1 ITZ, 2 binder)
+    - parIndex:         Index of the particle in the list of the material
+    - start:            Index of the first candidate to return
+    - count:            Number of candidates to return
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - candidates:       (x, y, z) coordinates of candidates start to
+                        start+count-1 of the particle
+    - voxel:            Index of the voxel of each candidate in the table
+    --------------------------------------------------------------------------
+    """
+
+    blockSize = 64
+
+    voxelCenters = voxelTable['voxelCenters']
+    voxelSize = voxelTable['voxelSize']
+
+    firstBlock = start // blockSize
+    lastBlock = (start + count - 1) // blockSize
+
+    blocks = []
+    voxels = []
+    for block in range(firstBlock, lastBlock+1):
+
+        rng = gen_LDPMCSL_randomStream(seed, 3, materialIndex, parIndex, block)
+
+        # Random voxel of the material and random point in the voxel
+        voxel = rng.integers(len(voxelCenters), size=blockSize)
+        blocks.append(voxelCenters[voxel] + (rng.random((blockSize,3)) - 0.5)*voxelSize)
+        voxels.append(voxel)
+
+    offset = start - firstBlock*blockSize
+    candidates = np.concatenate(blocks)[offset:offset+count]
+    voxel = np.concatenate(voxels)[offset:offset+count]
+
+    return candidates, voxel
@@ -0,0 +1,105 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to find the first valid candidate
+## position of a particle in a block of candidates (no overlap with the
+## placed particles and far enough inside the geometry). The compiled kernel
+## is used when Numba is installed, otherwise all candidates of the block
+## are checked at once with NumPy. Candidates in tets deeper than the
+## required clearance skip the surface check.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_candidateKernel     import calc_LDPMCSL_candidateKernelJit
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_cellNeighborPairs   import calc_LDPMCSL_cellNeighborPairs
+from freecad.chronoWorkbench.generation.check_LDPMCSL_surfaceClearance   import check_LDPMCSL_surfaceClearance
+
+
+def check_LDPMCSL_candidates(candidates, parDiameter, minPar, parOffset, nodes,
+    parDiameterList, cellList, surfaceBVH, distanceField=None, candidateDepth=None):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - candidates:       (x, y, z) coordinates of the candidates, in order
+    - parDiameter:      Diameter of the particle
+    - minPar:           Minimum particle diameter
+    - parOffset:        Minimum offset between particles
+    - nodes:            List of nodes
+    - parDiameterList:  List of particle diameters
+    - cellList:         Cell list of placed particles
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - candidateDepth:   Lower bound of the distance from each candidate to
+                        the surface (optional, see calc_LDPMCSL_candidates)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - index:            Index of the first valid candidate (-1 if there is
+                        none)
+    --------------------------------------------------------------------------
+    """
+
+    if candidateDepth is None:
+        candidateDepth = np.full(len(candidates), -np.inf)
+
+    if calc_LDPMCSL_candidateKernelJit is not None:
+
+        [fieldMin, fieldSpacing, fieldValues] = [np.zeros(3), 1.0, np.zeros((0,0,0))]
+        [fieldShape, fieldParams, fieldError] = [0, np.zeros(0), 0.0]
+        if distanceField is not None and 'fieldShape' in distanceField:
+            [fieldShape, fieldParams, fieldError] = [int(distanceField['fieldShape']),\
+                distanceField['fieldParams'], float(distanceField['fieldError'])]
+        elif distanceField is not None:
+            [fieldMin, fieldSpacing, fieldValues] = [distanceField['fieldMin'],\
+                float(distanceField['fieldSpacing']), distanceField['fieldValues']]
+
+        tree = surfaceBVH['tree']
+        surfaceArrays = (tree['nodeMin'], tree['nodeMax'], tree['nodeLeft'], tree['nodeRight'],\
+            tree['nodeStart'], tree['nodeCount'], tree['primOrder'], surfaceBVH['triA'],\
+            surfaceBVH['triB'], surfaceBVH['triC'], surfaceBVH['triNodes'], surfaceBVH['triEdges'],\
+            surfaceBVH['faceNormal'], surfaceBVH['edgeNormal'], surfaceBVH['vertexNormal'])
+
+        # Same clearance as check_LDPMCSL_surfaceClearance
+        required = parDiameter/2 + 1.1*minPar/2
+
+        return calc_LDPMCSL_candidateKernelJit(candidates, float(parDiameter), float(parOffset),\
+            float(required), nodes, parDiameterList, cellList['cellMin'], cellList['levelReach'],\
+            cellList['cellSize'], cellList['cellDims'], cellList['cellStart'], cellList['cellTable'],\
+            cellList['cellCount'], candidateDepth, fieldMin, fieldSpacing, fieldValues, fieldShape,\
+            fieldParams, fieldError, surfaceArrays)
+
+    # Check all candidates against the placed particles in neighboring cells
+    [pairCand,pairPar] = calc_LDPMCSL_cellNeighborPairs(cellList,candidates,parDiameter)
+    nodalDistance = np.linalg.norm(candidates[pairCand] - nodes[pairPar], axis=1)
+    overlap = nodalDistance - parDiameter/2 - parDiameterList[pairPar]/2 - parOffset < 0
+
+    valid = np.ones(len(candidates), dtype=bool)
+    valid[pairCand[overlap]] = False
+    survivors = np.flatnonzero(valid)
+
+    # Check surface clearance of the remaining candidates
+    if len(survivors) > 0:
+        clear = check_LDPMCSL_surfaceClearance(surfaceBVH,candidates[survivors],\
+            np.full(len(survivors),parDiameter),minPar,distanceField,candidateDepth[survivors])
+        survivors = survivors[clear]
+
+    if len(survivors) == 0:
+        return -1
+
+    return survivors[0]
@@ -0,0 +1,156 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to verify the final packing before it is
+## tetrahedralized: no two particles overlap (which also catches coincident
+## nodes) and every particle lies inside the geometry with the clearance of
+## the placement. The pairs are found with a multi-level cell list (see
+## gen_LDPMCSL_cellList), each particle searching the levels of its own and
+## larger diameter bands only, so the check stays linear in the number of
+## particles for wide gradings, and the gap of each particle to its nearest
+## neighbor is collected into a histogram on the way.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_cellNeighborPairs   import calc_LDPMCSL_cellNeighborPairs
+from freecad.chronoWorkbench.generation.check_LDPMCSL_surfaceClearance   import check_LDPMCSL_surfaceClearance
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_cellList             import gen_LDPMCSL_cellList
+
+
+def check_LDPMCSL_packing(nodes, parDiameterList, minPar, parOffset, surfaceBVH, distanceField=None,
+    periodicBox=None, nBins=10, chunkSize=20000):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - nodes:            (x, y, z) coordinates of the particles
+    - parDiameterList:  Diameter of each particle
+    - minPar:           Minimum particle diameter
+    - parOffset:        Minimum offset between particles (before relaxation)
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - periodicBox:      Minimum and maximum coordinates of the periodic box,
+                        or None for a geometry with a surface
+    - nBins:            Number of bins of the separation histogram
+    - chunkSize:        Number of particles searched at once
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - binCounts:        Number of particles whose gap to the nearest neighbor
+                        falls in each bin (the last bin also holds the
+                        particles with no neighbor within 2*parOffset)
+    - binEdges:         Edges of the bins, from 0 to 2*parOffset
+    --------------------------------------------------------------------------
+    """
+
+    nodes = np.asarray(nodes, dtype=float)[:, 0:3]
+    parDiameterList = np.ravel(parDiameterList)
+    nPar = len(nodes)
+    tolerance = 1e-9*np.max(parDiameterList) if nPar > 0 else 0
+    window = 2*parOffset
+
+    # Containment: inside the box for periodic packings, otherwise inside the
+    # geometry and away from the surface as required during the placement
+    if periodicBox is None:
+        outside = np.flatnonzero(~check_LDPMCSL_surfaceClearance(surfaceBVH, nodes, parDiameterList, minPar,\
+            distanceField))
+    else:
+        [minC, maxC] = [np.asarray(periodicBox[0], dtype=float), np.asarray(periodicBox[1], dtype=float)]
+        outside = np.flatnonzero(np.any((nodes < minC - tolerance) | (nodes > maxC + tolerance), axis=1))
+    if len(outside) > 0:
+        raise Exception(str(len(outside)) + " particles are outside the geometry or too close to its surface" + \
+            " (particles " + str(outside[0:10].tolist()) + "). Please revise.")
+
+    # Periodic images of the particles within reach of the faces of the box
+    searchNodes = nodes
+    searchIndex = np.arange(nPar)
+    if periodicBox is not None:
+        reach = np.max(parDiameterList) + window
+        shifts = np.array([[i,j,k] for i in (-1,0,1) for j in (-1,0,1) for k in (-1,0,1) if [i,j,k] != [0,0,0]])
+        images = nodes[np.newaxis, :, :] + (shifts*(maxC - minC))[:, np.newaxis, :]
+        inReach = np.all((images > minC - reach) & (images < maxC + reach), axis=2)
+        searchNodes = np.concatenate((nodes, images[inReach]))
+        searchIndex = np.concatenate((searchIndex, np.nonzero(inReach)[1]))
+
+    # Cell list of the particles and their images, filled at once with one
+    # level per diameter band
+    searchDiameters = parDiameterList[searchIndex]
+    if nPar > 0:
+        cellList = gen_LDPMCSL_cellList(np.min(searchNodes, axis=0), np.max(searchNodes, axis=0),\
+            np.max(searchDiameters), window, min(minPar, np.min(searchDiameters)), maxCells=len(searchNodes))
+    else:
+        cellList = gen_LDPMCSL_cellList(np.zeros(3), np.ones(3), 1.0, window)
+    levelDiameter = cellList['levelDiameter']
+    level = np.minimum(np.searchsorted(levelDiameter, searchDiameters), len(levelDiameter) - 1)
+    cellDims = cellList['cellDims'][level]
+    cellIJK = np.floor((searchNodes - cellList['cellMin']) / cellList['cellSize'][level][:, np.newaxis]).astype(int)
+    cellIJK = np.clip(cellIJK, 0, cellDims - 1)
+    cell = cellList['cellStart'][level] + (cellIJK[:,0] * cellDims[:,1] + cellIJK[:,1]) * cellDims[:,2] + cellIJK[:,2]
+    cellList['cellCount'] = np.bincount(cell, minlength=len(cellList['cellCount']))
+    order = np.argsort(cell, kind='stable')
+    slot = np.arange(len(cell)) - np.repeat(np.cumsum(cellList['cellCount']) - cellList['cellCount'],\
+        cellList['cellCount'])
+    cellList['cellTable'] = -np.ones((len(cellList['cellCount']), max(np.max(cellList['cellCount'], initial=0), 1)),\
+        dtype=np.int64)
+    cellList['cellTable'][cell[order], slot] = order
+
+    # Pairs closer than the histogram window, and their gaps. Each particle in
+    # the box searches the levels of its band and the larger ones, so a pair of
+    # two bands is found once and a pair of one band from both sides. A pair
+    # across a face of the box is also found from both sides, so only the one
+    # with the lower particle in the box is kept
+    pairI = []
+    pairJ = []
+    gap = []
+    for searchLevel in range(len(levelDiameter)):
+        levelCells = {**cellList}
+        for key in ['levelDiameter', 'levelReach', 'cellSize', 'cellDims', 'cellStart']:
+            levelCells[key] = cellList[key][searchLevel:]
+        levelParticles = np.flatnonzero(level[0:nPar] == searchLevel)
+        for chunk in range(0, len(levelParticles), chunkSize):
+            particles = levelParticles[chunk:chunk+chunkSize]
+            [pairPoints, pairParticles] = calc_LDPMCSL_cellNeighborPairs(levelCells, searchNodes[particles],\
+                searchDiameters[particles])
+            [chunkI, chunkJ] = [particles[pairPoints], pairParticles]
+            keep = (level[chunkJ] > searchLevel) | ((chunkJ < nPar) & (chunkI < chunkJ)) | \
+                ((chunkJ >= nPar) & (chunkI < searchIndex[chunkJ]))
+            [chunkI, chunkJ] = [chunkI[keep], chunkJ[keep]]
+            chunkGap = np.linalg.norm(searchNodes[chunkI] - searchNodes[chunkJ], axis=1) \
+                - searchDiameters[chunkI]/2 - searchDiameters[chunkJ]/2
+            close = chunkGap < window
+            pairI.append(chunkI[close])
+            pairJ.append(searchIndex[chunkJ[close]])
+            gap.append(chunkGap[close])
+    pairI = np.concatenate(pairI + [np.zeros(0, dtype=int)])
+    pairJ = np.concatenate(pairJ + [np.zeros(0, dtype=int)])
+    gap = np.concatenate(gap + [np.zeros(0)])
+
+    overlap = gap < -tolerance
+    if np.any(overlap):
+        offending = np.unique(np.concatenate((pairI[overlap], pairJ[overlap])))
+        raise Exception(str(np.count_nonzero(overlap)) + " pairs of particles overlap (particles " + \
+            str(offending[0:10].tolist()) + "). Please revise.")
+
+    # Gap of each particle to its nearest neighbor
+    nearestGap = np.full(nPar, window)
+    np.minimum.at(nearestGap, pairI, gap)
+    np.minimum.at(nearestGap, pairJ, gap)
+    binEdges = np.linspace(0, window, nBins + 1)
+    binCounts = np.histogram(np.clip(nearestGap, 0, window), bins=binEdges)[0]
+
+    return binCounts, binEdges
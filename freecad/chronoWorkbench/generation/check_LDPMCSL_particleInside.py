@@ -20,8 +20,11 @@
 
 import numpy as np
 
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_locatePoints     import calc_LDPMCSL_locatePoints
+
+
 def check_LDPMCSL_particleInside(vertices,tets,center,parDiameter,binMin,binMax,coord1,\
-    coord2,coord3,coord4):
+    coord2,coord3,coord4,tetTree=None):
 
     """
     Variables:
@@ -37,6 +40,7 @@ def check_LDPMCSL_particleInside(vertices,tets,center,parDiameter,binMin,binMax,
     - coord2:           Coordinates of the second vertex of each tet
     - coord3:           Coordinates of the third vertex of each tet
     - coord4:           Coordinates of the fourth vertex of each tet
+    - tetTree:          Tet tree of the mesh (optional, see gen_LDPMCSL_tetTree)
     --------------------------------------------------------------------------
     ### Outputs ###
     - Boolean:          True if the particle is inside tets, False if not
@@ -46,6 +50,12 @@ def check_LDPMCSL_particleInside(vertices,tets,center,parDiameter,binMin,binMax,
     # Convert center to a 1D array
     center = center.flatten()
 
+    # Locate the 8 vertices of the bounding box directly if a tet tree is available
+    if tetTree is not None:
+        corners = center + parDiameter/2*np.array([[sx,sy,sz] for sx in (-1,1)\
+            for sy in (-1,1) for sz in (-1,1)])
+        return bool(np.all(calc_LDPMCSL_locatePoints(tetTree,corners) >= 0))
+
     # Store tet vertices that fall inside the bin
     coord1 = np.all([(coord1[:,0] > binMin[0]) , (coord1[:,0] < binMax[0]),\
                      (coord1[:,1] > binMin[1]) , (coord1[:,1] < binMax[1]),\
@@ -21,9 +21,13 @@
 
 import numpy as np
 
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_cellNeighbors    import calc_LDPMCSL_cellNeighbors
+from freecad.chronoWorkbench.generation.check_LDPMCSL_surfaceClearance import check_LDPMCSL_surfaceClearance
+
 
 def check_LDPMCSL_particleOverlap(nodes, center, parDiameter, facePoints, binMin, binMax,
-    minPar, maxEdgeLength, parOffset, parDiameterList):
+    minPar, maxEdgeLength, parOffset, parDiameterList, cellList=None, surfaceBVH=None,
+    distanceField=None, depthBound=None):
 
     """
     Variables:
@@ -39,6 +43,15 @@ def check_LDPMCSL_particleOverlap(nodes, center, parDiameter, facePoints, binMin
     - maxEdgeLength:   Maximum length of an edge in the mesh
     - parOffset:       Minimum offset coefficient between particles
     - parDiameterList: List of diameters of each particle
+    - cellList:        Cell list of placed particles (optional, see
+                       gen_LDPMCSL_cellList)
+    - surfaceBVH:      Surface bounding volume hierarchy (optional, see
+                       gen_LDPMCSL_surfaceBVH)
+    - distanceField:   Signed distance field to speed up the surface
+                       clearance check (optional, see
+                       gen_LDPMCSL_distanceField)
+    - depthBound:      Lower bound of the distance from the center to the
+                       surface (optional, see update_LDPMCSL_tetDepth)
     --------------------------------------------------------------------------
     ### Outputs ###
     - A boolean value that is True if the new particle overlaps
@@ -46,25 +59,21 @@ def check_LDPMCSL_particleOverlap(nodes, center, parDiameter, facePoints, binMin
     --------------------------------------------------------------------------
     """
 
-    # Combine the conditions for all particles and store the result in an array
-    binTestParticles = np.logical_and.reduce([(nodes[:,0] > binMin[0]),
-        (nodes[:,0] < binMax[0]), (nodes[:,1] > binMin[1]),
-        (nodes[:,1] < binMax[1]), (nodes[:,2] > binMin[2]),
-        (nodes[:,2] < binMax[2])])
+    # Only visit the particles in the cells within reach if a cell list is available
+    if cellList is not None:
+        binTestParticles = calc_LDPMCSL_cellNeighbors(cellList, center, parDiameter)
+
+    # Otherwise combine the conditions for all particles and store the result in an array
+    else:
+        binTestParticles = np.logical_and.reduce([(nodes[:,0] > binMin[0]),
+            (nodes[:,0] < binMax[0]), (nodes[:,1] > binMin[1]),
+            (nodes[:,1] < binMax[1]), (nodes[:,2] > binMin[2]),
+            (nodes[:,2] < binMax[2])])
 
     # Store particle nodes that fall inside the bin
     existingNodes = nodes[binTestParticles, :]
     existingParD = parDiameterList[binTestParticles]
 
-    # Combine the conditions for all surface points and store the result in an array
-    binTestSurf = np.all([(facePoints[:,0] > binMin[0]),
-        (facePoints[:,0] < binMax[0]), (facePoints[:,1] > binMin[1]),
-        (facePoints[:,1] < binMax[1]), (facePoints[:,2] > binMin[2]),
-        (facePoints[:,2] < binMax[2])], axis=0)
-
-    # Store edge nodes that fall inside the bin
-    existingSurf = facePoints[binTestSurf, :]
- 
     # Check if the new particle overlaps with any existing particles
     if existingNodes.shape[0] > 0:
         nodalDistance = np.linalg.norm(center - existingNodes, axis=1)
@@ -74,6 +83,28 @@ def check_LDPMCSL_particleOverlap(nodes, center, parDiameter, facePoints, binMin
     else:
         parOffsetDist = np.array([1])
 
+    # Particles in tets deep enough inside are clear of the surface (no
+    # surface or inside check is needed)
+    if depthBound is not None and depthBound >= parDiameter/2 + 1.1*minPar/2:
+        return False, False
+
+    # Check the exact surface clearance if a surface hierarchy is available
+    # (no inside check is needed afterwards)
+    if surfaceBVH is not None:
+        if not check_LDPMCSL_surfaceClearance(surfaceBVH, center, parDiameter, minPar,\
+            distanceField)[0]:
+            return True, "NA"
+        return False, False
+
+    # Combine the conditions for all surface points and store the result in an array
+    binTestSurf = np.all([(facePoints[:,0] > binMin[0]),
+        (facePoints[:,0] < binMax[0]), (facePoints[:,1] > binMin[1]),
+        (facePoints[:,1] < binMax[1]), (facePoints[:,2] > binMin[2]),
+        (facePoints[:,2] < binMax[2])], axis=0)
+
+    # Store edge nodes that fall inside the bin
+    existingSurf = facePoints[binTestSurf, :]
+
     # Check if the new particle is too close to the surface
     if existingSurf.shape[0] > 0:
         surfNodalDistance = np.linalg.norm(center - existingSurf, axis=1)
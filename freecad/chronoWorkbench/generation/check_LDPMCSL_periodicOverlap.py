@@ -0,0 +1,72 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to check a set of candidate positions
+## against the placed particles of a periodic box with the minimum-image
+## convention. Each candidate is also tested at its periodic images that
+## fall within reach of the box, so the particles across the faces of the
+## box are found in the same cell list as the others.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_cellNeighborPairs   import calc_LDPMCSL_cellNeighborPairs
+
+
+def check_LDPMCSL_periodicOverlap(candidates, parDiameter, parOffset, parDiameterList, nodes, cellList, minC, maxC):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - candidates:       (x, y, z) candidate positions inside the box
+    - parDiameter:      Diameter of the new particle
+    - parOffset:        Minimum offset between particles
+    - parDiameterList:  List of diameters of each particle
+    - nodes:            (x, y, z) coordinates of each node
+    - cellList:         Cell list of placed particles (see
+                        gen_LDPMCSL_cellList)
+    - minC:             Minimum coordinates of the box
+    - maxC:             Maximum coordinates of the box
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - overlap:          Boolean array that is True for the candidates that
+                        overlap a placed particle or one of its images
+    --------------------------------------------------------------------------
+    """
+
+    candidates = np.atleast_2d(candidates)[:, 0:3]
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+    boxLength = maxC - minC
+
+    # Images of the candidates (including themselves) within reach of the box
+    reach = parDiameter/2 + np.max(cellList['levelReach'])
+    shifts = np.array([[i,j,k] for i in (-1,0,1) for j in (-1,0,1) for k in (-1,0,1)])
+    images = candidates[np.newaxis, :, :] + (shifts*boxLength)[:, np.newaxis, :]
+    inReach = np.all((images > minC - reach) & (images < maxC + reach), axis=2)
+    imageCandidate = np.nonzero(inReach)[1]
+    images = images[inReach]
+
+    [pairImage,pairPar] = calc_LDPMCSL_cellNeighborPairs(cellList, images, parDiameter)
+    nodalDistance = np.linalg.norm(images[pairImage] - nodes[pairPar], axis=1)
+    pairOverlap = nodalDistance - parDiameter/2 - parDiameterList[pairPar]/2 - parOffset < 0
+
+    overlap = np.zeros(len(candidates), dtype=bool)
+    overlap[imageCandidate[pairImage[pairOverlap]]] = True
+
+    return overlap
@@ -0,0 +1,51 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to decide what to do when a particle
+## runs out of trials: the particle offset is relaxed and the particle is
+## tried again, until the relaxations are used up. Then the placement stops
+## and keeps the particles placed so far.
+##
+## ===========================================================================
+
+
+def check_LDPMCSL_placementRetry(controller, parIndex):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - controller:       Placement controller (see
+                        gen_LDPMCSL_placementController), updated in place
+    - parIndex:         Index of the particle that ran out of trials
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - retry:            True if the particle should be tried again with the
+                        relaxed offset, False if the placement stops
+    --------------------------------------------------------------------------
+    """
+
+    if controller['relaxCount'] < controller['maxRelax'] and controller['parOffset'] > 0:
+        controller['relaxCount'] = controller['relaxCount'] + 1
+        controller['parOffset'] = controller['parOffset']*controller['relaxFactor']
+        print("Particle %d exceeded the %r specified maximum iterations allowed. Relaxing the particle offset to %g." \
+            % (parIndex, controller['maxIter'], controller['parOffset']))
+        return True
+
+    controller['failedIndex'] = int(parIndex)
+    print("Particle %d exceeded the %r specified maximum iterations allowed. Stopping placement with %d particles placed." \
+        % (parIndex, controller['maxIter'], controller['nPlaced']))
+    return False
@@ -20,8 +20,11 @@
 
 import numpy as np
 
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_locatePoints     import calc_LDPMCSL_locatePoints
+
+
 def check_LDPMCSL_pointInside(vertices,tets,center,binMin,binMax,coord1,\
-    coord2,coord3,coord4):
+    coord2,coord3,coord4,tetTree=None):
 
     """
     Variables:
@@ -36,6 +39,7 @@ def check_LDPMCSL_pointInside(vertices,tets,center,binMin,binMax,coord1,\
     - coord2:           Coordinates of the second vertex of each tet
     - coord3:           Coordinates of the third vertex of each tet
     - coord4:           Coordinates of the fourth vertex of each tet
+    - tetTree:          Tet tree of the mesh (optional, see gen_LDPMCSL_tetTree)
     --------------------------------------------------------------------------
     ### Outputs ###
     - Boolean:          True if the point is inside tets, False if not
@@ -45,6 +49,10 @@ def check_LDPMCSL_pointInside(vertices,tets,center,binMin,binMax,coord1,\
     # Convert center to a 1D array
     center = center.flatten()
 
+    # Locate the point directly if a tet tree is available
+    if tetTree is not None:
+        return bool(calc_LDPMCSL_locatePoints(tetTree,center)[0] >= 0)
+
     # Store tet vertices that fall inside the bin
     coord1 = np.all([(coord1[:,0] > binMin[0]) , (coord1[:,0] < binMax[0]),\
                      (coord1[:,1] > binMin[1]) , (coord1[:,1] < binMax[1]),\
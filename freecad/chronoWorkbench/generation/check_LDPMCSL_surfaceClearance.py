@@ -0,0 +1,83 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to check whether particles lie inside
+## the geometry and far enough from the surface. This single check replaces
+## the scan over the surface nodes and the bounding-cube inside test.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_distanceFieldLookup import calc_LDPMCSL_distanceFieldLookup
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistance     import calc_LDPMCSL_surfaceDistance
+
+
+def check_LDPMCSL_surfaceClearance(surfaceBVH, centers, parDiameters, minPar, distanceField=None,
+    depthBound=None):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - surfaceBVH:       Surface bounding volume hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    - centers:          (x, y, z) coordinates of the particle centers
+    - parDiameters:     Diameter of each particle
+    - minPar:           Minimum particle diameter
+    - distanceField:    Signed distance field (optional, see
+                        gen_LDPMCSL_distanceField)
+    - depthBound:       Lower bound of the distance from each particle center
+                        to the surface (optional, see update_LDPMCSL_tetDepth)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - clear:            Boolean array, True for particles that are inside the
+                        geometry and at least half a (slightly enlarged)
+                        minimum particle away from the surface
+    --------------------------------------------------------------------------
+    """
+
+    centers = np.atleast_2d(centers)[:, 0:3]
+
+    # Same clearance as the surface node check (surface nodes act as
+    # particles of diameter 1.1*minPar)
+    required = np.ravel(parDiameters)/2 + 1.1*minPar/2 + np.zeros(len(centers))
+
+    # Particles deep enough inside are clear without any distance computation
+    if depthBound is None:
+        clear = np.zeros(len(centers), dtype=bool)
+    else:
+        clear = np.ravel(depthBound) >= required
+    undecided = np.flatnonzero(~clear)
+    if len(undecided) == 0:
+        return clear
+
+    # Without a distance field, compute the exact distance for the others
+    if distanceField is None:
+        clear[undecided] = calc_LDPMCSL_surfaceDistance(surfaceBVH, centers[undecided]) \
+            - required[undecided] >= 0
+        return clear
+
+    # Otherwise only compute the exact distance where the interpolated
+    # distance is too close to the required clearance to decide
+    [distance, errorBound] = calc_LDPMCSL_distanceFieldLookup(distanceField, centers[undecided])
+    clear[undecided] = distance - errorBound >= required[undecided]
+    undecided = undecided[~clear[undecided] & (distance + errorBound >= required[undecided])]
+    if len(undecided) > 0:
+        clear[undecided] = calc_LDPMCSL_surfaceDistance(surfaceBVH, centers[undecided]) \
+            - required[undecided] >= 0
+
+    return clear
@@ -52,37 +52,63 @@ from PySide import QtCore, QtGui
 
 
 # Importing: generation
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_meshHash             import calc_LDPMCSL_meshHash
 from freecad.chronoWorkbench.generation.calc_LDPMCSL_meshVolume           import calc_LDPMCSL_meshVolume
-from freecad.chronoWorkbench.generation.calc_parVolume                    import calc_parVolume
-from freecad.chronoWorkbench.generation.calc_sieveCurve                   import calc_sieveCurve
 from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfMeshSize         import calc_LDPMCSL_surfMeshSize
 from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfMeshExtents      import calc_LDPMCSL_surfMeshExtents
-from freecad.chronoWorkbench.generation.check_particleOverlapMPI          import check_particleOverlapMPI
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_batchConflicts       import calc_LDPMCSL_batchConflicts
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_independentSet       import calc_LDPMCSL_independentSet
+from freecad.chronoWorkbench.generation.check_LDPMCSL_placementRetry      import check_LDPMCSL_placementRetry
 from freecad.chronoWorkbench.generation.check_multiMat_size               import check_multiMat_size
 from freecad.chronoWorkbench.generation.check_multiMat_matVol             import check_multiMat_matVol
 from freecad.chronoWorkbench.generation.gen_CSL_facetData                 import gen_CSL_facetData
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_analyticField         import gen_LDPMCSL_analyticField
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_cellList              import gen_LDPMCSL_cellList
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_distanceField         import gen_LDPMCSL_distanceField
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_surfaceBVH            import gen_LDPMCSL_surfaceBVH
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_tesselation           import gen_LDPMCSL_tesselation
 from freecad.chronoWorkbench.generation.gen_LDPM_facetData                import gen_LDPM_facetData
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_analysis              import gen_LDPMCSL_analysis
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_flowEdges             import gen_LDPMCSL_flowEdges
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_geometry              import gen_LDPMCSL_geometry
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_initialMesh           import gen_LDPMCSL_initialMesh
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_placementController   import gen_LDPMCSL_placementController
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_particleDiameters     import gen_LDPMCSL_particleDiameters
 from freecad.chronoWorkbench.generation.gen_particle                      import gen_particle
-from freecad.chronoWorkbench.generation.gen_particleMPI                   import gen_particleMPI
-from freecad.chronoWorkbench.generation.gen_particleList                  import gen_particleList
+from freecad.chronoWorkbench.generation.check_LDPMCSL_packing             import check_LDPMCSL_packing
+from freecad.chronoWorkbench.generation.gen_particleCollective            import gen_particleCollective
+from freecad.chronoWorkbench.generation.gen_particleVoid                  import gen_particleVoid
+from freecad.chronoWorkbench.generation.gen_particleShared                import gen_particleShared, gen_particleSharedInit, gen_subParticleShared
+from freecad.chronoWorkbench.generation.gen_particlePoissonDisk           import gen_particlePoissonDisk
+from freecad.chronoWorkbench.generation.gen_particlePeriodic              import gen_particlePeriodic
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_properties            import gen_LDPMCSL_properties
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_subParticle           import gen_LDPMCSL_subParticle
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetSampler            import gen_LDPMCSL_tetSampler
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetTree               import gen_LDPMCSL_tetTree
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_voidMap               import gen_LDPMCSL_voidMap
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_voxelTable            import gen_LDPMCSL_voxelTable
 from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetrahedralization    import gen_LDPMCSL_tetrahedralization
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_periodicTetrahedralization import gen_LDPMCSL_periodicTetrahedralization
 from freecad.chronoWorkbench.generation.gen_multiMat_refine               import gen_multiMat_refine
 from freecad.chronoWorkbench.generation.gen_multiMat_reform               import gen_multiMat_reform
 from freecad.chronoWorkbench.generation.sort_multiMat_voxels              import sort_multiMat_voxels
 from freecad.chronoWorkbench.generation.sort_multiMat_mat                 import sort_multiMat_mat
+from freecad.chronoWorkbench.generation.update_LDPMCSL_cellList           import update_LDPMCSL_cellList
+from freecad.chronoWorkbench.generation.update_LDPMCSL_placementController import update_LDPMCSL_placementController
+from freecad.chronoWorkbench.generation.update_LDPMCSL_tetDepth           import update_LDPMCSL_tetDepth
+from freecad.chronoWorkbench.generation.update_LDPMCSL_voidMap            import update_LDPMCSL_voidMap
 
 # Importing: input
+from freecad.chronoWorkbench.input.read_LDPMCSL_distanceField             import read_LDPMCSL_distanceField
 from freecad.chronoWorkbench.input.read_LDPMCSL_inputs                    import read_LDPMCSL_inputs
+from freecad.chronoWorkbench.input.read_LDPMCSL_placementCheckpoint       import read_LDPMCSL_placementCheckpoint
 from freecad.chronoWorkbench.input.read_LDPMCSL_tetgen                    import read_LDPMCSL_tetgen
 from freecad.chronoWorkbench.input.read_multiMat_file                     import read_multiMat_file
 
+# Importing: util
+from freecad.chronoWorkbench.util.cwReleaseArrays                         import cwReleaseArrays
+from freecad.chronoWorkbench.util.cwShareArrays                           import cwShareArrays
+
 # Importing: output
 from freecad.chronoWorkbench.output.mkVtk_particles                       import mkVtk_particles
 from freecad.chronoWorkbench.output.mkVtk_LDPMCSL_facets                  import mkVtk_LDPMCSL_facets
@@ -97,7 +123,11 @@ from freecad.chronoWorkbench.output.mkVtk_LDPM_singleCell                 import
 from freecad.chronoWorkbench.output.mkPy_LDPM_singleParaview              import mkPy_LDPM_singleParaview
 from freecad.chronoWorkbench.output.mkPy_LDPM_singleParaviewLabels        import mkPy_LDPM_singleParaviewLabels
 from freecad.chronoWorkbench.output.mkData_nodes                          import mkData_nodes
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_distanceField          import mkData_LDPMCSL_distanceField
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_placementCheckpoint    import mkData_LDPMCSL_placementCheckpoint
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_placementReport        import mkData_LDPMCSL_placementReport
 from freecad.chronoWorkbench.output.mkData_LDPMCSL_tets                   import mkData_LDPMCSL_tets
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_periodicTets           import mkData_LDPMCSL_periodicTets
 from freecad.chronoWorkbench.output.mkData_LDPMCSL_edges                  import mkData_LDPMCSL_edges
 from freecad.chronoWorkbench.output.mkData_LDPMCSL_facets                 import mkData_LDPMCSL_facets
 from freecad.chronoWorkbench.output.mkData_LDPMCSL_facetsVertices         import mkData_LDPMCSL_facetsVertices
@@ -113,19 +143,61 @@ def driver_LDPMCSL(self,fastGen,tempPath):
 
     # Read in inputs from input panel
     [setupFile, constitutiveEQ, matParaSet, \
-        numCPU, numIncrements,maxIter,placementAlg,\
+        numCPU, numIncrements,maxIter,placementAlg,placementSeed,checkpointInterval,placementResume,\
         geoType, dimensions, cadFile,\
         minPar, maxPar, fullerCoef, sieveCurveDiameter, sieveCurvePassing,\
         wcRatio, densityWater, cementC, flyashC, silicaC, scmC,\
         cementDensity, flyashDensity, silicaDensity, scmDensity, airFrac1, \
         fillerC, fillerDensity, airFrac2,\
-        htcToggle, htcLength,\
+        htcToggle, htcLength, periodicToggle,\
         multiMatToggle,aggFile,multiMatFile,multiMatRule,\
         grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP,\
         grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP,\
         grainBinderMin, grainBinderMax, grainBinderFuller, grainBinderSieveD, grainBinderSieveP,\
         outDir, dataFilesGen, visFilesGen, singleTetGen, modelType] = read_LDPMCSL_inputs(self.form)
 
+    # Draw a random seed if none is given and record it in the parameter file
+    # so the generation can be repeated. Only a seed given by the user makes
+    # the parallel rounds match the serial placement (see below), a drawn
+    # seed repeats the generation for the same numCPU and numIncrements
+    seedGiven = placementSeed.strip() != ""
+    if not seedGiven:
+        placementSeed = np.random.SeedSequence().entropy
+        with open(Path(tempPath + "/chronoWorkbench.cwPar"), "r") as f:
+            paraLines = f.readlines()
+        with open(Path(tempPath + "/chronoWorkbench.cwPar"), "w") as f:
+            for line in paraLines:
+                if "placementSeed" in line:
+                    line = "placementSeed = " + str(placementSeed) + "\n"
+                f.write(line)
+    else:
+        placementSeed = int(placementSeed)
+    print('Placement seed: ' + str(placementSeed))
+
+    # Periodic meshing places the particles of a single-material box one by one,
+    # against the other particles and their periodic images only
+    if periodicToggle == "On":
+        if geoType != "Box" or multiMatToggle == "On" or htcToggle in ['on','On']:
+            raise Exception("Periodic meshing requires a Box geometry without multi-material or flow edges. Please revise.")
+        placementAlg = "Periodic"
+        numCPU = 1
+
+    # Distributed placement runs the generation under mpirun, one rank per CPU,
+    # without multi-material or checkpoints
+    if placementAlg == "Distributed Trial-and-Error (MPI)":
+        if multiMatToggle == "On":
+            raise Exception("Distributed placement does not support multi-material. Please revise.")
+        fastGen = True
+        checkpointInterval = 0
+        placementResume = "Off"
+
+    # Hybrid placement places the coarse particles one by one, then fills the
+    # space left with the fine particles
+    if placementAlg == "Hybrid Poisson-Disk":
+        if multiMatToggle == "On":
+            raise Exception("Hybrid placement does not support multi-material. Please revise.")
+        numCPU = 1
+
     # Make output directory if does not exist
     try:
         os.mkdir(outDir)
@@ -215,7 +287,10 @@ def driver_LDPMCSL(self,fastGen,tempPath):
         airFrac = airFrac1
     
     parOffsetCoeff = 0.2                                    # Minimum distance between particles factor 
+    hybridCutoffCoeff = 1.5                                 # Largest fine particle of the hybrid placement factor
     verbose = "On"
+    distanceFieldToggle = "On"                              # Use cached signed distance field for surface checks
+    particleCacheToggle = "On"                              # Store particle diameters for runs with the same mix design and given seed
 
     self.form[5].progressBar.setValue(1) 
     self.form[5].statusWindow.setText("Status: Generating objects.") 
@@ -311,6 +386,7 @@ def driver_LDPMCSL(self,fastGen,tempPath):
 
     # Basic Calcs
     parOffset = parOffsetCoeff*minPar
+    hybridCutoff = hybridCutoffCoeff*minPar
 
     
     # Store coordinates of meshTets in new format
@@ -319,6 +395,50 @@ def driver_LDPMCSL(self,fastGen,tempPath):
     coord3 = meshVertices[meshTets[:,2]-1]
     coord4 = meshVertices[meshTets[:,3]-1]
 
+    # Build tet tree of the mesh for containment tests
+    tetTree = gen_LDPMCSL_tetTree(meshVertices,meshTets)
+
+    # Build volume-weighted tet sampler for candidate positions
+    tetSampler = gen_LDPMCSL_tetSampler(meshVertices,meshTets)
+
+    # Build bounding volume hierarchy of the surface for clearance checks
+    surfaceBVH = gen_LDPMCSL_surfaceBVH(surfaceNodes,surfaceFaces)
+
+    # Built-in primitives have a closed-form signed distance. Otherwise load
+    # the signed distance field of this surface mesh if it was already built
+    # (next to the imported file or in the output directory), or build and
+    # store it
+    distanceField = None
+    if distanceFieldToggle == "On":
+        meshHash = calc_LDPMCSL_meshHash(surfaceNodes,surfaceFaces,minPar)
+        distanceField = gen_LDPMCSL_analyticField(geoType,dimensions,surfaceNodes,surfaceFaces,minC,maxC)
+    if distanceFieldToggle == "On" and distanceField is None:
+        if geoType == "Import CAD or Mesh":
+            cacheDir = os.path.dirname(cadFile)
+        else:
+            cacheDir = outDir
+        distanceFieldFile = Path(cacheDir + "/distanceField-" + meshHash[0:16] + ".npz")
+        distanceField = read_LDPMCSL_distanceField(distanceFieldFile,meshHash)
+        if distanceField is None:
+            self.form[5].statusWindow.setText("Status: Building signed distance field.") 
+            distanceField = gen_LDPMCSL_distanceField(surfaceBVH,minC,maxC,minPar)
+            try:
+                mkData_LDPMCSL_distanceField(distanceField,meshHash,distanceFieldFile)
+            except OSError:
+                pass
+
+    # Store the depth of each tet so that candidates deep inside skip the
+    # surface checks
+    update_LDPMCSL_tetDepth(tetSampler,surfaceBVH,distanceField)
+
+    # Store the particle diameters in the output directory so that later runs
+    # with the same mix design and seed reuse them (only for a seed given by
+    # the user, a drawn seed is never used again)
+    if particleCacheToggle == "On" and seedGiven:
+        particleCacheDir = outDir
+    else:
+        particleCacheDir = None
+
 
 
     verts = meshVertices[np.array(meshTets).flatten()-1]
@@ -343,6 +463,9 @@ def driver_LDPMCSL(self,fastGen,tempPath):
         np.save(tempPath + "meshVertices.npy", meshVertices)
         np.save(tempPath + "meshTets.npy", meshTets)
         np.save(tempPath + "surfaceNodes.npy", surfaceNodes)
+        np.save(tempPath + "surfaceFaces.npy", surfaceFaces)
+        if distanceField is not None:
+            mkData_LDPMCSL_distanceField(distanceField,meshHash,tempPath + "distanceField.npz")
 
         # Get the current directory 
         currentDir = os.path.dirname(os.path.realpath(__file__))
@@ -368,7 +491,15 @@ from gen_LDPMCSL_multiStep   import gen_LDPMCSL_multiStep
             f.write('numCPU = ' + str(numCPU) + "\n")
             f.write('numIncrements = ' + str(numIncrements) + "\n")
             f.write('maxIter = ' + str(maxIter) + "\n")
+            f.write('placementAlg = "' + placementAlg + '"\n')
+            f.write('placementSeed = ' + str(placementSeed) + "\n")
+            f.write('seedGiven = ' + str(seedGiven) + "\n")
+            f.write('checkpointInterval = ' + str(checkpointInterval) + "\n")
+            f.write('placementResume = "' + placementResume + '"\n')
+            f.write('checkpointDir = r"' + outDir + '"\n')
+            f.write('particleCacheToggle = "' + particleCacheToggle + '"\n')
             f.write('parOffset = ' + str(parOffset) + "\n")
+            f.write('hybridCutoff = ' + str(hybridCutoff) + "\n")
             f.write('maxEdgeLength = ' + str(maxEdgeLength) + "\n")
             f.write('max_dist = ' + str(max_dist) + "\n")
             f.write('minPar = ' + str(minPar) + "\n")
@@ -475,7 +606,7 @@ from gen_LDPMCSL_multiStep   import gen_LDPMCSL_multiStep
 
 def main():
                 
-    generation = gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, maxEdgeLength, max_dist, minPar, maxPar, sieveCurveDiameter, sieveCurvePassing, wcRatio, cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC, flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity, densityWater, multiMatToggle, aggFile, multiMatFile, grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP, grainBinderMin, grainBinderMax, grainBinderFuller, grainBinderSieveD, grainBinderSieveP, grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP, tetVolume, minC, maxC, verbose)
+    generation = gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, maxEdgeLength, max_dist, minPar, maxPar, sieveCurveDiameter, sieveCurvePassing, wcRatio, cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC, flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity, densityWater, multiMatToggle, aggFile, multiMatFile, grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP, grainBinderMin, grainBinderMax, grainBinderFuller, grainBinderSieveD, grainBinderSieveP, grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP, tetVolume, minC, maxC, verbose, placementAlg, placementSeed, checkpointInterval, placementResume, checkpointDir, hybridCutoff, particleCacheToggle, seedGiven)
                 
                 
 if __name__ == '__main__':
@@ -486,7 +617,10 @@ if __name__ == '__main__':
         
         
         # Run the generation   
-        os.system("python " + str(Path(currentDir + "/tempGen.py")))
+        if placementAlg == "Distributed Trial-and-Error (MPI)":
+            os.system("mpirun -n " + str(numCPU) + " python " + str(Path(currentDir + "/tempGen.py")))
+        else:
+            os.system("python " + str(Path(currentDir + "/tempGen.py")))
 
         # Read the temporary internalNodes file
         internalNodes = np.load(tempPath + "internalNodes.npy")
@@ -520,6 +654,9 @@ if __name__ == '__main__':
         os.remove(tempPath + "meshVertices.npy")
         os.remove(tempPath + "meshTets.npy")
         os.remove(tempPath + "surfaceNodes.npy")
+        os.remove(tempPath + "surfaceFaces.npy")
+        if distanceField is not None:
+            os.remove(tempPath + "distanceField.npz")
         os.remove(tempPath + "particleID.npy")
 
 
@@ -572,24 +709,14 @@ if __name__ == '__main__':
                     [grainMin,grainMax,grainFuller,grainSieveD,grainSieveP] = [grainITZMin,grainITZMax,grainITZFuller,grainITZSieveD,grainITZSieveP]
 
 
-                # Shift sieve curve if needed
-                if grainSieveD != (0 or None or [] or ""):
-                    [newGrainSieveCurveD,newGrainSieveCurveP,grainNewSet,grainW_min,grainW_max] = calc_sieveCurve(grainMin,grainMax,grainSieveD,grainSieveP)
-                else:
-                    newGrainSieveCurveD,newGrainSieveCurveP,grainNewSet,grainW_min,grainW_max = 0, 0, 0, 0, 0
-
-                # Calculates volume of each set of grains
-                [volGrainFracPar,volGrains,cdf,cdf1,kappa_i] = calc_parVolume(tetVolume*len(aggVoxels)/(len(aggVoxels)+len(itzVoxels)+len(binderVoxels)), wcRatio, cementC,
-                                                            airFrac, grainFuller, 
-                                                            flyashC, silicaC, scmC, fillerC,
-                                                            flyashDensity, silicaDensity, 
-                                                            scmDensity, fillerDensity, cementDensity,
-                                                            densityWater, grainMin, grainMax,
-                                                            newGrainSieveCurveD, newGrainSieveCurveP, 
-                                                            grainNewSet, grainW_min, grainW_max)
-
-                # Generates list of needed grains
-                [maxGrainsNum,grainsDiameterList] = gen_particleList(volGrains,grainMin,grainMax,newGrainSieveCurveD,cdf,kappa_i,grainNewSet,grainFuller)
+                # Calculates volume and list of each set of grains (sieve curve,
+                # volume fraction and grain list, reused from an earlier run
+                # with the same mix design and seed)
+                [volGrainFracPar,volGrains,maxGrainsNum,grainsDiameterList] = gen_LDPMCSL_particleDiameters(\
+                    tetVolume*len(aggVoxels)/(len(aggVoxels)+len(itzVoxels)+len(binderVoxels)), wcRatio, cementC,
+                    airFrac, grainFuller, flyashC, silicaC, scmC, fillerC,
+                    flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity,
+                    densityWater, grainMin, grainMax, grainSieveD, grainSieveP, placementSeed, i, particleCacheDir)
 
                 if i == 0:
                     aggGrainsDiameterList = grainsDiameterList
@@ -611,29 +738,15 @@ if __name__ == '__main__':
         if multiMatToggle == "Off":
 
 
-            # Shift sieve curve if needed
-            if sieveCurveDiameter != (0 or None or [] or ""):
-                # Shifts sieve curve to appropriate range
-                [newSieveCurveD, newSieveCurveP, NewSet, w_min, w_max] = calc_sieveCurve(minPar, maxPar, sieveCurveDiameter, sieveCurvePassing)
-            else:
-                newSieveCurveD, newSieveCurveP, w_min, w_max, NewSet = 0, 0, 0, 0, 0
-
-            # Calculates volume of particles needed
-            [volFracPar, parVolTotal, cdf, cdf1, kappa_i] = calc_parVolume(tetVolume, wcRatio, cementC,
-                                                        airFrac, fullerCoef, 
-                                                        flyashC, silicaC, scmC, fillerC,
-                                                        flyashDensity, silicaDensity, 
-                                                        scmDensity, fillerDensity, cementDensity,
-                                                        densityWater, minPar, maxPar,
-                                                        newSieveCurveD, newSieveCurveP, 
-                                                        NewSet, w_min, w_max)
-
-
-
             self.form[5].statusWindow.setText("Status: Calculating list of particles.") 
-            # Calculate list of particle diameters for placement
-            [maxParNum,parDiameterList] = gen_particleList(parVolTotal,minPar,maxPar,newSieveCurveD,\
-                cdf,kappa_i,NewSet,fullerCoef)
+            # Calculate volume of particles needed and list of particle
+            # diameters for placement (sieve curve, volume fraction and
+            # particle list, reused from an earlier run with the same mix
+            # design and seed)
+            [volFracPar, parVolTotal, maxParNum, parDiameterList] = gen_LDPMCSL_particleDiameters(tetVolume, wcRatio,
+                cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC,
+                flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity,
+                densityWater, minPar, maxPar, sieveCurveDiameter, sieveCurvePassing, placementSeed, 0, particleCacheDir)
         
             # Initialize empty particle nodes list outside geometry
             internalNodes = (np.zeros((len(parDiameterList),3))+2)*maxC
@@ -658,61 +771,254 @@ if __name__ == '__main__':
         self.form[5].statusWindow.setText('Status: Placing particles into geometry. (' + str(0) + '/' + str(len(internalNodes)) + ')') 
         
         # Initialize values
-        newMaxIter = 6
         particlesPlaced = 0
 
+        # Initialize the trial budget of the placement and the mask of placed particles
+        controller = gen_LDPMCSL_placementController(maxIter,parOffset)
+        newMaxIter = controller['bufferSize']
+        placed = np.zeros(len(internalNodes), dtype=bool)
+
+        # Initialize cell list of placed particles for neighbor searches
+        if multiMatToggle == "On":
+            cellList = gen_LDPMCSL_cellList(minC,maxC,\
+                max(grainAggMax,grainITZMax,grainBinderMax),parOffset,\
+                min(grainAggMin,grainITZMin,grainBinderMin))
+        else:
+            cellList = gen_LDPMCSL_cellList(minC,maxC,maxPar,parOffset,minPar)
+
 
         # Initialize particleID list of length of internalNodes
         particleID = np.zeros(len(internalNodes))
-        
+
+        # Checkpoint of the placement, kept next to the outputs so an interrupted
+        # generation can continue from it
+        checkpointHash = calc_LDPMCSL_meshHash(surfaceNodes,surfaceFaces,placementSeed,placementAlg,\
+            len(internalNodes),float(np.sum(parDiameterList)))
+        checkpointFile = Path(outDir + "/placementCheckpoint-" + checkpointHash[0:16] + ".npz")
+        checkpointTime = time.time()
+        resumeParticle = 0
+        resumeMaterial = 0
+        resumeSerialEnd = 0
+        resumeVoidMap = None
+
+        if placementResume == "On":
+            checkpoint = read_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash)
+            if checkpoint is not None:
+                internalNodes = checkpoint['internalNodes']
+                placed = checkpoint['placed']
+                particleID = checkpoint['particleID']
+                controller = checkpoint['controller']
+                newMaxIter = checkpoint['newMaxIter']
+                resumeParticle = checkpoint['nextParticle']
+                resumeMaterial = checkpoint['material']
+                resumeSerialEnd = checkpoint['serialEnd']
+                resumeVoidMap = checkpoint['voidMap']
+
+                # Add the particles placed before the interruption to the cell list
+                for x in np.flatnonzero(placed):
+                    update_LDPMCSL_cellList(cellList,x,internalNodes[x,:],parDiameterList[x])
+
+                self.form[5].statusWindow.setText('Status: Resuming placement from checkpoint. (' + str(np.count_nonzero(placed)) + '/' + str(len(internalNodes)) + ')')
+
         if multiMatToggle == "On":
 
-            for i in range(3):
+            # Voxel centers of each material to draw candidates from, and first node
+            # of each material
+            voxelTables = [gen_LDPMCSL_voxelTable(voxels,multiMatY,multiMatZ,multiMatRes,minC,maxC)\
+                for voxels in (aggVoxels,itzVoxels,binderVoxels)]
+            nodeOffsets = [0,len(aggGrainsDiameterList),len(aggGrainsDiameterList)+len(itzGrainsDiameterList)]
 
-                # Place in order of aggregate > ITZ > binder
-                if i == 0:
-                    [grainsDiameterList,voxels,grainMin,grainMax,voxelIDs] = [aggGrainsDiameterList,aggVoxels,grainAggMin,grainAggMax,aggVoxelIDs]
-                elif i == 1:
-                    [grainsDiameterList,voxels,grainMin,grainMax,voxelIDs] = [itzGrainsDiameterList,itzVoxels,grainITZMin,grainITZMax,0]
-                elif i == 2:
-                    [grainsDiameterList,voxels,grainMin,grainMax,voxelIDs] = [binderGrainsDiameterList,binderVoxels,grainBinderMin,grainBinderMax,0]
+            process_pool = None
+            sharedMemory = []
+            try:
+                if numCPU > 1:
 
+                    # Share the mesh, particle, voxel and search arrays with a worker pool
+                    # created once for all materials. The serial placement writes to the
+                    # same arrays, so the workers always see every particle placed so far.
+                    [poolData, sharedMemory, descriptors] = cwShareArrays({'facePoints': surfaceNodes,\
+                        'vertices': meshVertices, 'tets': meshTets, 'coord1': coord1, 'coord2': coord2, 'coord3': coord3,\
+                        'coord4': coord4, 'maxIter': maxIter, 'parDiameterList': parDiameterList, 'maxEdgeLength': maxEdgeLength,\
+                        'max_dist': max_dist, 'nodes': internalNodes, 'cellList': cellList, 'surfaceBVH': surfaceBVH,\
+                        'tetTree': tetTree, 'distanceField': distanceField, 'seed': placementSeed, 'voxelTables': voxelTables,\
+                        'voxelIDs': [aggVoxelIDs,0,0], 'grainMin': [grainAggMin,grainITZMin,grainBinderMin],\
+                        'grainMax': [grainAggMax,grainITZMax,grainBinderMax]})
 
-                # Generate particles for length of needed aggregate (not placed via MPI)
-                for x in range(particlesPlaced,len(grainsDiameterList)):
+                    process_pool = multiprocessing.Pool(numCPU, initializer=gen_particleSharedInit, initargs=(descriptors,))
 
-                    # Generate particle
-                    [newMaxIter,node,iterReq,particleID[x]] = gen_LDPMCSL_subParticle(surfaceNodes,grainsDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,grainMin,grainMax,\
-                        parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes,\
-                        multiMatX,multiMatY,multiMatZ,multiMatRes,voxels,voxelIDs,minC,maxC)
+                    internalNodes = poolData['nodes']
+                    cellList = poolData['cellList']
 
-                    # Update progress bar every 1% of placement
-                    if x % np.rint(len(grainsDiameterList)/100) == 0:
-                        self.form[5].progressBar.setValue(80*((x)/len(grainsDiameterList))+6) 
+                for i in range(3):
 
-                    if len(grainsDiameterList)<=1000:
-                        # Update number particles placed every 1%
-                        if x % np.rint(len(grainsDiameterList)/100) == 0:
-                            self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
-                    elif len(grainsDiameterList)<=10000:
-                        # Update number particles placed every 0.1%
-                        if x % np.rint(len(grainsDiameterList)/1000) == 0:
-                            self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
-                    else:
-                        # Update number particles placed every 0.01%
-                        if x % np.rint(len(grainsDiameterList)/10000) == 0:
-                            self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+                    # Materials completed before the checkpoint
+                    if i < resumeMaterial:
+                        continue
 
+                    # Place in order of aggregate > ITZ > binder
                     if i == 0:
-                        internalNodes[x,:] = node
+                        [grainsDiameterList,grainMin,grainMax,voxelIDs] = [aggGrainsDiameterList,grainAggMin,grainAggMax,aggVoxelIDs]
                     elif i == 1:
-                        internalNodes[x+len(aggGrainsDiameterList),:] = node
+                        [grainsDiameterList,grainMin,grainMax,voxelIDs] = [itzGrainsDiameterList,grainITZMin,grainITZMax,0]
                     elif i == 2:
-                        internalNodes[x+len(aggGrainsDiameterList)+len(itzGrainsDiameterList),:] = node
+                        [grainsDiameterList,grainMin,grainMax,voxelIDs] = [binderGrainsDiameterList,grainBinderMin,grainBinderMax,0]
+
+                    voxelTable = voxelTables[i]
+                    particlesPlaced = 0
+
+                    if numCPU > 1:
+
+                        # Place the particles of the first increments of the material in
+                        # parallel rounds, as for the single-material placement
+                        roundSize = math.floor(len(grainsDiameterList)/numIncrements)
+                        placeQueue = np.arange((numIncrements-1)*roundSize)
+                        placeQueue = placeQueue[~placed[placeQueue+nodeOffsets[i]]]
+
+                        # Index of the next candidate to test for each particle
+                        firstCandidate = np.zeros(len(grainsDiameterList), dtype=int)
+
+                        while len(placeQueue) > 0:
+
+                            roundIndex = placeQueue[0:roundSize]
+
+                            # Share the cell table again if it was widened since the last round
+                            if poolData['cellList']['cellTable'].shape != descriptors['cellList']['cellTable'][2]:
+                                [poolData['cellList']['cellTable'], tableMemory, descriptors['cellList']['cellTable']] = \
+                                    cwShareArrays(poolData['cellList']['cellTable'])
+                                sharedMemory.extend(tableMemory)
+
+                            outputMPI = np.array(process_pool.map(gen_subParticleShared, [(i, index, index+nodeOffsets[i],\
+                                newMaxIter, firstCandidate[index], controller['parOffset'], descriptors['cellList']['cellTable'])\
+                                for index in roundIndex]))
+
+                            nodeMPI = outputMPI[:,0:3]
+                            acceptedCandidate = outputMPI[:,5].astype(int)
+
+                            # Particles that ran out of trials test the same candidates again. The
+                            # trials of a particle count from its first candidate, as in the serial
+                            # placement.
+                            failed = np.isnan(nodeMPI[:,0])
+                            iterReq = acceptedCandidate + 1
+                            firstCandidate[roundIndex[~failed]] = acceptedCandidate[~failed]
+
+                            # Find conflicts inside the round and keep a maximal subset without them
+                            placedMPI = np.flatnonzero(~failed)
+                            [pairI,pairJ] = calc_LDPMCSL_batchConflicts(nodeMPI[placedMPI],\
+                                grainsDiameterList[roundIndex[placedMPI]],controller['parOffset'])
+                            keep = calc_LDPMCSL_independentSet(len(roundIndex),placedMPI[pairI],placedMPI[pairJ])
+                            keep[failed] = False
+
+                            # With a seed given by the user, only keep the particles before the first
+                            # conflict so the result is the same as the serial placement
+                            if seedGiven and not keep.all():
+                                firstLoser = np.argmin(keep)
+                                keep[firstLoser:] = False
+                                failed[firstLoser+1:] = False
+                                if not failed[firstLoser]:
+                                    firstCandidate[roundIndex[firstLoser]] += 1
+
+                            for x in np.flatnonzero(keep):
+                                nodeIndex = roundIndex[x]+nodeOffsets[i]
+                                internalNodes[nodeIndex,:] = nodeMPI[x,:]
+                                update_LDPMCSL_cellList(cellList,nodeIndex,nodeMPI[x,:],grainsDiameterList[roundIndex[x]])
+                                placed[nodeIndex] = True
+                                particleID[nodeIndex] = outputMPI[x,3]
+                                newMaxIter = update_LDPMCSL_placementController(controller,iterReq[x])
+
+                            placeQueue = np.concatenate((roundIndex[~keep],placeQueue[roundSize:]))
+
+                            # Relax the offset when a particle ran out of trials (all candidates are
+                            # tested again) or stop with the particles placed so far
+                            if failed.any():
+                                if not check_LDPMCSL_placementRetry(controller,roundIndex[np.argmax(failed)]+nodeOffsets[i]):
+                                    break
+                                firstCandidate[:] = 0
+
+                            nPlaced = (numIncrements-1)*roundSize - len(placeQueue)
+
+                            # Update progress bar every round
+                            self.form[5].progressBar.setValue(80*(nPlaced/len(grainsDiameterList))+6)
+
+                            self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(nPlaced) + '/' + str(len(grainsDiameterList)) + ')')
+
+                            if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                                mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,internalNodes,placed,particleID,\
+                                    0,i,newMaxIter,controller)
+                                checkpointTime = time.time()
+
+                        particlesPlaced = (numIncrements-1)*roundSize
+
+                        # Nothing is left to place in serial if the parallel placement stopped
+                        if controller['failedIndex'] >= 0:
+                            particlesPlaced = len(grainsDiameterList)
+
+
+                    # Generate particles for length of needed aggregate (not placed via MPI)
+                    for x in range(max(particlesPlaced,resumeParticle if i == resumeMaterial else 0),len(grainsDiameterList)):
+
+                        nodeIndex = x+nodeOffsets[i]
+
+                        # Generate particle, relaxing the offset when the trial budget runs out
+                        node = None
+                        while node is None:
+                            [newMaxIter,node,iterReq,particleID[nodeIndex]] = gen_LDPMCSL_subParticle(surfaceNodes,grainsDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,grainMin,grainMax,\
+                                controller['parOffset'],parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes,\
+                                voxelTable,voxelIDs,cellList,surfaceBVH,tetTree,distanceField,placementSeed,i,x)
+                            if node is None and not check_LDPMCSL_placementRetry(controller,nodeIndex):
+                                break
+
+                        # Stop with the particles placed so far
+                        if node is None:
+                            break
+                        newMaxIter = update_LDPMCSL_placementController(controller,iterReq)
+
+                        # Update progress bar every 1% of placement
+                        if x % np.rint(len(grainsDiameterList)/100) == 0:
+                            self.form[5].progressBar.setValue(80*((x)/len(grainsDiameterList))+6) 
+
+                        if len(grainsDiameterList)<=1000:
+                            # Update number particles placed every 1%
+                            if x % np.rint(len(grainsDiameterList)/100) == 0:
+                                self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+                        elif len(grainsDiameterList)<=10000:
+                            # Update number particles placed every 0.1%
+                            if x % np.rint(len(grainsDiameterList)/1000) == 0:
+                                self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+                        else:
+                            # Update number particles placed every 0.01%
+                            if x % np.rint(len(grainsDiameterList)/10000) == 0:
+                                self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+
+                        internalNodes[nodeIndex,:] = node
+                        update_LDPMCSL_cellList(cellList,nodeIndex,node,grainsDiameterList[x])
+                        placed[nodeIndex] = True
+
+                        # Write a checkpoint of the placement every checkpointInterval minutes
+                        if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                            mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,internalNodes,placed,particleID,\
+                                x+1,i,newMaxIter,controller)
+                            checkpointTime = time.time()
         
 
+                    if controller['failedIndex'] >= 0:
+                        break
+
+
+                    self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(len(grainsDiameterList)) + '/' + str(len(grainsDiameterList)) + ')')
 
-                self.form[5].statusWindow.setText("Status: Placing material " + str(i) + " grains into geometry. (" + str(len(grainsDiameterList)) + '/' + str(len(grainsDiameterList)) + ')')
+            finally:
+                # Stop the workers and free the shared arrays, also when the placement
+                # stops with an exception
+                if process_pool is not None:
+                    process_pool.terminate()
+                    process_pool.join()
+                if len(sharedMemory) > 0:
+                    # Copy the placed particles back into private memory and free the shared arrays
+                    placedData = cwReleaseArrays(poolData, sharedMemory)
+
+            if numCPU > 1:
+                internalNodes = placedData['nodes']
+                cellList = placedData['cellList']
 
             materialList = np.concatenate((np.ones(len(aggGrainsDiameterList))*3,np.ones(len(itzGrainsDiameterList))*1, np.ones(len(binderGrainsDiameterList))*2))
         
@@ -729,84 +1035,222 @@ if __name__ == '__main__':
 
         if multiMatToggle == "Off":
 
-            if numCPU > 1:
+            # Place all particles at once by collective rearrangement (unless resuming).
+            # The particles taken out of the jammed packing are inserted one by one
+            # against it below, relaxing the offset as for the other placements.
+            if placementAlg == "Collective Rearrangement":
+                if not placed.any():
+                    self.form[5].statusWindow.setText("Status: Placing particles into geometry by collective rearrangement.")
+                    [internalNodes,placed] = gen_particleCollective(parDiameterList,meshVertices,meshTets,tetVolume,minPar,\
+                        controller['parOffset'],surfaceBVH,distanceField,tetSampler,placementSeed)
+                    for x in np.flatnonzero(placed):
+                        update_LDPMCSL_cellList(cellList,x,internalNodes[x,:],parDiameterList[x])
+                    controller['nPlaced'] = np.count_nonzero(placed)
+
+            elif numCPU > 1:
             
                 
-                for increment in range(numIncrements-1):
-
-                    process_pool = multiprocessing.Pool(numCPU)
-
-                    outputMPI = process_pool.map(functools.partial(gen_particleMPI, surfaceNodes,maxParNum, minC, maxC, meshVertices, \
-                        meshTets, coord1,coord2,coord3,coord4,newMaxIter,maxIter,minPar,\
-                        maxPar,parOffset,verbose,parDiameterList,maxEdgeLength,max_dist,internalNodes), parDiameterList[particlesPlaced:particlesPlaced+math.floor(len(parDiameterList)/numIncrements)])
-
-                    nodeMPI = np.array(outputMPI)[:,0:3]
-                    diameter = np.array(outputMPI)[:,3]
-                    newMaxIter = int(max(np.array(outputMPI)[:,4]))
-                    maxAttempts = int(max(np.array(outputMPI)[:,5]))
-
-                    particlesPlaced = particlesPlaced+len(np.array(outputMPI)[:,0:3])        
-
-                    for x in range(len(nodeMPI)):
-
-                        # Store placed particles from this increment
-                        internalNodes[particlesPlaced+x,:] = nodeMPI[x,:]
-
-                        # Obtain extents for floating bin for node to test
-                        binMin = np.array(([nodeMPI[x,0]-diameter[x]/2-maxPar/2-parOffset,\
-                            nodeMPI[x,1]-diameter[x]/2-maxPar/2-parOffset,nodeMPI[x,2]-\
-                            diameter[x]/2-maxPar/2-parOffset]))
-                        binMax = np.array(([nodeMPI[x,0]+diameter[x]/2+maxPar/2+parOffset,\
-                            nodeMPI[x,1]+diameter[x]/2+maxPar/2+parOffset,nodeMPI[x,2]+\
-                            diameter[x]/2+maxPar/2+parOffset]))
-
-                        # Check if particle overlapping any just added particles (ignore first one placed)
-                        if x > 0:
-
-                            overlap = check_particleOverlapMPI(nodeMPI[x,:],diameter[x],binMin,\
-                                binMax,minPar,parOffset,nodeMPI[0:x],diameter[0:x])
-
-                            if overlap == True:
-
-                                [newMaxIter,node,iterReq] = gen_particle(surfaceNodes,\
-                                    parDiameterList[particlesPlaced+x], meshVertices, \
-                                    meshTets,newMaxIter,maxIter,minPar,\
-                                    maxPar,parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes)
-                                
-                                internalNodes[particlesPlaced+x,:] = node[0,:]
-
+                # Place the particles of the first increments in parallel rounds. Each
+                # round places the queued particles against the particles already placed,
+                # keeps a maximal subset without conflicts inside the round and
+                # re-queues the rest for the next round.
+                roundSize = math.floor(len(parDiameterList)/numIncrements)
+                placeQueue = np.arange((numIncrements-1)*roundSize)
+                placeQueue = placeQueue[~placed[placeQueue]]
+
+
+                # Share the mesh, particle and search arrays with a worker pool created
+                # once for the parallel placement, so tasks only carry an index and where
+                # to resume its candidates
+                [poolData, sharedMemory, descriptors] = cwShareArrays({'facePoints': surfaceNodes, 'maxParNum': maxParNum,\
+                    'minC': minC, 'maxC': maxC, 'vertices': meshVertices, 'tets': meshTets, 'coord1': coord1, 'coord2': coord2,\
+                    'coord3': coord3, 'coord4': coord4, 'maxIter': maxIter, 'minPar': minPar, 'maxPar': maxPar,\
+                    'verbose': verbose, 'parDiameterList': parDiameterList, 'maxEdgeLength': maxEdgeLength, 'max_dist': max_dist,\
+                    'nodes': internalNodes, 'cellList': cellList, 'surfaceBVH': surfaceBVH, 'tetTree': tetTree,\
+                    'distanceField': distanceField, 'tetSampler': tetSampler, 'seed': placementSeed})
+
+                process_pool = None
+                try:
+                    process_pool = multiprocessing.Pool(numCPU, initializer=gen_particleSharedInit, initargs=(descriptors,))
+
+                    # Index of the next candidate to test for each particle
+                    firstCandidate = np.zeros(len(parDiameterList), dtype=int)
+
+                    while len(placeQueue) > 0:
+
+                        roundIndex = placeQueue[0:roundSize]
+
+                        # Share the cell table again if it was widened in the last round
+                        if poolData['cellList']['cellTable'].shape != descriptors['cellList']['cellTable'][2]:
+                            [poolData['cellList']['cellTable'], tableMemory, descriptors['cellList']['cellTable']] = \
+                                cwShareArrays(poolData['cellList']['cellTable'])
+                            sharedMemory.extend(tableMemory)
+
+                        outputMPI = process_pool.map(gen_particleShared, [(index, newMaxIter, firstCandidate[index],\
+                            controller['parOffset'], descriptors['cellList']['cellTable']) for index in roundIndex])
+
+                        nodeMPI = np.array(outputMPI)[:,0:3]
+                        diameter = np.array(outputMPI)[:,3]
+                        acceptedCandidate = np.array(outputMPI)[:,5].astype(int)
+
+                        # Particles that ran out of trials test the same candidates again. The
+                        # trials of a particle count from its first candidate, as in the serial
+                        # placement.
+                        failed = np.isnan(nodeMPI[:,0])
+                        iterReq = acceptedCandidate + 1
+                        firstCandidate[roundIndex[~failed]] = acceptedCandidate[~failed]
+
+                        # Find conflicts inside the round and keep a maximal subset without them
+                        placedMPI = np.flatnonzero(~failed)
+                        [pairI,pairJ] = calc_LDPMCSL_batchConflicts(nodeMPI[placedMPI],diameter[placedMPI],controller['parOffset'])
+                        keep = calc_LDPMCSL_independentSet(len(roundIndex),placedMPI[pairI],placedMPI[pairJ])
+                        keep[failed] = False
+
+                        # With a seed given by the user, only keep the particles before the first
+                        # conflict so the result is the same as the serial placement. The first
+                        # rejected particle moves on to its next candidate, the following ones
+                        # test theirs again.
+                        if seedGiven and not keep.all():
+                            firstLoser = np.argmin(keep)
+                            keep[firstLoser:] = False
+                            failed[firstLoser+1:] = False
+                            if not failed[firstLoser]:
+                                firstCandidate[roundIndex[firstLoser]] += 1
+
+                        for x in np.flatnonzero(keep):
+                            poolData['nodes'][roundIndex[x],:] = nodeMPI[x,:]
+                            update_LDPMCSL_cellList(poolData['cellList'],roundIndex[x],nodeMPI[x,:],diameter[x])
+                            placed[roundIndex[x]] = True
+                            newMaxIter = update_LDPMCSL_placementController(controller,iterReq[x])
+
+                        placeQueue = np.concatenate((roundIndex[~keep],placeQueue[roundSize:]))
+
+                        # Relax the offset when a particle ran out of trials (all candidates are
+                        # tested again) or stop with the particles placed so far
+                        if failed.any():
+                            if not check_LDPMCSL_placementRetry(controller,roundIndex[np.argmax(failed)]):
+                                break
+                            firstCandidate[:] = 0
+
+                        nPlaced = (numIncrements-1)*roundSize - len(placeQueue)
+
+                        self.form[5].progressBar.setValue(95*((nPlaced)/len(parDiameterList))+6) 
+                        self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(nPlaced) + '/' + str(len(parDiameterList)) + ')')
+
+                        if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                            mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,poolData['nodes'],placed,particleID,\
+                                0,0,newMaxIter,controller)
+                            checkpointTime = time.time()
+
+                finally:
+                    # Stop the workers and free the shared arrays, also when the placement
+                    # stops with an exception
+                    if process_pool is not None:
+                        process_pool.terminate()
+                        process_pool.join()
+                    # Copy the placed particles back into private memory and free the shared arrays
+                    placedData = cwReleaseArrays(poolData, sharedMemory)
+
+                internalNodes = placedData['nodes']
+                cellList = placedData['cellList']
+
+                particlesPlaced = (numIncrements-1)*roundSize
+
+                # Nothing is left to place in serial if the parallel placement stopped
+                if controller['failedIndex'] >= 0:
+                    particlesPlaced = len(parDiameterList)
+
+
+
+            # Build void map of the free space, including the particles already placed
+            # (the void map of a checkpoint also keeps the usable cells of the size class)
+            voidMap = None
+            if placementAlg == "Void-Tracking":
+                voidMap = gen_LDPMCSL_voidMap(surfaceBVH,minC,maxC,minPar,maxPar,distanceField)
+                if resumeVoidMap is not None:
+                    voidMap.update(resumeVoidMap)
+                else:
+                    for x in np.flatnonzero(placed):
+                        update_LDPMCSL_voidMap(voidMap,internalNodes[x,:],parDiameterList[x],controller['parOffset'])
 
-                    self.form[5].progressBar.setValue(95*((x)/len(parDiameterList))+6) 
-                    self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+            # Only the coarse particles are placed one by one in the hybrid placement
+            nSerial = len(parDiameterList)
+            if placementAlg == "Hybrid Poisson-Disk":
+                nSerial = np.count_nonzero(parDiameterList > hybridCutoff)
 
+                # Go on with a size class the fill handed back before the interruption
+                nSerial = max(nSerial,resumeSerialEnd)
 
             # Generate particles for length of needed aggregate (not placed via MPI)
-            for x in range(particlesPlaced,len(parDiameterList)):
-
-                # Generate particle
-                [newMaxIter,node,iterReq] = gen_particle(surfaceNodes,parDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,minPar,maxPar,\
-                    parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes)
-
-                # Update progress bar every 1% of placement
-                if x % np.rint(len(parDiameterList)/100) == 0:
-                    self.form[5].progressBar.setValue(80*((x)/len(parDiameterList))+6) 
+            serialStart = max(particlesPlaced,resumeParticle)
+            while True:
+                for x in range(serialStart,nSerial):
+
+                    # Skip the particles already placed by collective rearrangement
+                    if placed[x]:
+                        continue
+
+                    # Generate particle, relaxing the offset when the trial budget runs out
+                    node = None
+                    while node is None:
+                        if placementAlg == "Periodic":
+                            [node,iterReq] = gen_particlePeriodic(parDiameterList[x],minC,maxC,maxIter,controller['parOffset'],\
+                                parDiameterList,internalNodes,cellList,placementSeed,x)
+                        elif placementAlg == "Void-Tracking":
+                            [node,iterReq] = gen_particleVoid(parDiameterList[x],voidMap,maxIter,minPar,controller['parOffset'],\
+                                parDiameterList,internalNodes,cellList,surfaceBVH,distanceField,placementSeed,x)
+                        else:
+                            [newMaxIter,node,iterReq] = gen_particle(surfaceNodes,parDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,minPar,maxPar,\
+                                controller['parOffset'],parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes,cellList,surfaceBVH,tetTree,distanceField,tetSampler,\
+                                placementSeed,x)
+                        if node is None and not check_LDPMCSL_placementRetry(controller,x):
+                            break
+
+                    # Stop with the particles placed so far
+                    if node is None:
+                        break
+                    newMaxIter = update_LDPMCSL_placementController(controller,iterReq)
 
-                if len(parDiameterList)<=1000:
-                    # Update number particles placed every 1%
+                    # Update progress bar every 1% of placement
                     if x % np.rint(len(parDiameterList)/100) == 0:
-                        self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
-                elif len(parDiameterList)<=10000:
-                    # Update number particles placed every 0.1%
-                    if x % np.rint(len(parDiameterList)/1000) == 0:
-                        self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
-                else:
-                    # Update number particles placed every 0.01%
-                    if x % np.rint(len(parDiameterList)/10000) == 0:
-                        self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+                        self.form[5].progressBar.setValue(80*((x)/len(parDiameterList))+6) 
 
-                internalNodes[x,:] = node
-
-            self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(len(parDiameterList)) + '/' + str(len(parDiameterList)) + ')')
+                    if len(parDiameterList)<=1000:
+                        # Update number particles placed every 1%
+                        if x % np.rint(len(parDiameterList)/100) == 0:
+                            self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+                    elif len(parDiameterList)<=10000:
+                        # Update number particles placed every 0.1%
+                        if x % np.rint(len(parDiameterList)/1000) == 0:
+                            self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+                    else:
+                        # Update number particles placed every 0.01%
+                        if x % np.rint(len(parDiameterList)/10000) == 0:
+                            self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+
+                    internalNodes[x,:] = node
+                    update_LDPMCSL_cellList(cellList,x,node,parDiameterList[x])
+                    placed[x] = True
+                    if placementAlg == "Void-Tracking":
+                        update_LDPMCSL_voidMap(voidMap,node,parDiameterList[x],controller['parOffset'])
+
+                    # Write a checkpoint of the placement every checkpointInterval minutes
+                    if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                        mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,internalNodes,placed,particleID,\
+                            x+1,0,newMaxIter,controller,nSerial,voidMap)
+                        checkpointTime = time.time()
+
+                # Fill the space left with the fine particles, place the particles of a
+                # size class the fill could not take one by one and go on with the fill
+                if nSerial < len(parDiameterList) and controller['failedIndex'] < 0:
+                    self.form[5].statusWindow.setText("Status: Filling the fine particles into geometry.")
+                    [serialStart, nSerial] = gen_particlePoissonDisk(parDiameterList,max(serialStart,nSerial),minPar,minC,maxC,tetSampler,\
+                        internalNodes,placed,controller,cellList,surfaceBVH,distanceField,placementSeed)
+                    if serialStart < nSerial:
+                        continue
+                break
+
+            self.form[5].statusWindow.setText("Status: Placing particles into geometry. (" + str(np.count_nonzero(placed)) + '/' + str(len(parDiameterList)) + ')')
 
 
             materialList = np.ones(len(parDiameterList))
@@ -819,6 +1263,21 @@ if __name__ == '__main__':
 
 
 
+        # The placement is complete, so its checkpoint is no longer needed
+        if os.path.isfile(checkpointFile):
+            os.remove(checkpointFile)
+
+        # Keep the placed particles only and report if the placement did not go as
+        # requested (relaxed offset or placement stopped early)
+        if controller['relaxCount'] > 0 or controller['failedIndex'] >= 0:
+            report = mkData_LDPMCSL_placementReport(controller,parDiameterList,placed,tempPath + geoName + '-data-placementReport.dat')
+            print(report)
+            internalNodes = internalNodes[placed]
+            parDiameterList = parDiameterList[placed]
+            materialList = materialList[placed]
+            particleID = particleID[placed]
+
+
         placementTime = round(time.time() - start_time,2)   
         nParticles = len(parDiameterList) 
 
@@ -838,17 +1297,41 @@ if __name__ == '__main__':
 
     tetTessTimeStart = time.time()
 
+    # Verify the packing before tetrahedralizing it (stops on overlapping or
+    # escaping particles)
+    self.form[5].statusWindow.setText("Status: Verifying particle packing.") 
+    if multiMatToggle == "On":
+        minPar = min(minPar,grainAggMin,grainITZMin,grainBinderMin)
+    [binCounts,binEdges] = check_LDPMCSL_packing(internalNodes,parDiameterList,minPar,parOffset,surfaceBVH,\
+        distanceField,(minC,maxC) if periodicToggle == "On" else None)
+    print('Nearest-neighbor gaps (bins of ' + str(round(binEdges[1],6)) + ' up to ' + str(round(binEdges[-1],6)) + \
+        '): ' + str(binCounts.tolist()))
+
     # Generate tetrahedralization
     self.form[5].statusWindow.setText("Status: Forming tetrahedralization.") 
-    tetGen = gen_LDPMCSL_tetrahedralization(internalNodes,surfaceNodes,\
-        surfaceFaces,geoName,tempPath)
-    self.form[5].progressBar.setValue(89) 
+    if periodicToggle == "On":
+
+        # Tetrahedralize the particles with their periodic images, then give
+        # the images of the mesh the properties of their particles for the
+        # tesselation (the particles of the box stay first, only they are
+        # written as particles)
+        [allNodes,allTets,allEdges,periodicIndex,periodicShift] = gen_LDPMCSL_periodicTetrahedralization(\
+            internalNodes,minC,maxC,2*maxPar,geoName,tempPath)
+        parDiameterList = parDiameterList[periodicIndex]
+        materialList = materialList[periodicIndex]
+        particleID = particleID[periodicIndex]
+        self.form[5].progressBar.setValue(90) 
+
+    else:
+        tetGen = gen_LDPMCSL_tetrahedralization(internalNodes,surfaceNodes,\
+            surfaceFaces,geoName,tempPath)
+        self.form[5].progressBar.setValue(89) 
 
 
-    # Read in tetrahedralization
-    [allNodes,allTets,allEdges] = read_LDPMCSL_tetgen(Path(tempPath + geoName \
-    + '.node'),Path(tempPath + geoName + '.ele'),Path(tempPath + geoName + '.edge'))
-    self.form[5].progressBar.setValue(90) 
+        # Read in tetrahedralization
+        [allNodes,allTets,allEdges] = read_LDPMCSL_tetgen(Path(tempPath + geoName \
+        + '.node'),Path(tempPath + geoName + '.ele'),Path(tempPath + geoName + '.edge'))
+        self.form[5].progressBar.setValue(90) 
 
 
     # Generate tesselation
@@ -861,7 +1344,7 @@ if __name__ == '__main__':
     # If edge elements are turned on, perform edge computations
     if htcToggle in ['on','On']:
         edgeData = gen_LDPMCSL_flowEdges(htcLength,allNodes,allTets,tetPoints,maxPar,\
-            meshVertices,meshTets,coord1,coord2,coord3,coord4,maxC)
+            meshVertices,meshTets,coord1,coord2,coord3,coord4,maxC,tetTree)
 
     else:
         edgeData = 0
@@ -1017,6 +1500,10 @@ if __name__ == '__main__':
 
         mkData_LDPMCSL_tets(geoName,tempPath,allTets)
 
+        if periodicToggle == "On":
+            self.form[5].statusWindow.setText("Status: Writing periodic tet data file.")
+            mkData_LDPMCSL_periodicTets(geoName,tempPath,allTets,periodicIndex,periodicShift,maxC-minC)
+
         if elementType == "CSL":
             self.form[5].statusWindow.setText("Status: Writing edge data file.")
             mkData_LDPMCSL_edges(geoName,tempPath,allEdges)
@@ -1036,8 +1523,13 @@ if __name__ == '__main__':
         # Create diameters list (including zero edge particle diameters)
         allDiameters = np.concatenate((np.array([0.0,]*int(len(allNodes)-len(parDiameterList))),parDiameterList))
 
-        # If data files requested, generate Particle Data File
-        mkData_particles(allNodes,allDiameters,geoName,tempPath)
+        # If data files requested, generate Particle Data File (a periodic
+        # model only has the particles of the box, their images are given by
+        # the periodic tet data file)
+        if periodicToggle == "On":
+            mkData_particles(internalNodes,parDiameterList[0:len(internalNodes)],geoName,tempPath)
+        else:
+            mkData_particles(allNodes,allDiameters,geoName,tempPath)
 
 
         if htcToggle in ['on','On']:
@@ -1052,8 +1544,10 @@ if __name__ == '__main__':
 
         self.form[5].statusWindow.setText("Status: Writing visualization files.")
 
-        # If visuals requested, generate Particle VTK File
-        mkVtk_particles(internalNodes,parDiameterList,materialList,geoName,tempPath)
+        # If visuals requested, generate Particle VTK File (without the
+        # periodic images of a periodic model)
+        mkVtk_particles(internalNodes,parDiameterList[0:len(internalNodes)],materialList[0:len(internalNodes)],\
+            geoName,tempPath)
 
         # If visuals requested, generate Facet VTK File
         mkVtk_LDPMCSL_facets(geoName,tempPath,tetFacets,facetMaterial)
@@ -1099,10 +1593,11 @@ if __name__ == '__main__':
         os.rename(Path(outDir + outName + '/' + geoName + '-para-mesh.vtk'),Path(outDir + outName + '/' + geoName + '-para-mesh.000.vtk'))
     except:
         pass
-    os.remove(Path(outDir + outName + '/' + geoName + '2D.mesh'))
-    os.remove(Path(outDir + outName + '/' + geoName + '.node'))
-    os.remove(Path(outDir + outName + '/' + geoName + '.ele'))
-    os.remove(Path(outDir + outName + '/' + geoName + '.edge'))
+    if periodicToggle == "Off":
+        os.remove(Path(outDir + outName + '/' + geoName + '2D.mesh'))
+        os.remove(Path(outDir + outName + '/' + geoName + '.node'))
+        os.remove(Path(outDir + outName + '/' + geoName + '.ele'))
+        os.remove(Path(outDir + outName + '/' + geoName + '.edge'))
 
 
 
@@ -1286,7 +1781,8 @@ if __name__ == '__main__':
 
     if multiMatToggle == "Off":
         # Display sieve curve data
-        mkDisp_sieveCurves(volFracPar, tetVolume, minPar, maxPar,fullerCoef,sieveCurveDiameter,sieveCurvePassing,parDiameterList)
+        mkDisp_sieveCurves(volFracPar, tetVolume, minPar, maxPar,fullerCoef,sieveCurveDiameter,sieveCurvePassing,\
+            parDiameterList[0:len(internalNodes)])
 
     # Switch back to model window
     mw=Gui.getMainWindow()
@@ -0,0 +1,92 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build an axis-aligned bounding box
+## tree over a set of primitives (triangles, tets, ...) given their
+## bounding boxes. The tree is built top-down by splitting each node at the
+## median centroid along its longest axis and is stored as flat arrays so
+## that queries can traverse it with vectorized operations.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def gen_LDPMCSL_aabbTree(boxMin, boxMax, leafSize=8):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - boxMin:           Minimum (x, y, z) coordinates of each primitive
+    - boxMax:           Maximum (x, y, z) coordinates of each primitive
+    - leafSize:         Maximum number of primitives stored in a leaf
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - tree:             Dictionary with the bounding box of each node
+                        (nodeMin, nodeMax), the children of each node
+                        (nodeLeft, nodeRight, -1 for leaves), the range of
+                        primOrder stored in each node (nodeStart, nodeCount)
+                        and the primitive indices sorted by leaf (primOrder)
+    --------------------------------------------------------------------------
+    """
+
+    boxMin = np.asarray(boxMin, dtype=float)
+    boxMax = np.asarray(boxMax, dtype=float)
+    centroids = (boxMin + boxMax) / 2
+
+    primOrder = np.arange(len(boxMin))
+    nodeMin, nodeMax, nodeLeft, nodeRight, nodeStart, nodeCount = [], [], [], [], [], []
+
+    def newNode(start, count):
+        prims = primOrder[start:start+count]
+        nodeMin.append(np.amin(boxMin[prims], axis=0))
+        nodeMax.append(np.amax(boxMax[prims], axis=0))
+        nodeLeft.append(-1)
+        nodeRight.append(-1)
+        nodeStart.append(start)
+        nodeCount.append(count)
+        return len(nodeStart) - 1
+
+    # Split nodes until every leaf holds at most leafSize primitives
+    stack = [newNode(0, len(boxMin))]
+    while stack:
+        node = stack.pop()
+        start, count = nodeStart[node], nodeCount[node]
+        if count <= leafSize:
+            continue
+
+        # Split at the median centroid along the longest centroid extent
+        prims = primOrder[start:start+count]
+        axis = np.argmax(np.ptp(centroids[prims], axis=0))
+        half = count // 2
+        primOrder[start:start+count] = prims[np.argpartition(centroids[prims, axis], half)]
+
+        nodeLeft[node] = newNode(start, half)
+        nodeRight[node] = newNode(start + half, count - half)
+        stack.extend([nodeLeft[node], nodeRight[node]])
+
+    tree = {
+        'nodeMin':   np.array(nodeMin),
+        'nodeMax':   np.array(nodeMax),
+        'nodeLeft':  np.array(nodeLeft, dtype=np.int64),
+        'nodeRight': np.array(nodeRight, dtype=np.int64),
+        'nodeStart': np.array(nodeStart, dtype=np.int64),
+        'nodeCount': np.array(nodeCount, dtype=np.int64),
+        'primOrder': primOrder,
+    }
+
+    return tree
@@ -0,0 +1,127 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build the closed-form signed distance
+## of a built-in primitive geometry from its dimensions. It is used in place
+## of the sampled distance field (see gen_LDPMCSL_distanceField), so the
+## clearance of a candidate only takes a few operations. The surface mesh
+## is inscribed in curved surfaces: the error bound covers the gap between
+## its faces and the exact surface, and candidates within it are decided
+## from the exact distance to the mesh as for the sampled field.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_analyticDistance    import calc_LDPMCSL_analyticDistance
+
+
+def gen_LDPMCSL_analyticField(geoType, dimensions, surfaceNodes, surfaceFaces, minC, maxC,
+    faceSamples=16):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - geoType:          Type of geometry
+    - dimensions:       List of dimensions of the geometry
+    - surfaceNodes:     (x, y, z) coordinates of the surface mesh nodes
+    - surfaceFaces:     Surface triangles (zero-indexed)
+    - minC:             Minimum coordinate of the geometry
+    - maxC:             Maximum coordinate of the geometry
+    - faceSamples:      Number of subdivisions of each face edge to bound the
+                        gap between the faces and the exact surface
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - distanceField:    Dictionary with the shape (fieldShape), its parameters
+                        (fieldParams) and the error bound (fieldError), or
+                        None if the geometry has no closed-form distance or
+                        its mesh does not match the dimensions
+    --------------------------------------------------------------------------
+    """
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+    surfaceNodes = np.asarray(surfaceNodes, dtype=float)[:, 0:3]
+
+    try:
+        size = [float(str(x).strip(" mm")) for x in dimensions]
+    except ValueError:
+        return None
+
+    # Shape and parameters in the placement of the FreeCAD primitives (axis
+    # along z, centered on the origin)
+    if geoType == "Box":
+        [fieldShape, fieldParams] = [1, np.concatenate((minC, maxC))]
+    elif geoType == "Cylinder":
+        [fieldShape, fieldParams] = [2, np.array([0, 0, minC[2], maxC[2], size[1], size[1]])]
+    elif geoType in ["Cone", "Truncated Cone"]:
+        [fieldShape, fieldParams] = [2, np.array([0, 0, minC[2], maxC[2], size[1], size[2]])]
+    elif geoType == "Sphere":
+        [fieldShape, fieldParams] = [3, np.array([0, 0, 0, size[0]])]
+    elif geoType == "Arbitrary Prism":
+        # The first corner of the polygon is the surface node farthest from
+        # the axis
+        corner = surfaceNodes[np.argmax(np.hypot(surfaceNodes[:,0], surfaceNodes[:,1]))]
+        [fieldShape, fieldParams] = [4, np.array([0, 0, minC[2], maxC[2], size[0], int(size[2]),\
+            np.arctan2(corner[1], corner[0])])]
+    else:
+        return None
+
+    fieldParams = fieldParams.astype(float)
+
+    # The surface nodes lie on the exact surface if the mesh is of this shape
+    tolerance = 1e-6*np.max(maxC - minC)
+    if np.max(np.abs(calc_LDPMCSL_analyticDistance(fieldShape, fieldParams, surfaceNodes))) > tolerance:
+        return None
+
+    # Faces of flat surfaces (and of the caps of cones) lie on the exact
+    # surface. Faces of curved surfaces are inside it, where the distance is
+    # concave: at any point of a face it is at most the distance at the
+    # nearest point of a grid on the face plus the slope along the face times
+    # the grid spacing
+    fieldError = tolerance
+    if fieldShape in [2, 3]:
+        [i, j] = np.triu_indices(faceSamples + 1)
+        weights = np.column_stack((faceSamples - j, j - i, i))/faceSamples
+        triangles = surfaceNodes[np.asarray(surfaceFaces, dtype=int)]
+        if fieldShape == 2:
+            onCap = np.all(np.abs(triangles[:,:,2] - fieldParams[2]) <= tolerance, axis=1) | \
+                np.all(np.abs(triangles[:,:,2] - fieldParams[3]) <= tolerance, axis=1)
+            triangles = triangles[~onCap]
+        spacing = np.max(np.linalg.norm(triangles - np.roll(triangles, 1, axis=1), axis=2), axis=1)/faceSamples
+        faceNormal = np.cross(triangles[:,1] - triangles[:,0], triangles[:,2] - triangles[:,0])
+        faceNormal = faceNormal/np.linalg.norm(faceNormal, axis=1)[:,np.newaxis]
+        step = tolerance
+        chunkSize = max(1, 100000//len(weights))
+        for start in range(0, len(triangles), chunkSize):
+            samples = np.einsum('sk,fkd->fsd', weights, triangles[start:start+chunkSize])
+            normal = np.repeat(faceNormal[start:start+chunkSize], len(weights), axis=0)
+            samples = samples.reshape(-1, 3)
+            depth = calc_LDPMCSL_analyticDistance(fieldShape, fieldParams, samples)
+            gradient = np.column_stack([(calc_LDPMCSL_analyticDistance(fieldShape, fieldParams, samples + step*e) \
+                - calc_LDPMCSL_analyticDistance(fieldShape, fieldParams, samples - step*e))/(2*step) for e in np.eye(3)])
+            slope = np.linalg.norm(gradient - np.sum(gradient*normal, axis=1)[:,np.newaxis]*normal, axis=1)
+            fieldError = max(fieldError, np.max(depth + np.minimum(slope, 1)\
+                *np.repeat(spacing[start:start+chunkSize], len(weights))) + tolerance)
+
+    distanceField = {
+        'fieldShape':   fieldShape,
+        'fieldParams':  fieldParams,
+        'fieldError':   float(fieldError),
+    }
+
+    return distanceField
@@ -0,0 +1,90 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to initialize an empty multi-level
+## cell list over the geometry extents. Each level stores the particles of
+## one diameter band (bands halve in size from maxPar down to minPar) on a
+## grid sized to that band, so a query for a small particle only searches
+## the volume it can actually reach on each level instead of padding every
+## search by maxPar.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def gen_LDPMCSL_cellList(minC, maxC, maxPar, parOffset, minPar=None, maxCells=10000000):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - minC:             Minimum coordinate of the geometry
+    - maxC:             Maximum coordinate of the geometry
+    - maxPar:           Maximum particle diameter
+    - parOffset:        Minimum offset between particles
+    - minPar:           Minimum particle diameter (optional, a single level
+                        is used without it)
+    - maxCells:         Maximum number of cells of a level
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - cellList:         Dictionary with the grid origin (cellMin), the upper
+                        diameter of the band of each level (levelDiameter),
+                        the distance a query must reach beyond its own radius
+                        on each level (levelReach), the cell edge length
+                        (cellSize), number of cells in each direction
+                        (cellDims) and first cell (cellStart) of each level,
+                        the particle indices stored in each cell (cellTable,
+                        -1 if empty) and the number of particles stored in
+                        each cell (cellCount)
+    --------------------------------------------------------------------------
+    """
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+
+    # Diameter bands halving from maxPar until they contain minPar
+    nLevels = 1
+    if minPar is not None and minPar > 0:
+        nLevels = max(int(np.ceil(np.log2(maxPar/minPar))), 1)
+    levelDiameter = maxPar / 2.0**np.arange(nLevels-1, -1, -1)
+
+    # A particle of diameter d interacts with particles of a level if their
+    # centers are closer than d/2 + levelReach. Cells are sized to the band
+    # (a query for a particle of the band visits 27 cells), and coarsened if
+    # the level would have too many cells.
+    levelReach = levelDiameter/2 + parOffset
+    cellSize = np.maximum(levelDiameter + parOffset, (np.prod(maxC - minC)/maxCells)**(1/3))
+    cellDims = np.maximum(np.ceil((maxC - minC) / cellSize[:,np.newaxis]), 1).astype(np.int64)
+    levelCells = np.prod(cellDims, axis=1)
+    cellStart = np.concatenate(([0], np.cumsum(levelCells)[:-1])).astype(np.int64)
+
+    # Start with a few slots per cell; the table is widened as cells fill up
+    # so memory follows the actual occupancy rather than the worst case
+    cellCapacity = 8
+
+    cellList = {
+        'cellMin':       minC,
+        'levelDiameter': levelDiameter,
+        'levelReach':    levelReach,
+        'cellSize':      cellSize,
+        'cellDims':      cellDims,
+        'cellStart':     cellStart,
+        'cellTable':     -np.ones((int(levelCells.sum()), cellCapacity), dtype=np.int64),
+        'cellCount':     np.zeros(int(levelCells.sum()), dtype=np.int64),
+    }
+
+    return cellList
@@ -0,0 +1,83 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to sample the signed distance to the
+## surface on a regular grid of points covering the geometry. The grid
+## spacing is half of the minimum particle diameter, coarsened if needed so
+## that the grid does not exceed a fixed number of points.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistance     import calc_LDPMCSL_surfaceDistance
+
+
+def gen_LDPMCSL_distanceField(surfaceBVH, minC, maxC, minPar, maxPoints=1000000):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - surfaceBVH:       Surface bounding volume hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    - minC:             Minimum coordinate of the geometry
+    - maxC:             Maximum coordinate of the geometry
+    - minPar:           Minimum particle diameter
+    - maxPoints:        Maximum number of grid points
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - distanceField:    Dictionary with the grid origin (fieldMin), the grid
+                        spacing (fieldSpacing) and the signed distance at
+                        each grid point (fieldValues, positive inside)
+    --------------------------------------------------------------------------
+    """
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+
+    # Grid spacing tied to the minimum particle size
+    spacing = minPar/2
+    extent = maxC - minC
+    if np.prod(np.ceil(extent/spacing) + 3) > maxPoints:
+        spacing = (np.prod(extent)/maxPoints)**(1/3)
+        while np.prod(np.ceil(extent/spacing) + 3) > maxPoints:
+            spacing = spacing*1.05
+
+    # Pad the grid by one cell on each side of the geometry
+    fieldMin = minC - spacing
+    fieldDims = (np.ceil(extent/spacing) + 3).astype(int)
+
+    x = fieldMin[0] + spacing*np.arange(fieldDims[0])
+    y = fieldMin[1] + spacing*np.arange(fieldDims[1])
+    z = fieldMin[2] + spacing*np.arange(fieldDims[2])
+    gridX, gridY, gridZ = np.meshgrid(x, y, z, indexing='ij')
+    gridPoints = np.column_stack((gridX.ravel(), gridY.ravel(), gridZ.ravel()))
+
+    # Evaluate the exact signed distance in chunks to limit memory use
+    fieldValues = np.empty(len(gridPoints))
+    chunkSize = 20000
+    for start in range(0, len(gridPoints), chunkSize):
+        fieldValues[start:start+chunkSize] = calc_LDPMCSL_surfaceDistance(surfaceBVH,\
+            gridPoints[start:start+chunkSize])
+
+    distanceField = {
+        'fieldMin':     fieldMin,
+        'fieldSpacing': spacing,
+        'fieldValues':  fieldValues.reshape(fieldDims),
+    }
+
+    return distanceField
@@ -20,11 +20,12 @@
 
 import numpy as np
 
-from freecad.chronoWorkbench.generation.check_LDPMCSL_pointInside     import check_LDPMCSL_pointInside
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_locatePoints     import calc_LDPMCSL_locatePoints
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetTree           import gen_LDPMCSL_tetTree
 
 
 def gen_LDPMCSL_flowEdges(htcLength,allNodes,allTets,tetPoints,maxPar,\
-                meshVertices,meshTets,coord1,coord2,coord3,coord4,maxC):
+                meshVertices,meshTets,coord1,coord2,coord3,coord4,maxC,tetTree=None):
 
     """
     Variables:
@@ -42,6 +43,7 @@ def gen_LDPMCSL_flowEdges(htcLength,allNodes,allTets,tetPoints,maxPar,\
     - coord3:           Coordinates of the third vertex of each tet
     - coord4:           Coordinates of the fourth vertex of each tet
     - maxC:             Maximum extents
+    - tetTree:          Tet tree of the mesh (optional, built if not given)
     --------------------------------------------------------------------------
     ### Outputs ###
     - edgeData:         Array of all flow edges in the model
@@ -125,25 +127,16 @@ def gen_LDPMCSL_flowEdges(htcLength,allNodes,allTets,tetPoints,maxPar,\
     # Case 2: Tet Point to Face Point
     case2Points = np.concatenate(((allNodes[(faces[outerFaceID.astype(int),:][:,0]-1).astype(int),:]+allNodes[(faces[outerFaceID.astype(int),:][:,1]-1).astype(int),:]+allNodes[(faces[outerFaceID.astype(int),:][:,2]-1).astype(int),:])/3,tetPoints[(outerFace).astype(int),:]),axis=1)
     # Case 3: Face Point to Extension
-    case3Points = np.empty([len(case2Points),6])
-
-    for x in range(len(case2Points)):
-        option1 = np.concatenate((case2Points[x,0:3],htcLength*(np.cross(c2v1[x,:],c2v2[x,:]))/np.array([np.linalg.norm(np.cross(c2v1[x,:],c2v2[x,:])),]*3).T+case2Points[x,0:3]))
-    
-        # Obtain extents for floating bin
-        binMin = option1[3:6]-maxPar
-        binMax = option1[3:6]+maxPar
-
-        # Check if point is inside the mesh         
-        inside = check_LDPMCSL_pointInside(meshVertices,meshTets,option1[3:6],\
-            binMin,binMax,coord1,coord2,coord3,coord4)
-
-
-        if inside == True:
-            case3Points[x,:] = np.concatenate((case2Points[x,0:3],htcLength*(np.cross(c2v2[x,:],c2v1[x,:]))/np.array([np.linalg.norm(np.cross(c2v2[x,:],c2v1[x,:])),]*3).T+case2Points[x,0:3]))
-
-        else:
-            case3Points[x,:] = option1
+    faceNormals = np.cross(c2v1,c2v2)/np.linalg.norm(np.cross(c2v1,c2v2),axis=1)[:,np.newaxis]
+    option1 = case2Points[:,0:3] + htcLength*faceNormals
+
+    # Check which extension points are inside the mesh (all at once) and
+    # flip those to the other side of the face
+    if tetTree is None:
+        tetTree = gen_LDPMCSL_tetTree(meshVertices,meshTets)
+    inside = calc_LDPMCSL_locatePoints(tetTree,option1) >= 0
+    case3Points = np.concatenate((case2Points[:,0:3],np.where(inside[:,np.newaxis],\
+        case2Points[:,0:3] - htcLength*faceNormals,option1)),axis=1)
 
 
     # Position of internal face centers (Correction: this point should be the intersection of line T1T2 and face)
@@ -11,19 +11,42 @@ import sys
 import FreeCAD as App
 
 from freecad.chronoWorkbench.input.read_multiMat_file                     import read_multiMat_file
+from freecad.chronoWorkbench.input.read_LDPMCSL_distanceField             import read_LDPMCSL_distanceField
+from freecad.chronoWorkbench.input.read_LDPMCSL_placementCheckpoint       import read_LDPMCSL_placementCheckpoint
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_placementCheckpoint    import mkData_LDPMCSL_placementCheckpoint
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_placementReport         import mkData_LDPMCSL_placementReport
+from freecad.chronoWorkbench.util.cwReleaseArrays                         import cwReleaseArrays
+from freecad.chronoWorkbench.util.cwShareArrays                           import cwShareArrays
 from check_multiMat_size                                    import check_multiMat_size
 from sort_multiMat_voxels                                   import sort_multiMat_voxels
-from calc_sieveCurve                                import calc_sieveCurve
-from calc_parVolume                                 import calc_parVolume
-from gen_particleList                               import gen_particleList
+from gen_LDPMCSL_particleDiameters                  import gen_LDPMCSL_particleDiameters
+from gen_particlePeriodic                           import gen_particlePeriodic
+from gen_particlePoissonDisk                        import gen_particlePoissonDisk
 from gen_LDPMCSL_subParticle                                import gen_LDPMCSL_subParticle
-from gen_particleMPI                                import gen_particleMPI
-from check_particleOverlapMPI                       import check_particleOverlapMPI
+from gen_particleShared                             import gen_particleShared, gen_particleSharedInit, gen_subParticleShared
+from calc_LDPMCSL_batchConflicts                    import calc_LDPMCSL_batchConflicts
+from calc_LDPMCSL_independentSet                    import calc_LDPMCSL_independentSet
+from check_LDPMCSL_placementRetry                   import check_LDPMCSL_placementRetry
 from gen_particle                                   import gen_particle
-
-
-
-def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, maxEdgeLength, max_dist, minPar, maxPar, sieveCurveDiameter, sieveCurvePassing, wcRatio, cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC, flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity, densityWater, multiMatToggle, aggFile, multiMatFile, grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP, grainBinderMin, grainBinderMax, grainBinderFuller, grainBinderSieveD, grainBinderSieveP, grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP, tetVolume, minC, maxC, verbose):
+from gen_particleCollective                         import gen_particleCollective
+from gen_particleDistributed                        import gen_particleDistributed
+from gen_particleVoid                               import gen_particleVoid
+from calc_LDPMCSL_meshHash                          import calc_LDPMCSL_meshHash
+from gen_LDPMCSL_placementController                import gen_LDPMCSL_placementController
+from gen_LDPMCSL_cellList                           import gen_LDPMCSL_cellList
+from gen_LDPMCSL_surfaceBVH                         import gen_LDPMCSL_surfaceBVH
+from gen_LDPMCSL_tetSampler                         import gen_LDPMCSL_tetSampler
+from gen_LDPMCSL_tetTree                            import gen_LDPMCSL_tetTree
+from gen_LDPMCSL_voidMap                            import gen_LDPMCSL_voidMap
+from gen_LDPMCSL_voxelTable                         import gen_LDPMCSL_voxelTable
+from update_LDPMCSL_cellList                        import update_LDPMCSL_cellList
+from update_LDPMCSL_placementController             import update_LDPMCSL_placementController
+from update_LDPMCSL_tetDepth                        import update_LDPMCSL_tetDepth
+from update_LDPMCSL_voidMap                         import update_LDPMCSL_voidMap
+
+
+
+def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, maxEdgeLength, max_dist, minPar, maxPar, sieveCurveDiameter, sieveCurvePassing, wcRatio, cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC, flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity, densityWater, multiMatToggle, aggFile, multiMatFile, grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP, grainBinderMin, grainBinderMax, grainBinderFuller, grainBinderSieveD, grainBinderSieveP, grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP, tetVolume, minC, maxC, verbose, placementAlg="Trial-and-Error", placementSeed=None, checkpointInterval=0, placementResume="Off", checkpointDir=None, hybridCutoff=None, particleCacheToggle="On", seedGiven=False):
 
     # Load back in these seven matrices from their temporary files:
     # coord1, coord2, coord3, coord4, meshVertices, meshTets, surfaceNodes
@@ -41,6 +64,22 @@ def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, m
     meshVertices = np.load(tempPath + 'meshVertices.npy')
     meshTets = np.load(tempPath + 'meshTets.npy')
     surfaceNodes = np.load(tempPath + 'surfaceNodes.npy')
+    surfaceFaces = np.load(tempPath + 'surfaceFaces.npy')
+
+    # Build tet tree of the mesh for containment tests
+    tetTree = gen_LDPMCSL_tetTree(meshVertices,meshTets)
+
+    # Build volume-weighted tet sampler for candidate positions
+    tetSampler = gen_LDPMCSL_tetSampler(meshVertices,meshTets)
+
+    # Store the particle diameters in the output directory (the directory of
+    # the checkpoints) so that later runs with the same mix design and seed
+    # reuse them (only for a seed given by the user, a drawn seed is never used
+    # again)
+    if particleCacheToggle == "On" and seedGiven and checkpointDir is not None:
+        particleCacheDir = checkpointDir
+    else:
+        particleCacheDir = None
 
     if multiMatToggle == "On":
 
@@ -81,24 +120,14 @@ def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, m
                 [grainMin,grainMax,grainFuller,grainSieveD,grainSieveP] = [grainITZMin,grainITZMax,grainITZFuller,grainITZSieveD,grainITZSieveP]
 
 
-            # Shift sieve curve if needed
-            if grainSieveD != (0 or None or [] or ""):
-                [newGrainSieveCurveD,newGrainSieveCurveP,grainNewSet,grainW_min,grainW_max] = calc_sieveCurve(grainMin,grainMax,grainSieveD,grainSieveP)
-            else:
-                newGrainSieveCurveD,newGrainSieveCurveP,grainNewSet,grainW_min,grainW_max = 0, 0, 0, 0, 0
-
-            # Calculates volume of each set of grains
-            [volGrainFracPar,volGrains,cdf,cdf1,kappa_i] = calc_parVolume(tetVolume*len(aggVoxels)/(len(aggVoxels)+len(itzVoxels)+len(binderVoxels)), wcRatio, cementC,
-                                                        airFrac, grainFuller, 
-                                                        flyashC, silicaC, scmC, fillerC,
-                                                        flyashDensity, silicaDensity, 
-                                                        scmDensity, fillerDensity, cementDensity,
-                                                        densityWater, grainMin, grainMax,
-                                                        newGrainSieveCurveD, newGrainSieveCurveP, 
-                                                        grainNewSet, grainW_min, grainW_max)
-
-            # Generates list of needed grains
-            [maxGrainsNum,grainsDiameterList] = gen_particleList(volGrains,grainMin,grainMax,newGrainSieveCurveD,cdf,kappa_i,grainNewSet,grainFuller)
+            # Calculates volume and list of each set of grains (sieve curve,
+            # volume fraction and grain list, reused from an earlier run with
+            # the same mix design and seed)
+            [volGrainFracPar,volGrains,maxGrainsNum,grainsDiameterList] = gen_LDPMCSL_particleDiameters(\
+                tetVolume*len(aggVoxels)/(len(aggVoxels)+len(itzVoxels)+len(binderVoxels)), wcRatio, cementC,
+                airFrac, grainFuller, flyashC, silicaC, scmC, fillerC,
+                flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity,
+                densityWater, grainMin, grainMax, grainSieveD, grainSieveP, placementSeed, i, particleCacheDir)
 
             if i == 0:
                 aggGrainsDiameterList = grainsDiameterList
@@ -120,29 +149,14 @@ def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, m
     if multiMatToggle == "Off":
 
 
-        # Shift sieve curve if needed
-        if sieveCurveDiameter != (0 or None or [] or ""):
-            # Shifts sieve curve to appropriate range
-            [newSieveCurveD, newSieveCurveP, NewSet, w_min, w_max] = calc_sieveCurve(minPar, maxPar, sieveCurveDiameter, sieveCurvePassing)
-        else:
-            newSieveCurveD, newSieveCurveP, w_min, w_max, NewSet = 0, 0, 0, 0, 0
-
-        # Calculates volume of particles needed
-        [volFracPar, parVolTotal, cdf, cdf1, kappa_i] = calc_parVolume(tetVolume, wcRatio, cementC,
-                                                    airFrac, fullerCoef, 
-                                                    flyashC, silicaC, scmC, fillerC,
-                                                    flyashDensity, silicaDensity, 
-                                                    scmDensity, fillerDensity, cementDensity,
-                                                    densityWater, minPar, maxPar,
-                                                    newSieveCurveD, newSieveCurveP, 
-                                                    NewSet, w_min, w_max)
-
-
-
         print("Status: Calculating list of particles.") 
-        # Calculate list of particle diameters for placement
-        [maxParNum,parDiameterList] = gen_particleList(parVolTotal,minPar,maxPar,newSieveCurveD,\
-            cdf,kappa_i,NewSet,fullerCoef)
+        # Calculate volume of particles needed and list of particle diameters
+        # for placement (sieve curve, volume fraction and particle list,
+        # reused from an earlier run with the same mix design and seed)
+        [volFracPar, parVolTotal, maxParNum, parDiameterList] = gen_LDPMCSL_particleDiameters(tetVolume, wcRatio,
+            cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC,
+            flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity,
+            densityWater, minPar, maxPar, sieveCurveDiameter, sieveCurvePassing, placementSeed, 0, particleCacheDir)
 
         # Initialize empty particle nodes list outside geometry
         internalNodes = (np.zeros((len(parDiameterList),3))+2)*maxC
@@ -167,58 +181,261 @@ def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, m
     print('Status: Placing particles into geometry. (' + str(0) + '/' + str(len(internalNodes)) + ')') 
 
     # Initialize values
-    newMaxIter = 6
     particlesPlaced = 0
 
+    # Initialize the trial budget of the placement and the mask of placed particles
+    controller = gen_LDPMCSL_placementController(maxIter,parOffset)
+    newMaxIter = controller['bufferSize']
+    placed = np.zeros(len(internalNodes), dtype=bool)
+
+    # Initialize cell list of placed particles for neighbor searches
+    if multiMatToggle == "On":
+        cellList = gen_LDPMCSL_cellList(minC,maxC,\
+            max(grainAggMax,grainITZMax,grainBinderMax),parOffset,\
+            min(grainAggMin,grainITZMin,grainBinderMin))
+    else:
+        cellList = gen_LDPMCSL_cellList(minC,maxC,maxPar,parOffset,minPar)
+
+    # Build bounding volume hierarchy of the surface for clearance checks
+    surfaceBVH = gen_LDPMCSL_surfaceBVH(surfaceNodes,surfaceFaces)
+
+    # Read the signed distance field if one was passed (None otherwise)
+    distanceField = read_LDPMCSL_distanceField(tempPath + 'distanceField.npz',\
+        calc_LDPMCSL_meshHash(surfaceNodes,surfaceFaces,minPar))
+
+    # Store the depth of each tet so that candidates deep inside skip the
+    # surface checks
+    update_LDPMCSL_tetDepth(tetSampler,surfaceBVH,distanceField)
+
 
     # Initialize particleID list of length of internalNodes
     particleID = np.zeros(len(internalNodes))
 
+    # Checkpoint of the placement, kept next to the outputs so an interrupted
+    # generation can continue from it
+    if checkpointDir is None:
+        checkpointDir = tempPath
+    checkpointHash = calc_LDPMCSL_meshHash(surfaceNodes,surfaceFaces,placementSeed,placementAlg,\
+        len(internalNodes),float(np.sum(parDiameterList)))
+    checkpointFile = Path(checkpointDir + "/placementCheckpoint-" + checkpointHash[0:16] + ".npz")
+    checkpointTime = time.time()
+    resumeParticle = 0
+    resumeMaterial = 0
+    resumeSerialEnd = 0
+    resumeVoidMap = None
+
+    if placementResume == "On":
+        checkpoint = read_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash)
+        if checkpoint is not None:
+            internalNodes = checkpoint['internalNodes']
+            placed = checkpoint['placed']
+            particleID = checkpoint['particleID']
+            controller = checkpoint['controller']
+            newMaxIter = checkpoint['newMaxIter']
+            resumeParticle = checkpoint['nextParticle']
+            resumeMaterial = checkpoint['material']
+            resumeSerialEnd = checkpoint['serialEnd']
+            resumeVoidMap = checkpoint['voidMap']
+
+            # Add the particles placed before the interruption to the cell list
+            for x in np.flatnonzero(placed):
+                update_LDPMCSL_cellList(cellList,x,internalNodes[x,:],parDiameterList[x])
+
+            print('Status: Resuming placement from checkpoint. (' + str(np.count_nonzero(placed)) + '/' + str(len(internalNodes)) + ')')
+
     if multiMatToggle == "On":
 
-        for i in range(3):
+        # Voxel centers of each material to draw candidates from, and first node
+        # of each material
+        voxelTables = [gen_LDPMCSL_voxelTable(voxels,multiMatY,multiMatZ,multiMatRes,minC,maxC)\
+            for voxels in (aggVoxels,itzVoxels,binderVoxels)]
+        nodeOffsets = [0,len(aggGrainsDiameterList),len(aggGrainsDiameterList)+len(itzGrainsDiameterList)]
 
-            # Place in order of aggregate > ITZ > binder
-            if i == 0:
-                [grainsDiameterList,voxels,grainMin,grainMax,voxelIDs] = [aggGrainsDiameterList,aggVoxels,grainAggMin,grainAggMax,aggVoxelIDs]
-            elif i == 1:
-                [grainsDiameterList,voxels,grainMin,grainMax,voxelIDs] = [itzGrainsDiameterList,itzVoxels,grainITZMin,grainITZMax,0]
-            elif i == 2:
-                [grainsDiameterList,voxels,grainMin,grainMax,voxelIDs] = [binderGrainsDiameterList,binderVoxels,grainBinderMin,grainBinderMax,0]
+        process_pool = None
+        sharedMemory = []
+        try:
+            if numCPU > 1:
 
+                # Share the mesh, particle, voxel and search arrays with a worker pool
+                # created once for all materials. The serial placement writes to the
+                # same arrays, so the workers always see every particle placed so far.
+                [poolData, sharedMemory, descriptors] = cwShareArrays({'facePoints': surfaceNodes,\
+                    'vertices': meshVertices, 'tets': meshTets, 'coord1': coord1, 'coord2': coord2, 'coord3': coord3,\
+                    'coord4': coord4, 'maxIter': maxIter, 'parDiameterList': parDiameterList, 'maxEdgeLength': maxEdgeLength,\
+                    'max_dist': max_dist, 'nodes': internalNodes, 'cellList': cellList, 'surfaceBVH': surfaceBVH,\
+                    'tetTree': tetTree, 'distanceField': distanceField, 'seed': placementSeed, 'voxelTables': voxelTables,\
+                    'voxelIDs': [aggVoxelIDs,0,0], 'grainMin': [grainAggMin,grainITZMin,grainBinderMin],\
+                    'grainMax': [grainAggMax,grainITZMax,grainBinderMax]})
 
-            # Generate particles for length of needed aggregate (not placed via MPI)
-            for x in range(particlesPlaced,len(grainsDiameterList)):
+                process_pool = multiprocessing.Pool(numCPU, initializer=gen_particleSharedInit, initargs=(descriptors,))
 
-                # Generate particle
-                [newMaxIter,node,iterReq,particleID[x]] = gen_LDPMCSL_subParticle(surfaceNodes,grainsDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,grainMin,grainMax,\
-                    parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes,\
-                    multiMatX,multiMatY,multiMatZ,multiMatRes,voxels,voxelIDs,minC,maxC)
+                internalNodes = poolData['nodes']
+                cellList = poolData['cellList']
 
+            for i in range(3):
 
-                if len(grainsDiameterList)<=1000:
-                    # Update number particles placed every 1%
-                    if x % np.rint(len(grainsDiameterList)/100) == 0:
-                        print("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
-                elif len(grainsDiameterList)<=10000:
-                    # Update number particles placed every 0.1%
-                    if x % np.rint(len(grainsDiameterList)/1000) == 0:
-                        print("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
-                else:
-                    # Update number particles placed every 0.01%
-                    if x % np.rint(len(grainsDiameterList)/10000) == 0:
-                        print("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+                # Materials completed before the checkpoint
+                if i < resumeMaterial:
+                    continue
 
+                # Place in order of aggregate > ITZ > binder
                 if i == 0:
-                    internalNodes[x,:] = node
+                    [grainsDiameterList,grainMin,grainMax,voxelIDs] = [aggGrainsDiameterList,grainAggMin,grainAggMax,aggVoxelIDs]
                 elif i == 1:
-                    internalNodes[x+len(aggGrainsDiameterList),:] = node
+                    [grainsDiameterList,grainMin,grainMax,voxelIDs] = [itzGrainsDiameterList,grainITZMin,grainITZMax,0]
                 elif i == 2:
-                    internalNodes[x+len(aggGrainsDiameterList)+len(itzGrainsDiameterList),:] = node
-
+                    [grainsDiameterList,grainMin,grainMax,voxelIDs] = [binderGrainsDiameterList,grainBinderMin,grainBinderMax,0]
+
+                voxelTable = voxelTables[i]
+                particlesPlaced = 0
+
+                if numCPU > 1:
+
+                    # Place the particles of the first increments of the material in
+                    # parallel rounds, as for the single-material placement
+                    roundSize = math.floor(len(grainsDiameterList)/numIncrements)
+                    placeQueue = np.arange((numIncrements-1)*roundSize)
+                    placeQueue = placeQueue[~placed[placeQueue+nodeOffsets[i]]]
+
+                    # Index of the next candidate to test for each particle
+                    firstCandidate = np.zeros(len(grainsDiameterList), dtype=int)
+
+                    while len(placeQueue) > 0:
+
+                        roundIndex = placeQueue[0:roundSize]
+
+                        # Share the cell table again if it was widened since the last round
+                        if poolData['cellList']['cellTable'].shape != descriptors['cellList']['cellTable'][2]:
+                            [poolData['cellList']['cellTable'], tableMemory, descriptors['cellList']['cellTable']] = \
+                                cwShareArrays(poolData['cellList']['cellTable'])
+                            sharedMemory.extend(tableMemory)
+
+                        outputMPI = np.array(process_pool.map(gen_subParticleShared, [(i, index, index+nodeOffsets[i],\
+                            newMaxIter, firstCandidate[index], controller['parOffset'], descriptors['cellList']['cellTable'])\
+                            for index in roundIndex]))
+
+                        nodeMPI = outputMPI[:,0:3]
+                        acceptedCandidate = outputMPI[:,5].astype(int)
+
+                        # Particles that ran out of trials test the same candidates again. The
+                        # trials of a particle count from its first candidate, as in the serial
+                        # placement.
+                        failed = np.isnan(nodeMPI[:,0])
+                        iterReq = acceptedCandidate + 1
+                        firstCandidate[roundIndex[~failed]] = acceptedCandidate[~failed]
+
+                        # Find conflicts inside the round and keep a maximal subset without them
+                        placedMPI = np.flatnonzero(~failed)
+                        [pairI,pairJ] = calc_LDPMCSL_batchConflicts(nodeMPI[placedMPI],\
+                            grainsDiameterList[roundIndex[placedMPI]],controller['parOffset'])
+                        keep = calc_LDPMCSL_independentSet(len(roundIndex),placedMPI[pairI],placedMPI[pairJ])
+                        keep[failed] = False
+
+                        # With a seed given by the user, only keep the particles before the first
+                        # conflict so the result is the same as the serial placement
+                        if seedGiven and not keep.all():
+                            firstLoser = np.argmin(keep)
+                            keep[firstLoser:] = False
+                            failed[firstLoser+1:] = False
+                            if not failed[firstLoser]:
+                                firstCandidate[roundIndex[firstLoser]] += 1
+
+                        for x in np.flatnonzero(keep):
+                            nodeIndex = roundIndex[x]+nodeOffsets[i]
+                            internalNodes[nodeIndex,:] = nodeMPI[x,:]
+                            update_LDPMCSL_cellList(cellList,nodeIndex,nodeMPI[x,:],grainsDiameterList[roundIndex[x]])
+                            placed[nodeIndex] = True
+                            particleID[nodeIndex] = outputMPI[x,3]
+                            newMaxIter = update_LDPMCSL_placementController(controller,iterReq[x])
+
+                        placeQueue = np.concatenate((roundIndex[~keep],placeQueue[roundSize:]))
+
+                        # Relax the offset when a particle ran out of trials (all candidates are
+                        # tested again) or stop with the particles placed so far
+                        if failed.any():
+                            if not check_LDPMCSL_placementRetry(controller,roundIndex[np.argmax(failed)]+nodeOffsets[i]):
+                                break
+                            firstCandidate[:] = 0
+
+                        nPlaced = (numIncrements-1)*roundSize - len(placeQueue)
+
+                        print("Status: Placing material " + str(i) + " grains into geometry. (" + str(nPlaced) + '/' + str(len(grainsDiameterList)) + ')')
+
+                        if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                            mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,internalNodes,placed,particleID,\
+                                0,i,newMaxIter,controller)
+                            checkpointTime = time.time()
+
+                    particlesPlaced = (numIncrements-1)*roundSize
+
+                    # Nothing is left to place in serial if the parallel placement stopped
+                    if controller['failedIndex'] >= 0:
+                        particlesPlaced = len(grainsDiameterList)
+
+
+                # Generate particles for length of needed aggregate (not placed via MPI)
+                for x in range(max(particlesPlaced,resumeParticle if i == resumeMaterial else 0),len(grainsDiameterList)):
+
+                    nodeIndex = x+nodeOffsets[i]
+
+                    # Generate particle, relaxing the offset when the trial budget runs out
+                    node = None
+                    while node is None:
+                        [newMaxIter,node,iterReq,particleID[nodeIndex]] = gen_LDPMCSL_subParticle(surfaceNodes,grainsDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,grainMin,grainMax,\
+                            controller['parOffset'],parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes,\
+                            voxelTable,voxelIDs,cellList,surfaceBVH,tetTree,distanceField,placementSeed,i,x)
+                        if node is None and not check_LDPMCSL_placementRetry(controller,nodeIndex):
+                            break
+
+                    # Stop with the particles placed so far
+                    if node is None:
+                        break
+                    newMaxIter = update_LDPMCSL_placementController(controller,iterReq)
+
+
+                    if len(grainsDiameterList)<=1000:
+                        # Update number particles placed every 1%
+                        if x % np.rint(len(grainsDiameterList)/100) == 0:
+                            print("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+                    elif len(grainsDiameterList)<=10000:
+                        # Update number particles placed every 0.1%
+                        if x % np.rint(len(grainsDiameterList)/1000) == 0:
+                            print("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+                    else:
+                        # Update number particles placed every 0.01%
+                        if x % np.rint(len(grainsDiameterList)/10000) == 0:
+                            print("Status: Placing material " + str(i) + " grains into geometry. (" + str(x) + '/' + str(len(grainsDiameterList)) + ')')
+
+                    internalNodes[nodeIndex,:] = node
+                    update_LDPMCSL_cellList(cellList,nodeIndex,node,grainsDiameterList[x])
+                    placed[nodeIndex] = True
+
+                    # Write a checkpoint of the placement every checkpointInterval minutes
+                    if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                        mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,internalNodes,placed,particleID,\
+                            x+1,i,newMaxIter,controller)
+                        checkpointTime = time.time()
+
+
+                if controller['failedIndex'] >= 0:
+                    break
+
+
+                print("Status: Placing material " + str(i) + " grains into geometry. (" + str(len(grainsDiameterList)) + '/' + str(len(grainsDiameterList)) + ')')
+
+        finally:
+            # Stop the workers and free the shared arrays, also when the placement
+            # stops with an exception
+            if process_pool is not None:
+                process_pool.terminate()
+                process_pool.join()
+            if len(sharedMemory) > 0:
+                # Copy the placed particles back into private memory and free the shared arrays
+                placedData = cwReleaseArrays(poolData, sharedMemory)
 
-
-            print("Status: Placing material " + str(i) + " grains into geometry. (" + str(len(grainsDiameterList)) + '/' + str(len(grainsDiameterList)) + ')')
+        if numCPU > 1:
+            internalNodes = placedData['nodes']
+            cellList = placedData['cellList']
 
         materialList = np.concatenate((np.ones(len(aggGrainsDiameterList))*3,np.ones(len(itzGrainsDiameterList))*1, np.ones(len(binderGrainsDiameterList))*2))
 
@@ -235,81 +452,229 @@ def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, m
 
     if multiMatToggle == "Off":
 
-        if numCPU > 1:
+        # Place all particles at once by collective rearrangement (unless resuming).
+        # The particles taken out of the jammed packing are inserted one by one
+        # against it below, relaxing the offset as for the other placements.
+        if placementAlg == "Collective Rearrangement":
+            if not placed.any():
+                print("Status: Placing particles into geometry by collective rearrangement.")
+                [internalNodes,placed] = gen_particleCollective(parDiameterList,meshVertices,meshTets,tetVolume,minPar,\
+                    controller['parOffset'],surfaceBVH,distanceField,tetSampler,placementSeed)
+                for x in np.flatnonzero(placed):
+                    update_LDPMCSL_cellList(cellList,x,internalNodes[x,:],parDiameterList[x])
+                controller['nPlaced'] = np.count_nonzero(placed)
+
+        # Place the particles with one MPI rank per subdomain (the particles are
+        # only complete on rank 0)
+        elif placementAlg == "Distributed Trial-and-Error (MPI)":
+            print("Status: Placing particles into geometry with MPI.")
+            [internalNodes,placed,mpiRank] = gen_particleDistributed(parDiameterList,meshVertices,meshTets,tetSampler,\
+                minPar,maxPar,numIncrements,controller,cellList,surfaceBVH,distanceField,placementSeed)
+            particlesPlaced = len(parDiameterList)
+            if mpiRank > 0:
+                return
+
+        elif numCPU > 1:
         
             
-            for increment in range(numIncrements-1):
-
-                process_pool = multiprocessing.Pool(numCPU)
-
-                outputMPI = process_pool.map(functools.partial(gen_particleMPI, surfaceNodes,maxParNum, minC, maxC, meshVertices, \
-                    meshTets, coord1,coord2,coord3,coord4,newMaxIter,maxIter,minPar,\
-                    maxPar,parOffset,verbose,parDiameterList,maxEdgeLength,max_dist,internalNodes), parDiameterList[particlesPlaced:particlesPlaced+math.floor(len(parDiameterList)/numIncrements)])
-
-                nodeMPI = np.array(outputMPI)[:,0:3]
-                diameter = np.array(outputMPI)[:,3]
-                newMaxIter = int(max(np.array(outputMPI)[:,4]))
-                maxAttempts = int(max(np.array(outputMPI)[:,5]))
-
-                particlesPlaced = particlesPlaced+len(np.array(outputMPI)[:,0:3])        
-
-                for x in range(len(nodeMPI)):
-
-                    # Store placed particles from this increment
-                    internalNodes[particlesPlaced+x,:] = nodeMPI[x,:]
-
-                    # Obtain extents for floating bin for node to test
-                    binMin = np.array(([nodeMPI[x,0]-diameter[x]/2-maxPar/2-parOffset,\
-                        nodeMPI[x,1]-diameter[x]/2-maxPar/2-parOffset,nodeMPI[x,2]-\
-                        diameter[x]/2-maxPar/2-parOffset]))
-                    binMax = np.array(([nodeMPI[x,0]+diameter[x]/2+maxPar/2+parOffset,\
-                        nodeMPI[x,1]+diameter[x]/2+maxPar/2+parOffset,nodeMPI[x,2]+\
-                        diameter[x]/2+maxPar/2+parOffset]))
-
-                    # Check if particle overlapping any just added particles (ignore first one placed)
-                    if x > 0:
-
-                        overlap = check_particleOverlapMPI(nodeMPI[x,:],diameter[x],binMin,\
-                            binMax,minPar,parOffset,nodeMPI[0:x],diameter[0:x])
-
-                        if overlap == True:
-
-                            [newMaxIter,node,iterReq] = gen_particle(surfaceNodes,\
-                                parDiameterList[particlesPlaced+x], meshVertices, \
-                                meshTets,newMaxIter,maxIter,minPar,\
-                                maxPar,parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes)
-                            
-                            internalNodes[particlesPlaced+x,:] = node[0,:]
-
+            # Place the particles of the first increments in parallel rounds. Each
+            # round places the queued particles against the particles already placed,
+            # keeps a maximal subset without conflicts inside the round and
+            # re-queues the rest for the next round.
+            roundSize = math.floor(len(parDiameterList)/numIncrements)
+            placeQueue = np.arange((numIncrements-1)*roundSize)
+            placeQueue = placeQueue[~placed[placeQueue]]
+
+
+            # Share the mesh, particle and search arrays with a worker pool created
+            # once for the parallel placement, so tasks only carry an index and where
+            # to resume its candidates
+            [poolData, sharedMemory, descriptors] = cwShareArrays({'facePoints': surfaceNodes, 'maxParNum': maxParNum,\
+                'minC': minC, 'maxC': maxC, 'vertices': meshVertices, 'tets': meshTets, 'coord1': coord1, 'coord2': coord2,\
+                'coord3': coord3, 'coord4': coord4, 'maxIter': maxIter, 'minPar': minPar, 'maxPar': maxPar,\
+                'verbose': verbose, 'parDiameterList': parDiameterList, 'maxEdgeLength': maxEdgeLength, 'max_dist': max_dist,\
+                'nodes': internalNodes, 'cellList': cellList, 'surfaceBVH': surfaceBVH, 'tetTree': tetTree,\
+                'distanceField': distanceField, 'tetSampler': tetSampler, 'seed': placementSeed})
+
+            process_pool = None
+            try:
+                process_pool = multiprocessing.Pool(numCPU, initializer=gen_particleSharedInit, initargs=(descriptors,))
+
+                # Index of the next candidate to test for each particle
+                firstCandidate = np.zeros(len(parDiameterList), dtype=int)
+
+                while len(placeQueue) > 0:
+
+                    roundIndex = placeQueue[0:roundSize]
+
+                    # Share the cell table again if it was widened in the last round
+                    if poolData['cellList']['cellTable'].shape != descriptors['cellList']['cellTable'][2]:
+                        [poolData['cellList']['cellTable'], tableMemory, descriptors['cellList']['cellTable']] = \
+                            cwShareArrays(poolData['cellList']['cellTable'])
+                        sharedMemory.extend(tableMemory)
+
+                    outputMPI = process_pool.map(gen_particleShared, [(index, newMaxIter, firstCandidate[index],\
+                        controller['parOffset'], descriptors['cellList']['cellTable']) for index in roundIndex])
+
+                    nodeMPI = np.array(outputMPI)[:,0:3]
+                    diameter = np.array(outputMPI)[:,3]
+                    acceptedCandidate = np.array(outputMPI)[:,5].astype(int)
+
+                    # Particles that ran out of trials test the same candidates again. The
+                    # trials of a particle count from its first candidate, as in the serial
+                    # placement.
+                    failed = np.isnan(nodeMPI[:,0])
+                    iterReq = acceptedCandidate + 1
+                    firstCandidate[roundIndex[~failed]] = acceptedCandidate[~failed]
+
+                    # Find conflicts inside the round and keep a maximal subset without them
+                    placedMPI = np.flatnonzero(~failed)
+                    [pairI,pairJ] = calc_LDPMCSL_batchConflicts(nodeMPI[placedMPI],diameter[placedMPI],controller['parOffset'])
+                    keep = calc_LDPMCSL_independentSet(len(roundIndex),placedMPI[pairI],placedMPI[pairJ])
+                    keep[failed] = False
+
+                    # With a seed given by the user, only keep the particles before the first
+                    # conflict so the result is the same as the serial placement. The first
+                    # rejected particle moves on to its next candidate, the following ones
+                    # test theirs again.
+                    if seedGiven and not keep.all():
+                        firstLoser = np.argmin(keep)
+                        keep[firstLoser:] = False
+                        failed[firstLoser+1:] = False
+                        if not failed[firstLoser]:
+                            firstCandidate[roundIndex[firstLoser]] += 1
+
+                    for x in np.flatnonzero(keep):
+                        poolData['nodes'][roundIndex[x],:] = nodeMPI[x,:]
+                        update_LDPMCSL_cellList(poolData['cellList'],roundIndex[x],nodeMPI[x,:],diameter[x])
+                        placed[roundIndex[x]] = True
+                        newMaxIter = update_LDPMCSL_placementController(controller,iterReq[x])
+
+                    placeQueue = np.concatenate((roundIndex[~keep],placeQueue[roundSize:]))
+
+                    # Relax the offset when a particle ran out of trials (all candidates are
+                    # tested again) or stop with the particles placed so far
+                    if failed.any():
+                        if not check_LDPMCSL_placementRetry(controller,roundIndex[np.argmax(failed)]):
+                            break
+                        firstCandidate[:] = 0
+
+                    nPlaced = (numIncrements-1)*roundSize - len(placeQueue)
+
+                    print("Status: Placing particles into geometry. (" + str(nPlaced) + '/' + str(len(parDiameterList)) + ')')
+
+                    if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                        mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,poolData['nodes'],placed,particleID,\
+                            0,0,newMaxIter,controller)
+                        checkpointTime = time.time()
+
+            finally:
+                # Stop the workers and free the shared arrays, also when the placement
+                # stops with an exception
+                if process_pool is not None:
+                    process_pool.terminate()
+                    process_pool.join()
+                # Copy the placed particles back into private memory and free the shared arrays
+                placedData = cwReleaseArrays(poolData, sharedMemory)
+
+            internalNodes = placedData['nodes']
+            cellList = placedData['cellList']
+
+            particlesPlaced = (numIncrements-1)*roundSize
+
+            # Nothing is left to place in serial if the parallel placement stopped
+            if controller['failedIndex'] >= 0:
+                particlesPlaced = len(parDiameterList)
+
+
+
+        # Build void map of the free space, including the particles already placed
+        # (the void map of a checkpoint also keeps the usable cells of the size class)
+        voidMap = None
+        if placementAlg == "Void-Tracking":
+            voidMap = gen_LDPMCSL_voidMap(surfaceBVH,minC,maxC,minPar,maxPar,distanceField)
+            if resumeVoidMap is not None:
+                voidMap.update(resumeVoidMap)
+            else:
+                for x in np.flatnonzero(placed):
+                    update_LDPMCSL_voidMap(voidMap,internalNodes[x,:],parDiameterList[x],controller['parOffset'])
 
-                print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+        # Only the coarse particles are placed one by one in the hybrid placement
+        nSerial = len(parDiameterList)
+        if placementAlg == "Hybrid Poisson-Disk":
+            nSerial = np.count_nonzero(parDiameterList > hybridCutoff)
 
+            # Go on with a size class the fill handed back before the interruption
+            nSerial = max(nSerial,resumeSerialEnd)
 
         # Generate particles for length of needed aggregate (not placed via MPI)
-        for x in range(particlesPlaced,len(parDiameterList)):
-
-            # Generate particle
-            [newMaxIter,node,iterReq] = gen_particle(surfaceNodes,parDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,minPar,maxPar,\
-                parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes)
-
-
-
-            if len(parDiameterList)<=1000:
-                # Update number particles placed every 1%
-                if x % np.rint(len(parDiameterList)/100) == 0:
-                    print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
-            elif len(parDiameterList)<=10000:
-                # Update number particles placed every 0.1%
-                if x % np.rint(len(parDiameterList)/1000) == 0:
-                    print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
-            else:
-                # Update number particles placed every 0.01%
-                if x % np.rint(len(parDiameterList)/10000) == 0:
-                    print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
-
-            internalNodes[x,:] = node
-
-        print("Status: Placing particles into geometry. (" + str(len(parDiameterList)) + '/' + str(len(parDiameterList)) + ')')
+        serialStart = max(particlesPlaced,resumeParticle)
+        while True:
+            for x in range(serialStart,nSerial):
+
+                # Skip the particles already placed by collective rearrangement
+                if placed[x]:
+                    continue
+
+                # Generate particle, relaxing the offset when the trial budget runs out
+                node = None
+                while node is None:
+                    if placementAlg == "Periodic":
+                        [node,iterReq] = gen_particlePeriodic(parDiameterList[x],minC,maxC,maxIter,controller['parOffset'],\
+                            parDiameterList,internalNodes,cellList,placementSeed,x)
+                    elif placementAlg == "Void-Tracking":
+                        [node,iterReq] = gen_particleVoid(parDiameterList[x],voidMap,maxIter,minPar,controller['parOffset'],\
+                            parDiameterList,internalNodes,cellList,surfaceBVH,distanceField,placementSeed,x)
+                    else:
+                        [newMaxIter,node,iterReq] = gen_particle(surfaceNodes,parDiameterList[x],meshVertices,meshTets,newMaxIter,maxIter,minPar,maxPar,\
+                            controller['parOffset'],parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,internalNodes,cellList,surfaceBVH,tetTree,distanceField,tetSampler,\
+                            placementSeed,x)
+                    if node is None and not check_LDPMCSL_placementRetry(controller,x):
+                        break
+
+                # Stop with the particles placed so far
+                if node is None:
+                    break
+                newMaxIter = update_LDPMCSL_placementController(controller,iterReq)
+
+
+
+                if len(parDiameterList)<=1000:
+                    # Update number particles placed every 1%
+                    if x % np.rint(len(parDiameterList)/100) == 0:
+                        print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+                elif len(parDiameterList)<=10000:
+                    # Update number particles placed every 0.1%
+                    if x % np.rint(len(parDiameterList)/1000) == 0:
+                        print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+                else:
+                    # Update number particles placed every 0.01%
+                    if x % np.rint(len(parDiameterList)/10000) == 0:
+                        print("Status: Placing particles into geometry. (" + str(x) + '/' + str(len(parDiameterList)) + ')')
+
+                internalNodes[x,:] = node
+                update_LDPMCSL_cellList(cellList,x,node,parDiameterList[x])
+                placed[x] = True
+                if placementAlg == "Void-Tracking":
+                    update_LDPMCSL_voidMap(voidMap,node,parDiameterList[x],controller['parOffset'])
+
+                # Write a checkpoint of the placement every checkpointInterval minutes
+                if checkpointInterval > 0 and time.time() - checkpointTime > 60*checkpointInterval:
+                    mkData_LDPMCSL_placementCheckpoint(checkpointFile,checkpointHash,internalNodes,placed,particleID,\
+                        x+1,0,newMaxIter,controller,nSerial,voidMap)
+                    checkpointTime = time.time()
+
+            # Fill the space left with the fine particles, place the particles of a
+            # size class the fill could not take one by one and go on with the fill
+            if nSerial < len(parDiameterList) and controller['failedIndex'] < 0:
+                print("Status: Filling the fine particles into geometry.")
+                [serialStart, nSerial] = gen_particlePoissonDisk(parDiameterList,max(serialStart,nSerial),minPar,minC,maxC,tetSampler,\
+                    internalNodes,placed,controller,cellList,surfaceBVH,distanceField,placementSeed)
+                if serialStart < nSerial:
+                    continue
+            break
+
+        print("Status: Placing particles into geometry. (" + str(np.count_nonzero(placed)) + '/' + str(len(parDiameterList)) + ')')
 
 
         materialList = np.ones(len(parDiameterList))
@@ -319,6 +684,21 @@ def gen_LDPMCSL_multiStep(tempPath, numCPU, numIncrements, maxIter, parOffset, m
             ClinkerDiameterList, CHDiameterList, CSH_LDDiameterList, CSH_HDDiameterList = 0,0,0,0,0,0,0,0
 
 
+    # The placement is complete, so its checkpoint is no longer needed
+    if checkpointFile.is_file():
+        checkpointFile.unlink()
+
+    # Keep the placed particles only and report if the placement did not go as
+    # requested (relaxed offset or placement stopped early)
+    if controller['relaxCount'] > 0 or controller['failedIndex'] >= 0:
+        report = mkData_LDPMCSL_placementReport(controller,parDiameterList,placed,tempPath + 'placementReport.dat')
+        print(report)
+        internalNodes = internalNodes[placed]
+        parDiameterList = parDiameterList[placed]
+        materialList = materialList[placed]
+        particleID = particleID[placed]
+
+
     # Save the internalNodes list to a temporary file
     np.save(tempPath + 'internalNodes.npy', internalNodes)
 
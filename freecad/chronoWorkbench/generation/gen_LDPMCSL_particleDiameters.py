@@ -0,0 +1,150 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to calculate the volume fraction and the
+## list of particle diameters of a material (sieve curve, particle volume
+## and particle list), reusing the results of earlier runs with the same mix
+## design, grading and seed. The results are kept in memory for the runs of
+## this session and in a file for later sessions.
+##
+## The volume fractions do not depend on the geometry, and the diameters are
+## drawn one after the other from the stream of the seed, so the list of a
+## geometry is the start of the list drawn for any larger one. The cache
+## keeps the diameters in the order they were drawn and each run takes them
+## up to its particle volume; they are only drawn again when the volume is
+## larger than the one they were drawn for.
+##
+## ===========================================================================
+
+import math
+from pathlib import Path
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_mixHash             import calc_LDPMCSL_mixHash
+from freecad.chronoWorkbench.generation.calc_parVolume                   import calc_parVolume
+from freecad.chronoWorkbench.generation.calc_sieveCurve                  import calc_sieveCurve
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+from freecad.chronoWorkbench.generation.gen_particleList                 import gen_particleList
+from freecad.chronoWorkbench.input.read_LDPMCSL_particleDiameters        import read_LDPMCSL_particleDiameters
+from freecad.chronoWorkbench.output.mkData_LDPMCSL_particleDiameters     import mkData_LDPMCSL_particleDiameters
+
+
+# Diameters drawn in this session (most recent last), and the version of the
+# cached data (to be increased when the way the diameters are drawn changes)
+particleDiametersCache = {}
+maxCacheEntries = 8
+cacheVersion = 1
+
+
+def gen_LDPMCSL_particleDiameters(matVolume, wcRatio, cementC, airFrac, fullerCoef, flyashC, silicaC, scmC, fillerC,
+    flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity, densityWater, minPar, maxPar,
+    sieveCurveDiameter, sieveCurvePassing, seed, material, cacheDir=None):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - matVolume:        Volume of the geometry filled with the material
+    - wcRatio:          Water to cement ratio
+    - cementC:          Cement content
+    - airFrac:          Air volume fraction
+    - fullerCoef:       Fuller coefficient
+    - flyashC:          Fly ash content
+    - silicaC:          Silica fume content
+    - scmC:             Supplementary cementitious material content
+    - fillerC:          Filler content
+    - flyashDensity:    Fly ash density
+    - silicaDensity:    Silica fume density
+    - scmDensity:       Supplementary cementitious material density
+    - fillerDensity:    Filler density
+    - cementDensity:    Cement density
+    - densityWater:     Water density
+    - minPar:           Minimum particle diameter
+    - maxPar:           Maximum particle diameter
+    - sieveCurveDiameter: Sieve diameters of the grading (or 0 for Fuller)
+    - sieveCurvePassing: Passing fractions of the grading
+    - seed:             Random seed of the generation
+    - material:         Index of the material (stream of its diameters)
+    - cacheDir:         Directory of the cache file (None to keep the results
+                        in memory only)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - volFracPar:       Volume fraction of the particles in the mix
+    - parVolTotal:      Total volume of the simulated particles
+    - maxParNum:        Maximum number of particles
+    - parDiameterList:  Particle diameters (sorted large-to-small)
+    --------------------------------------------------------------------------
+    """
+
+    mixHash = calc_LDPMCSL_mixHash(cacheVersion, wcRatio, cementC, airFrac, fullerCoef, flyashC, silicaC, scmC,
+        fillerC, flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity, densityWater, minPar,
+        maxPar, sieveCurveDiameter, sieveCurvePassing, seed, material)
+
+    # Results of this session, or of the cache file
+    particleDiameters = particleDiametersCache.get(mixHash)
+    if cacheDir is not None:
+        cacheFile = Path(cacheDir + "/particleDiameters-" + mixHash[0:16] + ".npz")
+        if particleDiameters is None:
+            particleDiameters = read_LDPMCSL_particleDiameters(cacheFile,mixHash)
+
+    # Draw the diameters if they are not cached or not enough for this volume
+    # (the volume fractions are calculated for a unit volume)
+    if particleDiameters is None or particleDiameters['volFracParSim']*matVolume > particleDiameters['drawnVolume']:
+
+        if sieveCurveDiameter != (0 or None or [] or ""):
+            [newSieveCurveD, newSieveCurveP, NewSet, w_min, w_max] = calc_sieveCurve(minPar, maxPar,\
+                sieveCurveDiameter, sieveCurvePassing)
+        else:
+            newSieveCurveD, newSieveCurveP, w_min, w_max, NewSet = 0, 0, 0, 0, 0
+
+        [volFracPar, volFracParSim, cdf, cdf1, kappa_i] = calc_parVolume(1.0, wcRatio, cementC, airFrac, fullerCoef,
+            flyashC, silicaC, scmC, fillerC, flyashDensity, silicaDensity, scmDensity, fillerDensity, cementDensity,
+            densityWater, minPar, maxPar, newSieveCurveD, newSieveCurveP, NewSet, w_min, w_max)
+
+        drawnVolume = volFracParSim*matVolume
+        [discard, drawnDiameters] = gen_particleList(drawnVolume, minPar, maxPar, newSieveCurveD, cdf, kappa_i,\
+            NewSet, fullerCoef, gen_LDPMCSL_randomStream(seed,0,material), sortList=False)
+
+        particleDiameters = {
+            'volFracPar':       volFracPar,
+            'volFracParSim':    volFracParSim,
+            'drawnVolume':      drawnVolume,
+            'drawnDiameters':   drawnDiameters,
+        }
+        if cacheDir is not None:
+            try:
+                mkData_LDPMCSL_particleDiameters(particleDiameters,mixHash,cacheFile)
+            except OSError:
+                pass
+
+    # Keep the most recent results of this session
+    particleDiametersCache.pop(mixHash, None)
+    particleDiametersCache[mixHash] = particleDiameters
+    if len(particleDiametersCache) > maxCacheEntries:
+        particleDiametersCache.pop(next(iter(particleDiametersCache)))
+
+    # Diameters up to the particle volume of this geometry (all of them if
+    # they were drawn for it)
+    parVolTotal = particleDiameters['volFracParSim']*matVolume
+    drawnDiameters = particleDiameters['drawnDiameters']
+    if parVolTotal < particleDiameters['drawnVolume']:
+        cumVolume = np.cumsum(4/3*math.pi*(drawnDiameters/2)**3)
+        drawnDiameters = drawnDiameters[0:np.searchsorted(cumVolume, parVolTotal, side='right')]
+    parDiameterList = np.sort(drawnDiameters)[::-1]
+
+    maxParNum = np.ceil(parVolTotal/(4/3*math.pi*(minPar/2)**3))
+
+    return particleDiameters['volFracPar'], parVolTotal, maxParNum, parDiameterList
@@ -0,0 +1,134 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to form the tetrahedralization of the
+## particles of a periodic box. The particles and their periodic images
+## within a margin around the box are tetrahedralized with Tetgen (Delaunay,
+## no surface), and the tets whose centroid lies in the box are kept: each
+## tet of the periodic mesh appears exactly once. The margin is widened
+## until the circumsphere of every kept tet lies within the padded box, so
+## the kept tets do not depend on the truncation of the images.
+##
+## ===========================================================================
+
+import os
+import numpy as np
+from pathlib import Path
+
+from freecad.chronoWorkbench import TETGENPATH
+
+
+
+
+def gen_LDPMCSL_periodicTetrahedralization(internalNodes,minC,maxC,margin,geoName,tempPath):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - internalNodes:    Nodes of the particles in the box
+    - minC:             Minimum coordinates of the box
+    - maxC:             Maximum coordinates of the box
+    - margin:           Initial width of the layer of periodic images
+    - geoName:          Name of the geometry
+    - tempPath:         Path to the temporary folder
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - allNodes:         Nodes of the tets: the particles first, then the
+                        periodic images used by the tets crossing the faces
+                        of the box
+    - allTets:          Tets of the periodic mesh (one-indexed)
+    - allEdges:         Edges of the tets (one-indexed)
+    - periodicIndex:    Index of the particle of each node
+    - periodicShift:    Periodic shift of each node (in box lengths)
+    --------------------------------------------------------------------------
+    """
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+    boxLength = maxC - minC
+    nodeFile = Path(tempPath + geoName + 'Periodic.node')
+
+    while True:
+
+        # Particles and their images within the margin (no shift first, so
+        # the particles keep their index)
+        shiftRange = np.arange(-np.ceil(margin/np.min(boxLength)), np.ceil(margin/np.min(boxLength))+1)
+        shifts = np.array(np.meshgrid(shiftRange,shiftRange,shiftRange,indexing='ij')).reshape(3,-1).T
+        shifts = shifts[np.argsort(np.any(shifts != 0, axis=1), kind='stable')]
+        images = internalNodes[np.newaxis,:,:] + (shifts*boxLength)[:,np.newaxis,:]
+        inMargin = np.all((images > minC - margin) & (images < maxC + margin), axis=2)
+        [imageShift,imageIndex] = np.nonzero(inMargin)
+        points = images[inMargin]
+
+        # Make nodes file for Tetgen
+        nodeList = np.vstack((np.arange(len(points))+1,points.T)).T
+        with open(nodeFile,"w") as f:
+            f.write(str(len(points)) + ' 3 0 0\n ')
+            f.write("\n ".join(" ".join(map(str, x)) for x in nodeList))
+
+        # Run Tetgen with appropriate switches
+        # The used switches are:
+        # -Q:    Quiet mode
+        tetgenCommand = str(Path(TETGENPATH + '/tetgen')) + ' -Q ' + str(nodeFile)
+        os.system(tetgenCommand)
+
+        try:
+            tets = np.loadtxt(Path(tempPath + geoName + 'Periodic.1.ele'), usecols=(1,2,3,4), skiprows=1).astype(int) - 1
+        except:
+            print("Tetgen failed during periodic tetrahedralization.")
+            raise
+        for ext in ['.node','.1.node','.1.ele','.1.face']:
+            try:
+                os.remove(Path(tempPath + geoName + 'Periodic' + ext))
+            except:
+                pass
+
+        # Keep the tets with centroid in the box
+        centroids = np.mean(points[tets], axis=1)
+        tets = tets[np.all((centroids >= minC) & (centroids < maxC), axis=1)]
+
+        # Circumsphere of each kept tet
+        edgeVectors = points[tets[:,1:4]] - points[tets[:,0]][:,np.newaxis,:]
+        rhs = np.sum(edgeVectors**2, axis=2)/2
+        circumcenters = points[tets[:,0]] + np.linalg.solve(edgeVectors, rhs[:,:,np.newaxis])[:,:,0]
+        circumradius = np.linalg.norm(circumcenters - points[tets[:,0]], axis=1)[:,np.newaxis]
+
+        if np.all((circumcenters - circumradius > minC - margin) & (circumcenters + circumradius < maxC + margin)):
+            break
+        margin = 1.5*margin
+
+    # Check that the tets fill the box exactly once
+    tetVolume = np.sum(np.abs(np.linalg.det(edgeVectors)))/6
+    if abs(tetVolume - np.prod(boxLength)) > 1e-6*np.prod(boxLength):
+        print("Periodic tetrahedralization does not fill the box (" + str(tetVolume) + " vs " + str(np.prod(boxLength)) + ").")
+
+    # Keep the particles and the images used by the tets
+    used = np.zeros(len(points), dtype=bool)
+    used[0:len(internalNodes)] = True
+    used[tets.ravel()] = True
+    newIndex = np.cumsum(used) - 1
+
+    allNodes = points[used]
+    allTets = newIndex[tets] + 1
+    periodicIndex = imageIndex[used]
+    periodicShift = shifts[imageShift[used]].astype(int)
+
+    # Edges of the tets
+    edges = np.concatenate([allTets[:,[i,j]] for i in range(4) for j in range(i+1,4)])
+    allEdges = np.unique(np.sort(edges, axis=1), axis=0)
+
+    return allNodes, allTets, allEdges, periodicIndex, periodicShift
@@ -0,0 +1,63 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to initialize the placement controller.
+## The controller keeps the trial budget of the placement: it tracks the
+## number of trials needed per placed particle to size the candidate
+## buffers, and the particle offset, which is relaxed when a particle runs
+## out of trials before the placement is stopped.
+##
+## ===========================================================================
+
+
+def gen_LDPMCSL_placementController(maxIter, parOffset, maxRelax=3, relaxFactor=0.5):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - maxIter:          Maximum number of trials to place one particle
+    - parOffset:        Minimum offset between particles
+    - maxRelax:         Maximum number of times the offset is relaxed
+    - relaxFactor:      Factor applied to the offset at each relaxation
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - controller:       Dictionary with the trial budget (maxIter), current
+                        and initial offsets (parOffset, initialOffset), the
+                        relaxation settings and count, the running mean of
+                        the trials per particle (meanTrials), the candidate
+                        buffer size (bufferSize), the number of particles
+                        placed and trials used (nPlaced, totalTrials) and
+                        the index of the particle that stopped the
+                        placement (failedIndex, -1 if none)
+    --------------------------------------------------------------------------
+    """
+
+    controller = {
+        'maxIter': int(maxIter),
+        'parOffset': float(parOffset),
+        'initialOffset': float(parOffset),
+        'maxRelax': maxRelax,
+        'relaxFactor': relaxFactor,
+        'relaxCount': 0,
+        'meanTrials': 1.0,
+        'bufferSize': 8,
+        'nPlaced': 0,
+        'totalTrials': 0,
+        'failedIndex': -1,
+    }
+
+    return controller
@@ -0,0 +1,64 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to create an independent random number
+## generator for one part of the generation (the particle list, or a block
+## of candidate positions of one particle). Each stream only depends on the
+## seed and its key, so the results do not depend on the order in which
+## the streams are used or on the process that uses them.
+##
+## Stream keys used:
+##   (0, material)              particle diameter lists
+##   (1, particle, block)       candidate positions of a particle
+##   (2, particle)              void-tracking candidates of a particle
+##   (3, material, particle, block)
+##                              sub-particle (multi-material) candidates
+##   (4,)                       collective rearrangement initial positions
+##   (5, particle, block)       candidate positions of a particle in a
+##                              periodic box
+##   (6,)                       subdomain of each particle in the
+##                              distributed placement
+##   (6, particle, redraw)      new subdomain of a particle that did not fit
+##                              in its subdomain
+##   (7, particle, round)       Poisson-disk fill of the size class of fine
+##                              particles starting at a particle in the
+##                              hybrid placement
+##   (7, particle)              points of the fill taken by the particles
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def gen_LDPMCSL_randomStream(seed, *streamKey):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - seed:             Random seed of the generation (None for a random
+                        stream that cannot be reproduced)
+    - streamKey:        Integers identifying the stream
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - rng:              Numpy random generator of the stream
+    --------------------------------------------------------------------------
+    """
+
+    if seed is None:
+        return np.random.default_rng()
+
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=streamKey)))
@@ -17,11 +17,15 @@
 ## This file contains the function to generate a subparticle and outputs the
 ## location of the particle as well as the maximum number of iterations
 ## allowed and the number of iterations required to place the particle.
+## Candidates are drawn in blocks from the voxel table of the material and
+## each block is tested at once.
 ##
 ## ===========================================================================
 
 import numpy as np
 
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_voxelCandidates     import calc_LDPMCSL_voxelCandidates
+from freecad.chronoWorkbench.generation.check_LDPMCSL_candidates         import check_LDPMCSL_candidates
 from freecad.chronoWorkbench.generation.check_LDPMCSL_particleOverlap    import check_LDPMCSL_particleOverlap
 from freecad.chronoWorkbench.generation.check_LDPMCSL_particleInside     import check_LDPMCSL_particleInside
 
@@ -29,7 +33,8 @@ from freecad.chronoWorkbench.generation.check_LDPMCSL_particleInside     import
 def gen_LDPMCSL_subParticle(facePoints,parDiameter,\
     vertices,tets,newMaxIter,maxIter,minPar,maxPar,\
     parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,nodes,\
-    multiMatX,multiMatY,multiMatZ,multiMatRes,multiMatVoxels,voxelIDs,minC,maxC):
+    voxelTable,voxelIDs,cellList=None,surfaceBVH=None,tetTree=None,distanceField=None,\
+    seed=None,materialIndex=0,parIndex=0,firstCandidate=0):
 
     """
     Variables:
@@ -39,7 +44,8 @@ def gen_LDPMCSL_subParticle(facePoints,parDiameter,\
     - parDiameter:      Diameter of the particle
     - vertices:         List of vertices of the mesh
     - tets:             List of tetrahedrons of the mesh
-    - newMaxIter:       Maximum number of iterations to try to place a particle
+    - newMaxIter:       Number of candidates to draw at once (see
+                        update_LDPMCSL_placementController)
     - maxIter:          Maximum number of iterations to try to place a particle
     - minPar:           Minimum particle diameter
     - maxPar:           Maximum particle diameter
@@ -52,84 +58,90 @@ def gen_LDPMCSL_subParticle(facePoints,parDiameter,\
     - maxEdgeLength:    Maximum edge length of the mesh
     - max_dist:         Maximum distance from the surface
     - nodes:            List of nodes
+    - voxelTable:       Voxel centers of the material (see
+                        gen_LDPMCSL_voxelTable)
+    - voxelIDs:         IDs of the voxels of the material (aggregate only,
+                        0 otherwise)
+    - cellList:         Cell list of placed particles (optional)
+    - surfaceBVH:       Surface bounding volume hierarchy (optional)
+    - tetTree:          Tet tree of the mesh (optional)
+    - distanceField:    Signed distance field of the geometry (optional)
+    - seed:             Random seed of the generation (optional)
+    - materialIndex:    Index of the material (0 aggregate, 1 ITZ, 2 binder)
+    - parIndex:         Index of the particle in the list of the material
+    - firstCandidate:   Index of the first candidate of the particle to test
     --------------------------------------------------------------------------
     ### Outputs ###
-    - node:             Node location of the particle
-    - newMaxIter:       Maximum number of iterations to try to place a particle
+    - node:             Node location of the particle (None if the particle
+                        could not be placed in maxIter trials)
+    - newMaxIter:       Number of candidates drawn at once for the last buffer
     - iterReq:          Number of iterations required to place a particle
+    - particleID:       ID of the voxel of the particle (aggregate only, 0
+                        otherwise)
     --------------------------------------------------------------------------
     """  
 
 
-    # Generate random numbers to use in generation
-    randomN = np.random.rand(newMaxIter*3)    
-    nVoxels = len(multiMatVoxels)
+    # No voxel of the material within the geometry
+    if len(voxelTable['voxelCenters']) == 0:
+        return newMaxIter,None,0,0
 
-    # Generate random nodal location
+    candidateIndex = firstCandidate
     iterReq = 0
-    while True:
-        iterReq = iterReq + 3
-
-        if iterReq/3 >= newMaxIter:
-            iterReq = 0
-            newMaxIter = newMaxIter * 2
-            randomN = np.random.rand(newMaxIter*3)
-
-        if newMaxIter >= maxIter:
-            print("This particle has exceeeded the %r specified maximum iterations allowed." % (maxIter))
-            print('Now exitting...')
-            input()
-            #exit()
-
-        # Selection of random voxel
-        randVoxel = round(randomN[iterReq]*nVoxels)
-
-        # Find voxel coordinates of random voxel
-        xVoxel = np.floor(multiMatVoxels[randVoxel-1]/(multiMatZ*multiMatY))+1
-        yVoxel = np.floor((multiMatVoxels[randVoxel-1]-(xVoxel-1)*(multiMatZ*multiMatY))/multiMatZ)+1
-        zVoxel = multiMatVoxels[randVoxel-1]-(xVoxel-1)*(multiMatZ*multiMatY)-(yVoxel-1)*multiMatZ
-
-        # Min and max coordinates of voxel (offset to align with geometry)
-        voxMin = np.array(((xVoxel-1)*multiMatRes-multiMatRes/2,(yVoxel-1)*\
-            multiMatRes-multiMatRes/2,(zVoxel-1)*multiMatRes-multiMatRes/2))+minC
-        voxMax = np.array(((xVoxel-1)*multiMatRes+multiMatRes/2,(yVoxel-1)*\
-            multiMatRes+multiMatRes/2,(zVoxel-1)*multiMatRes+multiMatRes/2))+minC
-
-        # Check voxel max is within max of geometry
-        if (voxMax[0]<maxC[0] and voxMax[1]<maxC[1] and voxMax[2]<maxC[2]).all(): 
-
-            # Select random point in voxel
-            node = np.array([randomN[iterReq]*(voxMax[0]-voxMin[0])+voxMin[0],\
-                randomN[iterReq+1]*(voxMax[1]-voxMin[1])+voxMin[1],randomN[iterReq+2]\
-                *(voxMax[2]-voxMin[2])+voxMin[2]]).T
-            node = node[np.newaxis,:]           
-
-            # Obtain extents for floating bin
-            binMin = node[0,:] - parDiameter/2 - maxPar/2 - parOffset
-            binMax = node[0,:] + parDiameter/2 + maxPar/2 + parOffset
-
-            # Check if particle overlapping any existing particles or bad nodes
-            overlap = check_LDPMCSL_particleOverlap(nodes,node,parDiameter,facePoints,binMin,\
-                binMax,minPar,maxEdgeLength,parOffset,parDiameterList)
-
-            # If does not overlap an existing particle set overlap[0] = False
-            if overlap[0] == False:
-                
-                # If critically close to the surface set overlap[1] = True
-                if overlap[1] == True:
-
-                    # Check if particle is inside the mesh if critically close          
-                    inside = check_LDPMCSL_particleInside(vertices,tets,node,parDiameter,binMin,binMax,coord1,\
-                                        coord2,coord3,coord4)
-
-                else:
-                    inside = True
-
-                # Indicate placed particle and break While Loop
-                if inside == True and overlap[0] == False:
-                    
-                    # Check if we are placing aggregate (voxelIDs is not an int)
-                    if (type(voxelIDs) == np.ndarray):
-                        return newMaxIter,node,iterReq,voxelIDs[randVoxel-1]
+    while iterReq < maxIter:
+
+        # Next block of candidates of the particle (random voxels and a
+        # random point in each)
+        blockSize = min(newMaxIter, maxIter - iterReq)
+        [candidates,voxel] = calc_LDPMCSL_voxelCandidates(voxelTable,seed,materialIndex,parIndex,\
+            candidateIndex,blockSize)
+
+        # Test the whole block at once if the search structures are available
+        if cellList is not None and surfaceBVH is not None:
+            index = check_LDPMCSL_candidates(candidates,parDiameter,minPar,parOffset,nodes,\
+                parDiameterList,cellList,surfaceBVH,distanceField)
+
+        # Otherwise test the candidates one after the other
+        else:
+            index = -1
+            for c in range(blockSize):
+
+                node = candidates[c:c+1,:]
+
+                # Obtain extents for floating bin
+                binMin = node[0,:] - parDiameter/2 - maxPar/2 - parOffset
+                binMax = node[0,:] + parDiameter/2 + maxPar/2 + parOffset
+
+                # Check if particle overlapping any existing particles or bad nodes
+                overlap = check_LDPMCSL_particleOverlap(nodes,node,parDiameter,facePoints,binMin,\
+                    binMax,minPar,maxEdgeLength,parOffset,parDiameterList,cellList,surfaceBVH,\
+                    distanceField)
+
+                # Check if particle is inside the mesh if critically close
+                if overlap[0] == False:
+                    if overlap[1] == True:
+                        inside = check_LDPMCSL_particleInside(vertices,tets,node,parDiameter,binMin,binMax,coord1,\
+                            coord2,coord3,coord4,tetTree)
                     else:
-                        return newMaxIter,node,iterReq,0
+                        inside = True
+                    if inside == True:
+                        index = c
+                        break
+
+        tested = blockSize if index < 0 else index + 1
+        iterReq = iterReq + tested
+        candidateIndex = candidateIndex + tested
+
+        if index >= 0:
+
+            # Check if we are placing aggregate (voxelIDs is not an int)
+            if (type(voxelIDs) == np.ndarray):
+                return newMaxIter,candidates[index:index+1,:],iterReq,voxelIDs[voxelTable['voxelIndex'][voxel[index]]]
+            else:
+                return newMaxIter,candidates[index:index+1,:],iterReq,0
+
+        # Draw a larger block next if this one had no valid candidate
+        newMaxIter = min(2*newMaxIter, 4096)
+
+    # The trial budget ran out
+    return newMaxIter,None,iterReq,0
@@ -0,0 +1,85 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to split the geometry into slabs along
+## its longest axis for the distributed placement. The slabs hold the same
+## volume of the mesh, so the particles split evenly between them, and each
+## slab gets a tet sampler of the tets reaching into it to draw candidates.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_tetVolumes          import calc_LDPMCSL_tetVolumes
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetSampler           import gen_LDPMCSL_tetSampler
+
+
+def gen_LDPMCSL_subdomains(vertices, tets, tetSampler, nRegions, minWidth, regions=()):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - vertices:         Vertices of the mesh
+    - tets:             Tets of the mesh (1-based indices into vertices)
+    - tetSampler:       Tet sampler of the whole mesh (see
+                        gen_LDPMCSL_tetSampler and update_LDPMCSL_tetDepth)
+    - nRegions:         Number of slabs
+    - minWidth:         Minimum width of a slab
+    - regions:          Slabs to build a tet sampler for
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - regionBounds:     Coordinates of the nRegions+1 slab faces along the
+                        axis
+    - axis:             Axis normal to the slabs
+    - regionVolume:     Mesh volume of each slab
+    - regionSamplers:   Tet sampler of each slab in regions
+    --------------------------------------------------------------------------
+    """
+
+    tets = np.asarray(tets).astype(int)
+    tetCoords = vertices[tets-1][:, :, 0:3]
+    minC = np.min(vertices[:, 0:3], axis=0)
+    maxC = np.max(vertices[:, 0:3], axis=0)
+    axis = int(np.argmax(maxC - minC))
+
+    # Faces at the volume quantiles of the tet centroids along the axis
+    tetVolume = calc_LDPMCSL_tetVolumes(vertices, tets)
+    centroid = np.mean(tetCoords[:, :, axis], axis=1)
+    order = np.argsort(centroid)
+    cumVolume = np.cumsum(tetVolume[order])
+    quantile = np.searchsorted(cumVolume, cumVolume[-1]*np.arange(1, nRegions)/nRegions)
+    regionBounds = np.concatenate(([minC[axis]], centroid[order][quantile], [maxC[axis]]))
+
+    if np.min(np.diff(regionBounds)) < minWidth:
+        raise Exception("The geometry is too small to be split between " + str(nRegions//2) + \
+            " MPI ranks (subdomains narrower than the largest particle). Please revise.")
+
+    regionIndex = np.clip(np.searchsorted(regionBounds, centroid, side='right') - 1, 0, nRegions - 1)
+    regionVolume = np.bincount(regionIndex, weights=tetVolume, minlength=nRegions)
+
+    # Sampler of the tets reaching into each slab
+    tetMin = np.min(tetCoords[:, :, axis], axis=1)
+    tetMax = np.max(tetCoords[:, :, axis], axis=1)
+    regionSamplers = []
+    for region in regions:
+        subset = np.flatnonzero((tetMax >= regionBounds[region]) & (tetMin <= regionBounds[region+1]))
+        regionSampler = gen_LDPMCSL_tetSampler(vertices, tets[subset])
+        if 'tetDepth' in tetSampler:
+            regionSampler['tetDepth'] = tetSampler['tetDepth'][subset]
+        regionSamplers.append(regionSampler)
+
+    return regionBounds, axis, regionVolume, regionSamplers
@@ -0,0 +1,96 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build a bounding volume hierarchy
+## over the triangles of the surface mesh. Along with the tree, the
+## angle-weighted pseudonormals of the faces, edges and vertices are stored
+## so that the sign of the distance (inside or outside) can be recovered
+## from the closest feature.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_aabbTree             import gen_LDPMCSL_aabbTree
+
+
+def gen_LDPMCSL_surfaceBVH(surfaceNodes, surfaceFaces, leafSize=8):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - surfaceNodes:     (x, y, z) coordinates of the surface mesh nodes
+    - surfaceFaces:     Surface triangles (0-based indices into surfaceNodes)
+    - leafSize:         Maximum number of triangles stored in a leaf
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - surfaceBVH:       Dictionary with the tree (see gen_LDPMCSL_aabbTree),
+                        the triangle vertices (triA, triB, triC), the edge
+                        of the mesh on each triangle side (triEdges) and the
+                        outward pseudonormals of the faces, edges and
+                        vertices (faceNormal, edgeNormal, vertexNormal)
+    --------------------------------------------------------------------------
+    """
+
+    faces = np.asarray(surfaceFaces).astype(int)
+    triA = surfaceNodes[faces[:,0], 0:3]
+    triB = surfaceNodes[faces[:,1], 0:3]
+    triC = surfaceNodes[faces[:,2], 0:3]
+
+    # Unit face normals
+    faceNormal = np.cross(triB - triA, triC - triA)
+    faceNormal = faceNormal / np.linalg.norm(faceNormal, axis=1)[:,None]
+
+    # Make the normals point outward (positive enclosed volume)
+    signedVolume = np.sum(np.einsum('ij,ij->i', triA, np.cross(triB, triC))) / 6
+    if signedVolume < 0:
+        faceNormal = -faceNormal
+
+    # Angle-weighted vertex pseudonormals
+    vertexNormal = np.zeros((len(surfaceNodes), 3))
+    for corner, (p, q, r) in enumerate([(triA, triB, triC), (triB, triC, triA), (triC, triA, triB)]):
+        e1 = q - p
+        e2 = r - p
+        cosAngle = np.einsum('ij,ij->i', e1, e2) / (np.linalg.norm(e1, axis=1) * np.linalg.norm(e2, axis=1))
+        angle = np.arccos(np.clip(cosAngle, -1, 1))
+        np.add.at(vertexNormal, faces[:,corner], angle[:,None] * faceNormal)
+
+    # Edge pseudonormals (sum of the normals of the two adjacent faces)
+    sideEdges = np.sort(np.vstack((faces[:,[0,1]], faces[:,[1,2]], faces[:,[2,0]])), axis=1)
+    uniqueEdges, edgeIndex = np.unique(sideEdges, axis=0, return_inverse=True)
+    edgeIndex = edgeIndex.ravel()
+    edgeNormal = np.zeros((len(uniqueEdges), 3))
+    np.add.at(edgeNormal, edgeIndex, np.vstack((faceNormal, faceNormal, faceNormal)))
+    triEdges = edgeIndex.reshape(3, len(faces)).T
+
+    # Build the tree over the triangle bounding boxes
+    tree = gen_LDPMCSL_aabbTree(np.minimum(np.minimum(triA, triB), triC),
+        np.maximum(np.maximum(triA, triB), triC), leafSize)
+
+    surfaceBVH = {
+        'tree':         tree,
+        'triA':         triA,
+        'triB':         triB,
+        'triC':         triC,
+        'triNodes':     faces,
+        'triEdges':     triEdges,
+        'faceNormal':   faceNormal,
+        'edgeNormal':   edgeNormal,
+        'vertexNormal': vertexNormal,
+    }
+
+    return surfaceBVH
@@ -0,0 +1,74 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build a sampler that draws tets with
+## probability proportional to their volume using an alias table (Vose's
+## method), so that each draw takes constant time.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_tetVolumes          import calc_LDPMCSL_tetVolumes
+
+
+def gen_LDPMCSL_tetSampler(vertices, tets):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - vertices:         Nodes of the tets
+    - tets:             Tets of the mesh (1-based indices into vertices)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - tetSampler:       Dictionary with the alias table (aliasProb,
+                        aliasIndex) and the vertex coordinates of each tet
+                        (tetCoords, shape (nTets, 4, 3))
+    --------------------------------------------------------------------------
+    """
+
+    tets = np.asarray(tets).astype(int)
+    tetVolume = calc_LDPMCSL_tetVolumes(vertices, tets)
+    nTets = len(tetVolume)
+
+    # Scale the probabilities so that the average is 1
+    scaled = tetVolume * nTets / np.sum(tetVolume)
+    aliasProb = np.ones(nTets)
+    aliasIndex = np.arange(nTets)
+
+    small = list(np.flatnonzero(scaled < 1))
+    large = list(np.flatnonzero(scaled >= 1))
+
+    # Pair each under-full column with an over-full one
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        aliasProb[s] = scaled[s]
+        aliasIndex[s] = l
+        scaled[l] = scaled[l] - (1 - scaled[s])
+        if scaled[l] < 1:
+            small.append(l)
+        else:
+            large.append(l)
+
+    tetSampler = {
+        'aliasProb':  aliasProb,
+        'aliasIndex': aliasIndex,
+        'tetCoords':  vertices[tets-1][:, :, 0:3],
+    }
+
+    return tetSampler
@@ -0,0 +1,72 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build an axis-aligned bounding box
+## tree over the tets of the volume mesh. The inverse of the barycentric
+## matrix of each tet is stored with the tree so that containment tests
+## reduce to a matrix-vector product.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_aabbTree             import gen_LDPMCSL_aabbTree
+
+
+def gen_LDPMCSL_tetTree(vertices, tets, leafSize=8):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - vertices:         Nodes of the tets
+    - tets:             Tets of the mesh (1-based indices into vertices)
+    - leafSize:         Maximum number of tets stored in a leaf
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - tetTree:          Dictionary with the tree (see gen_LDPMCSL_aabbTree),
+                        the fourth vertex of each tet (tetOrigin), the
+                        inverse barycentric matrix of each tet (tetInverse)
+                        and whether each tet is non-degenerate (tetValid)
+    --------------------------------------------------------------------------
+    """
+
+    tets = np.asarray(tets).astype(int)
+    coord1 = vertices[tets[:,0]-1, 0:3]
+    coord2 = vertices[tets[:,1]-1, 0:3]
+    coord3 = vertices[tets[:,2]-1, 0:3]
+    coord4 = vertices[tets[:,3]-1, 0:3]
+
+    # Barycentric matrix with the edges from the fourth vertex as columns
+    tetMatrix = np.stack((coord1 - coord4, coord2 - coord4, coord3 - coord4), axis=2)
+
+    # Invert only the non-degenerate tets
+    tetInverse = np.zeros_like(tetMatrix)
+    valid = np.abs(np.linalg.det(tetMatrix)) > 0
+    tetInverse[valid] = np.linalg.inv(tetMatrix[valid])
+
+    # Build the tree over the tet bounding boxes
+    tree = gen_LDPMCSL_aabbTree(np.minimum(np.minimum(coord1, coord2), np.minimum(coord3, coord4)),
+        np.maximum(np.maximum(coord1, coord2), np.maximum(coord3, coord4)), leafSize)
+
+    tetTree = {
+        'tree':       tree,
+        'tetOrigin':  coord4,
+        'tetInverse': tetInverse,
+        'tetValid':   valid,
+    }
+
+    return tetTree
@@ -0,0 +1,108 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build a coarse occupancy map of the
+## free space left in the geometry. Each grid cell stores the largest
+## particle radius that can still be centered at the cell center (limited by
+## the surface and the placed particles), so that candidates can be drawn
+## only from cells that may still fit a particle.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_distanceFieldLookup import calc_LDPMCSL_distanceFieldLookup
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistance     import calc_LDPMCSL_surfaceDistance
+
+
+def gen_LDPMCSL_voidMap(surfaceBVH, minC, maxC, minPar, maxPar, distanceField=None, maxCells=1000000):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - surfaceBVH:       Surface bounding volume hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    - minC:             Minimum coordinate of the geometry
+    - maxC:             Maximum coordinate of the geometry
+    - minPar:           Minimum particle diameter
+    - maxPar:           Maximum particle diameter
+    - distanceField:    Signed distance field of the geometry (optional)
+    - maxCells:         Maximum number of grid cells
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - voidMap:          Dictionary with the grid origin (mapMin), cell size
+                        (cellSize), grid dimensions (mapDims), free radius
+                        at each cell center (freeRadius), lower bound of the
+                        distance from the points of each cell to the surface
+                        (cellDepth) and the list of active cells for the
+                        current diameter class
+    --------------------------------------------------------------------------
+    """
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+
+    # Cell size tied to the minimum particle size
+    cellSize = minPar/2
+    extent = maxC - minC
+    if np.prod(np.ceil(extent/cellSize)) > maxCells:
+        cellSize = (np.prod(extent)/maxCells)**(1/3)
+        while np.prod(np.ceil(extent/cellSize)) > maxCells:
+            cellSize = cellSize*1.05
+
+    mapDims = np.maximum(np.ceil(extent/cellSize), 1).astype(int)
+
+    x = minC[0] + cellSize*(np.arange(mapDims[0]) + 0.5)
+    y = minC[1] + cellSize*(np.arange(mapDims[1]) + 0.5)
+    z = minC[2] + cellSize*(np.arange(mapDims[2]) + 0.5)
+    gridX, gridY, gridZ = np.meshgrid(x, y, z, indexing='ij')
+    cellCenters = np.column_stack((gridX.ravel(), gridY.ravel(), gridZ.ravel()))
+
+    # Free radius allowed by the surface (same clearance as the surface
+    # check). An upper bound of the distance is used so no usable cell is
+    # discarded, and a lower bound gives the depth of the points of the cell
+    # so that deep candidates skip the surface check.
+    surfaceDistance = np.empty(len(cellCenters))
+    surfaceDepth = np.empty(len(cellCenters))
+    chunkSize = 20000
+    for start in range(0, len(cellCenters), chunkSize):
+        chunk = cellCenters[start:start+chunkSize]
+        if distanceField is None:
+            surfaceDistance[start:start+chunkSize] = calc_LDPMCSL_surfaceDistance(surfaceBVH, chunk)
+            surfaceDepth[start:start+chunkSize] = surfaceDistance[start:start+chunkSize]
+        else:
+            [distance, errorBound] = calc_LDPMCSL_distanceFieldLookup(distanceField, chunk)
+            surfaceDistance[start:start+chunkSize] = distance + errorBound
+            surfaceDepth[start:start+chunkSize] = distance - errorBound
+
+    # Radii above maxPar/2 do not change which cells are usable
+    freeRadius = np.minimum(surfaceDistance - 1.1*minPar/2, maxPar/2)
+    cellReach = np.sqrt(3)*cellSize/2
+
+    voidMap = {
+        'mapMin':        minC,
+        'cellSize':      cellSize,
+        'mapDims':       mapDims,
+        'cellReach':     cellReach,
+        'maxPar':        maxPar,
+        'freeRadius':    freeRadius,
+        'cellDepth':     surfaceDepth - cellReach,
+        'activeCells':   np.zeros(0, dtype=np.int64),
+        'classDiameter': np.inf,
+    }
+
+    return voidMap
@@ -0,0 +1,70 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to build the table of voxel centers of
+## one material of a multi-material voxel file. The voxel numbers are
+## converted to coordinates once with integer arithmetic, and the voxels
+## that reach beyond the geometry extents are dropped, so that candidates
+## can be drawn from any voxel of the table.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def gen_LDPMCSL_voxelTable(voxels, multiMatY, multiMatZ, multiMatRes, minC, maxC):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - voxels:           Voxel numbers of the material (see
+                        sort_multiMat_voxels)
+    - multiMatY:        Number of voxels in the y direction
+    - multiMatZ:        Number of voxels in the z direction
+    - multiMatRes:      Size of the voxels
+    - minC:             Minimum coordinates of the geometry
+    - maxC:             Maximum coordinates of the geometry
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - voxelTable:       Dictionary with the centers of the voxels inside the
+                        geometry extents (voxelCenters), their position in
+                        the voxel numbers (voxelIndex) and the voxel size
+                        (voxelSize)
+    --------------------------------------------------------------------------
+    """
+
+    voxels = np.rint(np.asarray(voxels)).astype(np.int64)
+    sliceSize = int(multiMatY)*int(multiMatZ)
+
+    # Voxel coordinates of each voxel number
+    xVoxel = voxels // sliceSize
+    yVoxel = (voxels - xVoxel*sliceSize) // int(multiMatZ)
+    zVoxel = voxels - xVoxel*sliceSize - yVoxel*int(multiMatZ) - 1
+
+    # Voxel centers (offset to align with geometry)
+    voxelCenters = np.stack((xVoxel, yVoxel, zVoxel), axis=1)*multiMatRes + np.asarray(minC)
+
+    # Keep the voxels within the max of the geometry
+    voxelIndex = np.flatnonzero(np.all(voxelCenters + multiMatRes/2 < np.asarray(maxC), axis=1))
+
+    voxelTable = {
+        'voxelCenters': voxelCenters[voxelIndex],
+        'voxelIndex':   voxelIndex,
+        'voxelSize':    float(multiMatRes),
+    }
+
+    return voxelTable
@@ -17,6 +17,10 @@
 ## This file contains the function to generate a particle and outputs the
 ## location of the particle as well as the maximum number of iterations
 ## allowed and the number of iterations required to place the particle.
+## With a cell list and a surface BVH, the candidates are tested in blocks
+## sized by the placement controller, all at once (see
+## check_LDPMCSL_candidates, compiled with Numba if installed), otherwise
+## one at a time.
 ##
 ## ===========================================================================
 
@@ -24,11 +28,15 @@ import numpy as np
 
 from freecad.chronoWorkbench.generation.check_LDPMCSL_particleOverlap    import check_LDPMCSL_particleOverlap
 from freecad.chronoWorkbench.generation.check_LDPMCSL_particleInside     import check_LDPMCSL_particleInside
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_candidates          import calc_LDPMCSL_candidates
+from freecad.chronoWorkbench.generation.check_LDPMCSL_candidates         import check_LDPMCSL_candidates
 
 
 def gen_particle(facePoints,parDiameter,\
     vertices,tets,newMaxIter,maxIter,minPar,maxPar,\
-    parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,nodes):
+    parOffset,parDiameterList,coord1,coord2,coord3,coord4,maxEdgeLength,max_dist,nodes,\
+    cellList=None,surfaceBVH=None,tetTree=None,distanceField=None,tetSampler=None,\
+    seed=None,parIndex=0,firstCandidate=0):
 
     """
     Variables:
@@ -38,7 +46,8 @@ def gen_particle(facePoints,parDiameter,\
     - parDiameter:      Diameter of the particle
     - vertices:         List of vertices of the mesh
     - tets:             List of tetrahedrons of the mesh
-    - newMaxIter:       Maximum number of iterations to try to place a particle
+    - newMaxIter:       Number of candidates to draw at once (see
+                        update_LDPMCSL_placementController)
     - maxIter:          Maximum number of iterations to try to place a particle
     - minPar:           Minimum particle diameter
     - maxPar:           Maximum particle diameter
@@ -51,41 +60,70 @@ def gen_particle(facePoints,parDiameter,\
     - maxEdgeLength:    Maximum edge length of the mesh
     - max_dist:         Maximum distance from the surface
     - nodes:            List of nodes
+    - cellList:         Cell list of placed particles (optional)
+    - surfaceBVH:       Surface bounding volume hierarchy (optional)
+    - tetTree:          Tet tree of the mesh (optional)
+    - distanceField:    Signed distance field of the geometry (optional)
+    - tetSampler:       Volume-weighted tet sampler of the mesh (optional)
+    - seed:             Random seed of the generation (optional)
+    - parIndex:         Index of the particle in the particle list
+    - firstCandidate:   Index of the first candidate of the particle to test
     --------------------------------------------------------------------------
     ### Outputs ###
-    - node:             Node location of the particle
-    - newMaxIter:       Maximum number of iterations to try to place a particle
+    - node:             Node location of the particle (None if the particle
+                        could not be placed in maxIter trials)
+    - newMaxIter:       Number of candidates drawn at once for the last block
     - iterReq:          Number of iterations required to place a particle
     --------------------------------------------------------------------------
     """  
 
-    # Generate random numbers to use in generation
-    randomN = np.random.rand(newMaxIter*3)    
-
-    # Generate random nodal location
+    # Test each block of candidates in one call
+    if cellList is not None and surfaceBVH is not None:
+        candidateIndex = firstCandidate
+        iterReq = 0
+        while iterReq < maxIter:
+            blockSize = min(newMaxIter, maxIter - iterReq)
+            [candidates,candidateDepth] = calc_LDPMCSL_candidates(vertices,tets,tetSampler,seed,parIndex,candidateIndex,blockSize)
+            index = check_LDPMCSL_candidates(candidates,parDiameter,minPar,parOffset,nodes,\
+                parDiameterList,cellList,surfaceBVH,distanceField,candidateDepth)
+
+            tested = blockSize if index < 0 else index + 1
+            iterReq = iterReq + tested
+            candidateIndex = candidateIndex + tested
+
+            if index >= 0:
+                return newMaxIter,candidates[index:index+1,:],iterReq
+
+            # Draw a larger block next if this one had no valid candidate
+            newMaxIter = min(2*newMaxIter, 4096)
+
+        # The trial budget ran out
+        return newMaxIter,None,iterReq
+
+    # Test the candidates of the particle in order, drawing them in blocks
+    # from the random stream of the particle
+    candidates = np.zeros((0,3))
+    candidateDepth = np.zeros(0)
+    candidateIndex = firstCandidate - 1
     iterReq = 0
     while True:
-        iterReq = iterReq + 3
-
-        if iterReq/3 >= newMaxIter:
-            iterReq = 0
-            newMaxIter = newMaxIter * 2
-            randomN = np.random.rand(newMaxIter*3)
-
-        if newMaxIter >= maxIter:
-            print("This particle has exceeeded the %r specified maximum iterations allowed." % (maxIter))
-            print('Now exitting...')
-            exit()
+        # The trial budget ran out
+        if iterReq >= maxIter:
+            return newMaxIter,None,iterReq
 
-        # Random point selection in random tet prism container    
-        tetIndex = int(np.around(randomN[iterReq] * len(tets))) - 1
-        tetVerts = vertices[tets[tetIndex]-1]
+        iterReq = iterReq + 1
+        candidateIndex = candidateIndex + 1
 
-        tetMin = np.amin(tetVerts, axis=0)
-        tetMax = np.amax(tetVerts, axis=0)
+        # Draw the next block of candidates, larger than the last one
+        if len(candidates) == 0:
+            if iterReq > 1:
+                newMaxIter = min(2*newMaxIter, 4096)
+            [candidates,candidateDepth] = calc_LDPMCSL_candidates(vertices,tets,tetSampler,seed,parIndex,candidateIndex,newMaxIter)
 
-        node = randomN[iterReq:iterReq+3] * (tetMax - tetMin) + tetMin
-        node = node[np.newaxis,:]
+        node = candidates[0:1,:]
+        depth = candidateDepth[0]
+        candidates = candidates[1:,:]
+        candidateDepth = candidateDepth[1:]
 
         # Obtain extents for floating bin
         binMin = node[0,:] - parDiameter/2 - maxPar/2 - parOffset
@@ -93,7 +131,8 @@ def gen_particle(facePoints,parDiameter,\
 
         # Check if particle overlapping any existing particles or bad nodes
         overlap = check_LDPMCSL_particleOverlap(nodes,node,parDiameter,facePoints,binMin,\
-            binMax,minPar,maxEdgeLength,parOffset,parDiameterList)
+            binMax,minPar,maxEdgeLength,parOffset,parDiameterList,cellList,surfaceBVH,\
+            distanceField,depth)
 
         # If does not overlap an existing particle set overlap[0] = False
         if overlap[0] == False:
@@ -103,7 +142,7 @@ def gen_particle(facePoints,parDiameter,\
 
                 # Check if particle is inside the mesh if critically close          
                 inside = check_LDPMCSL_particleInside(vertices,tets,node,parDiameter,binMin,binMax,coord1,\
-                                    coord2,coord3,coord4)
+                                    coord2,coord3,coord4,tetTree)
 
             else:
                 inside = True
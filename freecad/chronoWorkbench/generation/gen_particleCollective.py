@@ -0,0 +1,215 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to place all particles at once by
+## collective rearrangement (in the spirit of Lubachevsky-Stillinger): the
+## particles are inserted at random positions with reduced diameters, then
+## grown step by step while overlapping pairs are pushed apart and particles
+## too close to the surface are pushed back inside. Each sweep finds all
+## overlaps with one grid search, so the cost grows linearly with the number
+## of particles. Once the packing jams (the overlaps stop shrinking even at
+## the slowest growth), the smaller particle of each of the worst pairs is
+## taken out and the others go on growing. The particles taken out are left
+## to the caller, to be inserted one by one against the final packing.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_batchConflicts      import calc_LDPMCSL_batchConflicts
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_distanceFieldLookup import calc_LDPMCSL_distanceFieldLookup
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_independentSet      import calc_LDPMCSL_independentSet
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistance     import calc_LDPMCSL_surfaceDistance
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_tetSamples          import calc_LDPMCSL_tetSamples
+from freecad.chronoWorkbench.generation.check_LDPMCSL_surfaceClearance   import check_LDPMCSL_surfaceClearance
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+
+
+def gen_particleCollective(parDiameterList,vertices,tets,tetVolume,minPar,parOffset,\
+    surfaceBVH,distanceField=None,tetSampler=None,seed=None,growthRate=1.02,maxSweeps=20000):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - parDiameterList:  List of particle diameters (largest first)
+    - vertices:         Vertices of the mesh
+    - tets:             Tets of the mesh
+    - tetVolume:        Volume of the geometry
+    - minPar:           Minimum particle diameter
+    - parOffset:        Minimum offset between particles
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - tetSampler:       Volume-weighted tet sampler of the mesh (optional)
+    - seed:             Random seed of the generation (optional)
+    - growthRate:       Initial growth factor of the diameters per step
+    - maxSweeps:        Maximum number of relaxation sweeps
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - nodes:            Node locations of the particles
+    - placed:           Mask of the particles that could be placed (no
+                        overlap and far enough inside the geometry), the
+                        others are taken out of the packing
+    --------------------------------------------------------------------------
+    """
+
+    parDiameterList = np.asarray(parDiameterList, dtype=float)
+    nPar = len(parDiameterList)
+    rng = gen_LDPMCSL_randomStream(seed,4)
+
+    # Random initial positions in the volume
+    if tetSampler is not None:
+        nodes = calc_LDPMCSL_tetSamples(tetSampler, nPar, rng)[0]
+    else:
+        randomN = rng.random((nPar,4))
+        tetIndex = (randomN[:,0] * len(tets)).astype(int)
+        tetVerts = vertices[tets[tetIndex]-1][:,:,0:3]
+        tetMin = np.amin(tetVerts, axis=1)
+        tetMax = np.amax(tetVerts, axis=1)
+        nodes = randomN[:,1:4] * (tetMax - tetMin) + tetMin
+
+    # Start from diameters that fill about a tenth of the volume, so that
+    # the first sweeps have few overlaps
+    parVolume = np.pi/6*parDiameterList**3
+    scale = min((0.1*tetVolume/np.sum(parVolume))**(1/3), 1.0)
+
+    # Larger particles move less when pushed apart
+    weight = parVolume / np.max(parVolume)
+
+    # Lower bound of the distance to the surface of each particle, lowered
+    # by the distance moved since it was last computed
+    if distanceField is None:
+        surfaceBound = calc_LDPMCSL_surfaceDistance(surfaceBVH, nodes)
+    else:
+        [distance, errorBound] = calc_LDPMCSL_distanceFieldLookup(distanceField, nodes)
+        surfaceBound = distance - errorBound
+    step = 1e-3*minPar
+    offsets = np.concatenate((step*np.eye(3), -step*np.eye(3)))
+    surfaceNormal = np.zeros((nPar,3))
+    normalDrift = np.full(nPar, np.inf)
+
+    # Pairs closer than a skin distance are searched on the grid only when
+    # the particles have moved or grown by more than the skin
+    skin = 0.5*minPar
+    drift = np.full(nPar, np.inf)
+    listScale = scale
+
+    # Overlap tolerated while growing, the final sweeps remove it entirely
+    tolerance = 0.1*minPar
+    bestOverlap = np.inf
+    stalled = 0
+    minGrowthRate = 1 + (growthRate - 1)/8
+    active = np.ones(nPar, dtype=bool)
+    for sweep in range(maxSweeps):
+
+        diameters = scale*parDiameterList
+        required = diameters/2 + 1.1*minPar/2
+
+        if 2*np.max(drift) + (scale - listScale)*np.max(parDiameterList) > skin:
+            activeIndex = np.flatnonzero(active)
+            [listI,listJ] = calc_LDPMCSL_batchConflicts(nodes[activeIndex], diameters[activeIndex], parOffset + skin)
+            [listI,listJ] = [activeIndex[listI], activeIndex[listJ]]
+            listScale = scale
+            drift = np.zeros(nPar)
+
+        delta = nodes[listJ] - nodes[listI]
+        distance = np.linalg.norm(delta, axis=1)
+        overlap = diameters[listI]/2 + diameters[listJ]/2 + parOffset - distance
+        contact = overlap > 0
+        [pairI,pairJ,delta,distance,overlap] = [listI[contact], listJ[contact],\
+            delta[contact], distance[contact], overlap[contact]]
+
+        # Exact distance of the particles that may be too close to the
+        # surface, and inward direction of those that are (from the distances
+        # at points around the particle, kept until it has moved)
+        near = np.flatnonzero(active & (surfaceBound < required))
+        violation = np.zeros(0)
+        if len(near) > 0:
+            surfaceBound[near] = calc_LDPMCSL_surfaceDistance(surfaceBVH, nodes[near])
+            violation = required[near] - surfaceBound[near]
+            inside = violation > 0
+            [near, violation] = [near[inside], violation[inside]]
+            stale = near[normalDrift[near] > skin/2]
+            if len(stale) > 0:
+                probe = calc_LDPMCSL_surfaceDistance(surfaceBVH,\
+                    (nodes[stale][np.newaxis,:,:] + offsets[:,np.newaxis,:]).reshape(-1,3)).reshape(6,-1)
+                gradient = (probe[0:3] - probe[3:6]).T
+                surfaceNormal[stale] = gradient / np.maximum(np.linalg.norm(gradient, axis=1),\
+                    1e-12)[:,np.newaxis]
+                normalDrift[stale] = 0
+
+        maxOverlap = max(np.max(overlap, initial=0), np.max(violation, initial=0))
+        if maxOverlap == 0 and scale >= 1:
+            break
+
+        # Grow the particles while the overlaps stay small
+        if maxOverlap < tolerance and scale < 1:
+            scale = min(scale*growthRate, 1.0)
+            bestOverlap = np.inf
+            stalled = 0
+
+        # Step back and grow more slowly if the overlaps stop shrinking. Once
+        # the packing is jammed, take out the smaller particle of the pairs
+        # that overlap by at least half the largest overlap (or the particles
+        # too close to the surface if no pair does)
+        elif maxOverlap < bestOverlap:
+            bestOverlap = maxOverlap
+            stalled = 0
+        else:
+            stalled = stalled + 1
+            if stalled > 100:
+                if growthRate > minGrowthRate and scale < 1:
+                    scale = scale/np.sqrt(growthRate)
+                    growthRate = 1 + (growthRate - 1)/2
+                else:
+                    worst = overlap >= maxOverlap/2
+                    takeOut = np.where(parDiameterList[pairI[worst]] < parDiameterList[pairJ[worst]],\
+                        pairI[worst], pairJ[worst])
+                    if len(takeOut) == 0:
+                        takeOut = near[violation >= maxOverlap/2]
+                    active[takeOut] = False
+                    drift[:] = np.inf
+                bestOverlap = np.inf
+                stalled = 0
+
+        # Push each overlapping pair apart along the line of centers, sharing
+        # the overlap (plus a small margin against rounding) by the size of
+        # the particles, and push the particles too close to the surface
+        # back inside
+        direction = delta / np.maximum(distance, 1e-12)[:,np.newaxis]
+        shareI = weight[pairJ]/(weight[pairI] + weight[pairJ])
+
+        move = np.zeros((nPar,3))
+        np.add.at(move, pairI, -direction*((overlap + step)*shareI)[:,np.newaxis])
+        np.add.at(move, pairJ, direction*((overlap + step)*(1 - shareI))[:,np.newaxis])
+        if len(near) > 0:
+            move[near] += surfaceNormal[near]*(violation + step)[:,np.newaxis]
+
+        nodes = nodes + move
+        moved = np.linalg.norm(move, axis=1)
+        surfaceBound = surfaceBound - moved
+        drift = drift + moved
+        normalDrift = normalDrift + moved
+
+    # Keep the particles far enough inside the geometry and, for each
+    # remaining overlap, the larger particle
+    clear = np.flatnonzero(active & check_LDPMCSL_surfaceClearance(surfaceBVH, nodes,\
+        parDiameterList, minPar, distanceField))
+    [pairI,pairJ] = calc_LDPMCSL_batchConflicts(nodes[clear], parDiameterList[clear], parOffset)
+    placed = np.zeros(nPar, dtype=bool)
+    placed[clear] = calc_LDPMCSL_independentSet(len(clear), pairI, pairJ)
+
+    return nodes, placed
@@ -0,0 +1,259 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to place the particles with MPI, one
+## rank per spatial subdomain. The geometry is split into two slabs per rank
+## (see gen_LDPMCSL_subdomains) and each particle is drawn into one slab in
+## proportion to its volume. The ranks place their particles increment by
+## increment, first in their lower slab then in their upper slab: the slabs
+## placed at the same time are one slab apart, so they cannot conflict. The
+## particles placed near the faces of the subdomain are sent to the
+## neighboring ranks as ghosts after each phase. A particle that does not fit
+## in its slab gets a new slab among those with free volume (the smaller
+## particles wait until it is placed), and the offset is only relaxed when it
+## fits in none of them. mpi4py is an optional
+## dependency, only needed for this placement (run with mpirun).
+##
+## ===========================================================================
+
+import math
+import numpy as np
+
+try:
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_candidates          import calc_LDPMCSL_candidates
+from freecad.chronoWorkbench.generation.check_LDPMCSL_candidates         import check_LDPMCSL_candidates
+from freecad.chronoWorkbench.generation.check_LDPMCSL_placementRetry     import check_LDPMCSL_placementRetry
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_subdomains           import gen_LDPMCSL_subdomains
+from freecad.chronoWorkbench.generation.update_LDPMCSL_cellList          import update_LDPMCSL_cellList
+from freecad.chronoWorkbench.generation.update_LDPMCSL_placementController import update_LDPMCSL_placementController
+
+
+def gen_particleDistributed(parDiameterList,vertices,tets,tetSampler,minPar,maxPar,numIncrements,\
+    controller,cellList,surfaceBVH,distanceField,seed):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - parDiameterList:  List of particle diameters (the same on all ranks)
+    - vertices:         Vertices of the mesh
+    - tets:             Tets of the mesh
+    - tetSampler:       Volume-weighted tet sampler of the mesh
+    - minPar:           Minimum particle diameter
+    - maxPar:           Maximum particle diameter
+    - numIncrements:    Number of increments of the particle list
+    - controller:       Placement controller (see
+                        gen_LDPMCSL_placementController), updated in place
+    - cellList:         Cell list of placed particles
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - seed:             Random seed of the generation
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - nodes:            Node location of each particle (complete on rank 0
+                        only)
+    - placed:           Mask of the placed particles (complete on rank 0
+                        only)
+    - rank:             MPI rank of this process
+    --------------------------------------------------------------------------
+    """
+
+    if MPI is None:
+        raise Exception("The distributed placement requires mpi4py. Please revise.")
+    if seed is None:
+        raise Exception("The distributed placement requires a placement seed. Please revise.")
+
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    nParticles = len(parDiameterList)
+
+    nodes = (np.zeros((nParticles,3))+2)*np.max(vertices[:,0:3], axis=0)
+    placed = np.zeros(nParticles, dtype=bool)
+
+    # Two slabs per rank, each wider than the reach of a particle
+    reach = maxPar + controller['parOffset']
+    [regionBounds, axis, regionVolume, regionSamplers] = gen_LDPMCSL_subdomains(vertices,tets,tetSampler,\
+        2*size,reach,(2*rank,2*rank+1))
+    subdomainMin = regionBounds[2*rank]
+    subdomainMax = regionBounds[2*rank+2]
+    regionBounds[0] = -np.inf
+    regionBounds[-1] = np.inf
+
+    # Slab of each particle, drawn in proportion to the volume of the slabs
+    rng = gen_LDPMCSL_randomStream(seed,6)
+    region = np.searchsorted(np.cumsum(regionVolume)/np.sum(regionVolume), rng.random(nParticles), side='right')
+    region = np.minimum(region, 2*size-1)
+
+    lowerRank = rank-1 if rank > 0 else MPI.PROC_NULL
+    upperRank = rank+1 if rank < size-1 else MPI.PROC_NULL
+
+    # Slabs each particle was tried in, number of slabs drawn for it and the
+    # particles waiting to be placed in a new slab
+    parVolume = math.pi/6*parDiameterList**3
+    triedRegions = {}
+    redraws = {}
+    moved = np.zeros(nParticles, dtype=bool)
+
+    increment = max(1, math.ceil(nParticles/numIncrements))
+    queues = [np.zeros(0, dtype=int), np.zeros(0, dtype=int)]
+    start = 0
+    stopped = False
+
+    while not stopped:
+
+        # Queue the particles of the next increment in the slabs of this rank
+        if start < nParticles:
+            for phase in range(2):
+                queues[phase] = np.concatenate((queues[phase],\
+                    start + np.flatnonzero(region[start:start+increment] == 2*rank+phase)))
+            start = start + increment
+
+        for phase in range(2):
+
+            [slabMin, slabMax] = regionBounds[2*rank+phase:2*rank+phase+2]
+            newParticles = []
+            failedParticles = []
+
+            # Hold the particles after the first one waiting for a new slab, so
+            # the particles are placed in order as in the serial placement
+            holdIndex = nParticles
+            for queue in queues:
+                if np.any(moved[queue]):
+                    holdIndex = min(holdIndex, queue[moved[queue]][0])
+            holdIndex = comm.allreduce(holdIndex, op=MPI.MIN)
+
+            for [k, x] in enumerate(queues[phase]):
+
+                if x > holdIndex:
+                    queues[phase] = queues[phase][k:]
+                    break
+
+                # Test the candidates of the particle that fall in the slab
+                node = None
+                iterReq = 0
+                while iterReq < controller['maxIter']:
+                    count = min(controller['bufferSize'], controller['maxIter'] - iterReq)
+                    [candidates,candidateDepth] = calc_LDPMCSL_candidates(vertices,tets,regionSamplers[phase],\
+                        seed,x,iterReq,count)
+                    inSlab = np.flatnonzero((candidates[:,axis] >= slabMin) & (candidates[:,axis] < slabMax))
+                    index = -1
+                    if len(inSlab) > 0:
+                        index = check_LDPMCSL_candidates(candidates[inSlab],parDiameterList[x],minPar,\
+                            controller['parOffset'],nodes,parDiameterList,cellList,surfaceBVH,distanceField,\
+                            candidateDepth[inSlab])
+                    if index >= 0:
+                        iterReq = iterReq + inSlab[index] + 1
+                        node = candidates[inSlab[index]]
+                        break
+                    iterReq = iterReq + count
+
+                # Hand the particle over to another slab after this phase and
+                # leave the rest of the queue for the next round
+                if node is None:
+                    failedParticles.append(x)
+                    queues[phase] = queues[phase][k+1:]
+                    break
+
+                nodes[x,:] = node
+                update_LDPMCSL_cellList(cellList,x,node,parDiameterList[x])
+                placed[x] = True
+                moved[x] = False
+                update_LDPMCSL_placementController(controller,iterReq)
+                newParticles.append(x)
+
+            else:
+                queues[phase] = np.zeros(0, dtype=int)
+
+            # Send the particles placed near the faces of the subdomain to the
+            # neighboring ranks and add theirs as ghosts
+            newParticles = np.array(newParticles, dtype=int)
+            toLower = newParticles[nodes[newParticles,axis] < subdomainMin + reach]
+            toUpper = newParticles[nodes[newParticles,axis] > subdomainMax - reach]
+            fromUpper = comm.sendrecv([toLower, nodes[toLower]], dest=lowerRank, source=upperRank)
+            fromLower = comm.sendrecv([toUpper, nodes[toUpper]], dest=upperRank, source=lowerRank)
+            for ghosts in [fromUpper, fromLower]:
+                if ghosts is not None:
+                    for [x, node] in zip(ghosts[0], ghosts[1]):
+                        nodes[x,:] = node
+                        update_LDPMCSL_cellList(cellList,x,node,parDiameterList[x])
+
+            # Draw a new slab for the particles that did not fit, among the slabs
+            # with free volume they were not tried in (the same on all ranks)
+            failedParticles = np.sort(np.concatenate(comm.allgather(np.array(failedParticles, dtype=int))))
+            if len(failedParticles) == 0:
+                continue
+            freeVolume = regionVolume - comm.allreduce(np.bincount(region[placed], weights=parVolume[placed],\
+                minlength=2*size))
+            unplaced = []
+            for x in failedParticles:
+                triedRegions.setdefault(x, set()).add(region[x])
+                weights = np.maximum(freeVolume, 0)
+                weights[list(triedRegions[x])] = 0
+                if np.sum(weights) <= 0:
+                    unplaced.append(x)
+                    continue
+                redraws[x] = redraws.get(x, 0) + 1
+                rng = gen_LDPMCSL_randomStream(seed,6,x,redraws[x])
+                region[x] = min(np.searchsorted(np.cumsum(weights)/np.sum(weights), rng.random(), side='right'), 2*size-1)
+            moved[failedParticles] = True
+
+            # Relax the offset on all ranks when a particle fits in no slab (and
+            # try it again in its last slab), or stop with the particles placed
+            # so far
+            if len(unplaced) > 0:
+                controller['nPlaced'] = comm.allreduce(np.count_nonzero(placed))
+                retry = check_LDPMCSL_placementRetry(controller,unplaced[0]) if rank == 0 else None
+                [retry, controller['parOffset'], controller['relaxCount'], controller['failedIndex']] = \
+                    comm.bcast([retry, controller['parOffset'], controller['relaxCount'], controller['failedIndex']], root=0)
+                if not retry:
+                    stopped = True
+                    break
+                for x in unplaced:
+                    triedRegions[x] = set()
+
+            # Queue the particles in their new slab if it is one of this rank
+            for otherPhase in range(2):
+                queues[otherPhase] = np.sort(np.concatenate((queues[otherPhase],\
+                    failedParticles[region[failedParticles] == 2*rank+otherPhase])))
+
+        queued = comm.allreduce(len(queues[0]) + len(queues[1]))
+        if start >= nParticles and queued == 0:
+            break
+
+        if rank == 0:
+            print("Status: Placing particles into geometry. (" + str(comm.allreduce(np.count_nonzero(placed))) + \
+                '/' + str(nParticles) + ')')
+        else:
+            comm.allreduce(np.count_nonzero(placed))
+
+    # Collect the particles of all ranks on rank 0
+    ownParticles = np.flatnonzero(placed)
+    collected = comm.gather([ownParticles, nodes[ownParticles], controller['totalTrials']], root=0)
+    if rank == 0:
+        controller['totalTrials'] = 0
+        for [particles, particleNodes, totalTrials] in collected:
+            nodes[particles,:] = particleNodes
+            placed[particles] = True
+            controller['totalTrials'] = controller['totalTrials'] + totalTrials
+        controller['nPlaced'] = np.count_nonzero(placed)
+
+    return nodes, placed, rank
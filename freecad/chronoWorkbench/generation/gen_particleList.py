@@ -16,7 +16,8 @@
 ##
 ## This function generates a sorted array of particle diameters based on user 
 ## inputs for either a Fuller Coefficient case or a case with a provided
-## discrete sieve curve. 
+## discrete sieve curve. Diameters are drawn in chunks by inverse CDF until
+## the particle volume is reached, so only the returned list is allocated.
 ##
 ## ===========================================================================
 
@@ -25,7 +26,7 @@ import numpy as np
 
 
 def gen_particleList(parVolTotal, minPar, maxPar, newSieveCurveD, cdf, kappa_i, 
-                 NewSet, fullerCoef):
+                 NewSet, fullerCoef, rng=None, maxChunk=1000000, sortList=True):
     
     """
     Variable List:
@@ -39,80 +40,74 @@ def gen_particleList(parVolTotal, minPar, maxPar, newSieveCurveD, cdf, kappa_i,
     kappa_i:         numpy array, coefficient used in particle simulation
     NewSet:          int, number of sieves
     fullerCoef:      float, Fuller coefficient
+    rng:             numpy random generator (optional)
+    maxChunk:        int, maximum number of diameters drawn at once
+    sortList:        bool, sort the diameters large-to-small (otherwise they
+                     are returned in the order they were drawn)
     --------------------------------------------------------------------------
     ### Outputs ###
     maxparNum:       int, maximum number of particles that can be generated
-    parDiameterList: numpy array, particle diameters (sorted large-to-small)
+    parDiameterList: numpy array, particle diameters (sorted large-to-small
+                     unless sortList is False)
     --------------------------------------------------------------------------
     """
 
+    if rng is None:
+        rng = np.random.default_rng()
+
     # Determine 'q' value based on Fuller Coefficient
     q = 3.0-fullerCoef
 
     # Calculate the volume of the smallest particle
     smallparVolume = 4/3*math.pi*(minPar/2)**3
     
-    # Determine maximum number of particles
+    # Determine maximum number of particles (only reported, the list is not
+    # allocated to this size)
     maxparNum = np.ceil(parVolTotal/smallparVolume)
-    
-    # Initialize arrays for particle diameters and volumes
-    parDiameter = np.zeros(int(maxparNum))
-    parVol = np.zeros(int(maxparNum))
-
-    # Counter for particle array indexing
-    i = 0
-
-    # If no Sieve Curve is provided
-    if newSieveCurveD == 0:
-
-        # Count particles individually for small arrays
-        if len(parDiameter) <= 100:
-            while sum(parVol) < parVolTotal:
-                # Randomly calculate the particle diameter
-                parDiameter[i] = minPar*(1-np.random.rand(1)*(1-minPar**q\
-                    /maxPar**q))**(-1/q)
-                parVol[i] = 4/3*math.pi*(parDiameter[i]/2)**3
-                i = i+1         
-
-        # Count particles in bunches of 100 for medium arrays
-        elif len(parDiameter) <= 1000:
-            while sum(parVol) < parVolTotal:
-                # Randomly calculate particle diameters
-                parDiameter[i:i+100] = minPar*(1-np.random.rand(100)*\
-                    (1-minPar**q/maxPar**q))**(-1/q)
-                parVol[i:i+100] = 4/3*math.pi*(parDiameter[i:i+100]/2)**3
-                i = i+100
-
-        # Count particles in bunches of 1000 for large arrays
+
+    # Sieve curve data as arrays, to invert the cdf of a chunk at once
+    if newSieveCurveD != 0:
+        [sieveCurveD, cdf, kappa_i] = [np.asarray(newSieveCurveD), np.asarray(cdf), np.asarray(kappa_i)]
+
+    parDiameter = [np.zeros(0)]
+    volume = 0.0
+    chunkSize = 1000
+
+    while volume < parVolTotal:
+
+        F = rng.random(chunkSize)
+
+        # If no Sieve Curve is provided
+        if newSieveCurveD == 0:
+            diameters = minPar*(1-F*(1-minPar**q/maxPar**q))**(-1/q)
+
+        # If a Sieve Curve is provided, invert the cdf in the sieve of each
+        # draw (draws outside the curve are skipped)
         else:
-            while sum(parVol) < parVolTotal:
-                # Randomly calculate particle diameters
-                parDiameter[i:i+1000] = minPar*(1-np.random.rand(1000)*\
-                    (1-minPar**q/maxPar**q))**(-1/q)
-                parVol[i:i+1000] = 4/3*math.pi*(parDiameter[i:i+1000]/2)**3
-                i = i+1000
-
-    # If a Sieve Curve is provided
-    else:
-        while sum(parVol) < parVolTotal:
-            F = np.random.rand(1)
-            for x in range(0,NewSet):
-                if (F >= cdf[x] and F < cdf[x+1]) :
-                    # Calculate the diameter of the selected particle
-                    parDiameter[i] = ((newSieveCurveD[x]**2*kappa_i[x])/(kappa_i[x]-2*(F-cdf[x])*newSieveCurveD[x]**2))**0.5
-                    parVol[i] = 4/3*math.pi*(parDiameter[i]/2)**3
-                    i = i+1         
-
-    # Remove trailing zeros from arrays
-    parDiameter = np.trim_zeros(parDiameter)
-    parVol = np.trim_zeros(parVol)
-
-    # Remove accidental extra placed particles
-    while sum(parVol) > parVolTotal:
-        parDiameter = np.delete(parDiameter, -1)
-        parVol = np.delete(parVol, -1)
+            x = np.searchsorted(cdf[0:NewSet+1], F, side='right') - 1
+            inCurve = (x >= 0) & (x < NewSet)
+            [F, x] = [F[inCurve], x[inCurve]]
+            sieveD = sieveCurveD[x]
+            diameters = ((sieveD**2*kappa_i[x])/(kappa_i[x]-2*(F-cdf[x])*sieveD**2))**0.5
+
+        if len(diameters) == 0:
+            continue
+
+        # Keep the particles up to the total volume
+        cumVolume = volume + np.cumsum(4/3*math.pi*(diameters/2)**3)
+        nKeep = np.searchsorted(cumVolume, parVolTotal, side='right')
+        parDiameter.append(diameters[0:nKeep])
+        if nKeep < len(diameters):
+            break
+
+        # Size the next chunk for the volume left at the mean particle volume
+        meanVolume = (cumVolume[-1] - volume)/len(diameters)
+        volume = cumVolume[-1]
+        chunkSize = int(min(max(1.1*(parVolTotal - volume)/meanVolume, 1000), maxChunk))
 
     # Sort particle diameters large-to-small
-    parDiameterList = np.sort(parDiameter)[::-1]
+    parDiameterList = np.concatenate(parDiameter)
+    if sortList:
+        parDiameterList = np.sort(parDiameterList)[::-1]
 
-    return maxparNum,parDiameterList
\ No newline at end of file
+    return maxparNum,parDiameterList
@@ -25,11 +25,16 @@ import numpy as np
 
 from freecad.chronoWorkbench.generation.check_LDPMCSL_particleOverlap     import check_LDPMCSL_particleOverlap
 from freecad.chronoWorkbench.generation.check_LDPMCSL_particleInside      import check_LDPMCSL_particleInside
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_candidates           import calc_LDPMCSL_candidates
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_candidateKernel      import calc_LDPMCSL_candidateKernelJit
+from freecad.chronoWorkbench.generation.check_LDPMCSL_candidates          import check_LDPMCSL_candidates
 
 
 def gen_particleMPI(facePoints,maxParNum,minC,maxC,\
     vertices,tets,coord1,coord2,coord3,coord4,newMaxIter,maxIter,minPar,maxPar,\
-    parOffset,verbose,parDiameterList,maxEdgeLength,max_dist,nodes,parDiameter):
+    parOffset,verbose,parDiameterList,maxEdgeLength,max_dist,nodes,parDiameter,\
+    cellList=None,surfaceBVH=None,tetTree=None,distanceField=None,tetSampler=None,\
+    seed=None,parIndex=0,firstCandidate=0):
 
     """
     Variables:
@@ -45,7 +50,8 @@ def gen_particleMPI(facePoints,maxParNum,minC,maxC,\
     - coord2:           Coordinate 2 of the tets
     - coord3:           Coordinate 3 of the tets
     - coord4:           Coordinate 4 of the tets
-    - newMaxIter:       Maximum number of iterations to try to place a particle
+    - newMaxIter:       Number of candidates to draw at once (see
+                        update_LDPMCSL_placementController)
     - maxIter:          Maximum number of iterations to try to place a particle
     - minPar:           Minimum particle diameter
     - maxPar:           Maximum particle diameter
@@ -56,45 +62,70 @@ def gen_particleMPI(facePoints,maxParNum,minC,maxC,\
     - max_dist:         Maximum distance between particles
     - nodes:            List of nodes
     - parDiameter:      Particle diameter
+    - cellList:         Cell list of placed particles (optional)
+    - surfaceBVH:       Surface bounding volume hierarchy (optional)
+    - tetTree:          Tet tree of the mesh (optional)
+    - distanceField:    Signed distance field of the geometry (optional)
+    - tetSampler:       Volume-weighted tet sampler of the mesh (optional)
+    - seed:             Random seed of the generation (optional)
+    - parIndex:         Index of the particle in the particle list
+    - firstCandidate:   Index of the first candidate of the particle to test
     --------------------------------------------------------------------------
     ### Outputs ###
-    - node:             Node location of the particle
-    - newMaxIter:       Maximum number of iterations to try to place a particle
-    - iterReq:          Number of iterations required to place a particle
+    - node:             Node location of the particle (NaN if the particle
+                        could not be placed in maxIter trials)
+    - newMaxIter:       Number of candidates drawn at once for the last block
+    - candidateIndex:   Index of the accepted candidate of the particle
     --------------------------------------------------------------------------
     """  
 
-    # Generate random numbers to use in generation
-    randomN = np.random.rand(newMaxIter*3)
-    i=0
-    ntet = len(tets)
-    # Generate random nodal location
+    # With the compiled kernel, test each block of candidates in one call
+    if calc_LDPMCSL_candidateKernelJit is not None and cellList is not None and surfaceBVH is not None:
+        candidateIndex = firstCandidate
+        iterReq = 0
+        while iterReq < maxIter:
+            blockSize = min(newMaxIter, maxIter - iterReq)
+            [candidates,candidateDepth] = calc_LDPMCSL_candidates(vertices,tets,tetSampler,seed,parIndex,candidateIndex,blockSize)
+            index = check_LDPMCSL_candidates(candidates,parDiameter,minPar,parOffset,nodes,\
+                parDiameterList,cellList,surfaceBVH,distanceField,candidateDepth)
+
+            tested = blockSize if index < 0 else index + 1
+            iterReq = iterReq + tested
+            candidateIndex = candidateIndex + tested
+
+            if index >= 0:
+                return np.append(candidates[index,:],[parDiameter,newMaxIter,candidateIndex-1])
+
+            # Draw a larger block next if this one had no valid candidate
+            newMaxIter = min(2*newMaxIter, 4096)
+
+        # The trial budget ran out
+        return np.append(np.full(3,np.nan),[parDiameter,newMaxIter,candidateIndex])
+
+    # Test the candidates of the particle in order, drawing them in blocks
+    # from the random stream of the particle
+    candidates = np.zeros((0,3))
+    candidateDepth = np.zeros(0)
+    candidateIndex = firstCandidate - 1
+    i = 0
     while True:
-        i=i+3
+        # The trial budget ran out
+        if i >= maxIter:
+            return np.append(np.full(3,np.nan),[parDiameter,newMaxIter,candidateIndex])
 
-        if i/3 >= newMaxIter:
-            i = 3
-            newMaxIter = newMaxIter*2
-            randomN = np.random.rand(newMaxIter*3)
+        i = i + 1
+        candidateIndex = candidateIndex + 1
 
-        if newMaxIter >= maxIter:
-            print("This particle has exceeeded the %r specified maximum iterations allowed." % (maxIter))
-            print('Now exitting...')
-            exit()
+        # Draw the next block of candidates, larger than the last one
+        if len(candidates) == 0:
+            if i > 1:
+                newMaxIter = min(2*newMaxIter, 4096)
+            [candidates,candidateDepth] = calc_LDPMCSL_candidates(vertices,tets,tetSampler,seed,parIndex,candidateIndex,newMaxIter)
 
-        # Random point selection in random tet prism container
-        tetVerts = np.vstack((vertices[int(tets[int(int(np.around(randomN[i]*ntet))-1),0]-1),:],\
-            vertices[int(tets[int(int(np.around(randomN[i]*ntet))-1),1]-1),:],\
-            vertices[int(tets[int(int(np.around(randomN[i]*ntet))-1),2]-1),:],\
-            vertices[int(tets[int(int(np.around(randomN[i]*ntet))-1),3]-1),:]))
-
-        tetMin = np.amin(tetVerts, axis=0)
-        tetMax = np.amax(tetVerts, axis=0)
-
-        node = np.array([randomN[i]*(tetMax[0]-tetMin[0])+tetMin[0],\
-            randomN[i+1]*(tetMax[1]-tetMin[1])+tetMin[1],randomN[i+2]\
-            *(tetMax[2]-tetMin[2])+tetMin[2]]).T
-        node = node[np.newaxis,:]           
+        node = candidates[0:1,:]
+        depth = candidateDepth[0]
+        candidates = candidates[1:,:]
+        candidateDepth = candidateDepth[1:]
 
 
         # Obtain extents for floating bin
@@ -108,7 +139,8 @@ def gen_particleMPI(facePoints,maxParNum,minC,maxC,\
 
         # Check if particle overlapping any existing particles or bad nodes
         overlap = check_LDPMCSL_particleOverlap(nodes,node,parDiameter,facePoints,binMin,\
-            binMax,minPar,maxEdgeLength,parOffset,parDiameterList)
+            binMax,minPar,maxEdgeLength,parOffset,parDiameterList,cellList,surfaceBVH,\
+            distanceField,depth)
 
         if overlap[0] == False:
             
@@ -118,7 +150,7 @@ def gen_particleMPI(facePoints,maxParNum,minC,maxC,\
 
                 # Check if particle is inside the mesh if critically close          
                 inside = check_LDPMCSL_particleInside(vertices,tets,node,parDiameter,binMin,binMax,coord1,\
-                                    coord2,coord3,coord4)
+                                    coord2,coord3,coord4,tetTree)
 
             else:
 
@@ -129,4 +161,4 @@ def gen_particleMPI(facePoints,maxParNum,minC,maxC,\
                 break
 
 
-    return np.append(node[0,:],[parDiameter,newMaxIter,int(i/3)])
\ No newline at end of file
+    return np.append(node[0,:],[parDiameter,newMaxIter,candidateIndex])
\ No newline at end of file
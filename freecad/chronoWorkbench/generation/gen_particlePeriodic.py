@@ -0,0 +1,80 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to generate a particle in a periodic
+## box (representative volume). Candidates are drawn uniformly in the box
+## and only checked for overlap with the placed particles and their periodic
+## images: there is no surface, so no clearance or containment test.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.check_LDPMCSL_periodicOverlap    import check_LDPMCSL_periodicOverlap
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+
+
+def gen_particlePeriodic(parDiameter,minC,maxC,maxIter,parOffset,parDiameterList,\
+    nodes,cellList,seed=None,parIndex=0):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - parDiameter:      Diameter of the particle
+    - minC:             Minimum coordinates of the box
+    - maxC:             Maximum coordinates of the box
+    - maxIter:          Maximum number of iterations
+    - parOffset:        Minimum offset between particles
+    - parDiameterList:  List of particle diameters
+    - nodes:            List of nodes
+    - cellList:         Cell list of placed particles
+    - seed:             Random seed of the generation (optional)
+    - parIndex:         Index of the particle in the particle list
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - node:             Node location of the particle (None if the particle
+                        could not be placed in maxIter trials)
+    - iterReq:          Number of candidates tested to place the particle
+    --------------------------------------------------------------------------
+    """
+
+    blockSize = 64
+
+    minC = np.asarray(minC, dtype=float)
+    maxC = np.asarray(maxC, dtype=float)
+
+    iterReq = 0
+    block = 0
+    while iterReq < maxIter:
+
+        # Fixed blocks of candidates so candidate k does not depend on the
+        # trial budget
+        rng = gen_LDPMCSL_randomStream(seed,5,parIndex,block)
+        candidates = minC + rng.random((blockSize,3))*(maxC - minC)
+        candidates = candidates[0:min(blockSize, maxIter - iterReq)]
+
+        free = np.flatnonzero(~check_LDPMCSL_periodicOverlap(candidates,parDiameter,parOffset,\
+            parDiameterList,nodes,cellList,minC,maxC))
+
+        if len(free) > 0:
+            iterReq = iterReq + free[0] + 1
+            return candidates[free[0]][np.newaxis,:],iterReq
+
+        iterReq = iterReq + len(candidates)
+        block = block + 1
+
+    return None,iterReq
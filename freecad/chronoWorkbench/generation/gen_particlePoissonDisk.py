@@ -0,0 +1,125 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to place the fine particles of the hybrid
+## placement, after the coarse particles are placed one by one. The fine
+## particles are split into narrow size classes, placed from the largest.
+## For each class the free space is filled with one point per particle
+## (see calc_LDPMCSL_poissonDisk), stopping once the class is full, and the
+## particles of the class take the points in random order: every point is
+## valid for the largest particle of the class, so the diameters are
+## assigned afterwards. The spacing of the fill is first set from the free
+## volume for a few more points than particles, so the fill spreads over
+## the free space and its cost follows the size of its class, and is reduced
+## down to the particle spacing while there are too few points. The seeds
+## of a fill are drawn until maxIter of them in a row are not valid. If the fill at
+## the particle spacing still holds too few points, the fill stops and the
+## particles of the class left are handed back to the serial placement,
+## after which the fill goes on with the next class.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_poissonDisk         import calc_LDPMCSL_poissonDisk
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+from freecad.chronoWorkbench.generation.update_LDPMCSL_cellList          import update_LDPMCSL_cellList
+
+
+def gen_particlePoissonDisk(parDiameterList,firstFine,minPar,minC,maxC,tetSampler,nodes,placed,\
+    controller,cellList,surfaceBVH,distanceField,seed,classRatio=1.15,fillRatio=1.5,fillDensity=3.0):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - parDiameterList:  List of particle diameters (in decreasing order)
+    - firstFine:        Index of the first fine particle to fill
+    - minPar:           Minimum particle diameter
+    - minC:             Minimum coordinates of the geometry
+    - maxC:             Maximum coordinates of the geometry
+    - tetSampler:       Volume-weighted tet sampler of the mesh
+    - nodes:            (x, y, z) coordinates of each particle, updated in
+                        place
+    - placed:           Mask of the placed particles, updated in place
+    - controller:       Placement controller (see
+                        gen_LDPMCSL_placementController), updated in place
+    - cellList:         Cell list of the placed particles, updated in place
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - seed:             Random seed of the generation
+    - classRatio:       Maximum ratio of the largest to the smallest diameter
+                        of a size class
+    - fillRatio:        Number of points of a fill per particle of the class
+    - fillDensity:      Volume per point of a fill, in spacings cubed
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - serialStart:      First particle of the size class the fill could not
+                        take (len(parDiameterList) if all were placed)
+    - serialEnd:        End of the size class the fill could not take
+    --------------------------------------------------------------------------
+    """
+
+    tetCoords = tetSampler['tetCoords']
+    volume = np.sum(np.abs(np.linalg.det(tetCoords[:,1:4] - tetCoords[:,0:1])))/6
+
+    nPlaced = 0
+    while firstFine + nPlaced < len(parDiameterList):
+
+        # Size class of the largest fine particle left (its fill is drawn from
+        # the streams of its first particle)
+        start = firstFine + nPlaced
+        nClass = np.count_nonzero(parDiameterList[start:] >= parDiameterList[start]/classRatio)
+
+        # Spacing for about fillRatio points per particle of the class, with
+        # a fill holding about one point per fillDensity spacings cubed
+        freeVolume = volume - np.sum(np.pi/6*parDiameterList[placed]**3)
+        spacing = np.cbrt(max(freeVolume, 0)/(fillDensity*fillRatio*nClass))
+
+        # Fill the free space, reducing the spacing while there are too few
+        # points (a few trials per point are enough above the particle
+        # spacing, the fill only needs to be dense below). The points of a
+        # wider fill stay valid, so the next fill goes on from them.
+        points = np.zeros((0,3))
+        while True:
+            points = calc_LDPMCSL_poissonDisk(parDiameterList[start],minPar,controller['parOffset'],spacing,minC,maxC,\
+                tetSampler,nodes,parDiameterList,cellList,surfaceBVH,distanceField,seed,nClass,start,\
+                30 if spacing <= parDiameterList[start] + controller['parOffset'] else 8,controller['maxIter'],points)
+            if len(points) >= nClass or spacing <= parDiameterList[start] + controller['parOffset']:
+                break
+            spacing = max(spacing*0.95*np.cbrt(len(points)/nClass), parDiameterList[start] + controller['parOffset'])
+
+        # Points in random order for the particles of the class
+        rng = gen_LDPMCSL_randomStream(seed,7,start)
+        points = points[rng.permutation(len(points))]
+        classIndex = start + np.arange(len(points))
+
+        nodes[classIndex,:] = points
+        placed[classIndex] = True
+        for x in classIndex:
+            update_LDPMCSL_cellList(cellList,x,nodes[x,:],parDiameterList[x])
+        controller['nPlaced'] = np.count_nonzero(placed)
+        controller['totalTrials'] = controller['totalTrials'] + len(points)
+
+        nPlaced = nPlaced + len(points)
+
+        # Hand the particles of the class left back to the serial placement
+        if len(points) < nClass:
+            print("The fill of particles %d to %d holds only %d points at the particle spacing. Placing the other %d particles one by one." \
+                % (start, start + nClass - 1, len(points), nClass - len(points)))
+            return start + len(points), start + nClass
+
+    return len(parDiameterList), len(parDiameterList)
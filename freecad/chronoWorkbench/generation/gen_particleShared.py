@@ -0,0 +1,136 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the functions run by the persistent worker pool of
+## the parallel placement. The pool initializer attaches once to the mesh,
+## particle and search arrays shared by the main process, so each task
+## only carries a particle index and where to resume its candidates. The
+## same pool places the sub-particles of the multi-material generation,
+## one material after the other.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_subParticle          import gen_LDPMCSL_subParticle
+from freecad.chronoWorkbench.generation.gen_particleMPI                  import gen_particleMPI
+from freecad.chronoWorkbench.util.cwAttachArrays                         import cwAttachArrays
+
+
+# Arrays attached by the pool initializer in each worker process
+workerState = {}
+
+
+def gen_particleSharedInit(descriptors):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - descriptors:      Descriptors of the shared placement data (see
+                        cwShareArrays)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - None (the attached arrays are stored in workerState)
+    --------------------------------------------------------------------------
+    """
+
+    [workerState['data'], workerState['sharedMemory']] = cwAttachArrays(descriptors)
+    workerState['tableDescriptor'] = descriptors['cellList']['cellTable']
+
+
+def gen_particleShared(task):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - task:             Tuple with the particle index, the number of
+                        candidates to draw at once, the first candidate of
+                        the particle to test, the current particle offset
+                        and the descriptor of the cell table
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - Output of gen_particleMPI for the particle
+    --------------------------------------------------------------------------
+    """
+
+    [index, newMaxIter, firstCandidate, parOffset, tableDescriptor] = task
+    data = workerState['data']
+
+    # The maximum iterations count from the first candidate of the particle,
+    # not from the first candidate of this round
+
+    # Attach again to the cell table if it was widened by the main process
+    if tableDescriptor != workerState['tableDescriptor']:
+        [data['cellList']['cellTable'], blocks] = cwAttachArrays(tableDescriptor)
+        workerState['sharedMemory'].extend(blocks)
+        workerState['tableDescriptor'] = tableDescriptor
+
+    return gen_particleMPI(data['facePoints'],data['maxParNum'],data['minC'],data['maxC'],\
+        data['vertices'],data['tets'],data['coord1'],data['coord2'],data['coord3'],data['coord4'],\
+        newMaxIter,data['maxIter']-firstCandidate,data['minPar'],data['maxPar'],parOffset,data['verbose'],\
+        data['parDiameterList'],data['maxEdgeLength'],data['max_dist'],data['nodes'],\
+        data['parDiameterList'][index],cellList=data['cellList'],surfaceBVH=data['surfaceBVH'],\
+        tetTree=data['tetTree'],distanceField=data['distanceField'],tetSampler=data['tetSampler'],\
+        seed=data['seed'],parIndex=index,firstCandidate=firstCandidate)
+
+
+
+def gen_subParticleShared(task):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - task:             Tuple with the material index, the index of the
+                        particle in the list of the material, its index in
+                        the nodes list, the number of candidates to draw at
+                        once, the first candidate of the particle to test,
+                        the current particle offset and the descriptor of the
+                        cell table
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - Node location of the particle (NaN if it could not be placed), ID of
+      its voxel, number of candidates drawn at once and index of the last
+      candidate tested
+    --------------------------------------------------------------------------
+    """
+
+    [materialIndex, index, nodeIndex, newMaxIter, firstCandidate, parOffset, tableDescriptor] = task
+    data = workerState['data']
+
+    # The maximum iterations count from the first candidate of the particle
+
+    # Attach again to the cell table if it was widened by the main process
+    if tableDescriptor != workerState['tableDescriptor']:
+        [data['cellList']['cellTable'], blocks] = cwAttachArrays(tableDescriptor)
+        workerState['sharedMemory'].extend(blocks)
+        workerState['tableDescriptor'] = tableDescriptor
+
+    [newMaxIter,node,iterReq,particleID] = gen_LDPMCSL_subParticle(data['facePoints'],\
+        data['parDiameterList'][nodeIndex],data['vertices'],data['tets'],newMaxIter,data['maxIter']-firstCandidate,\
+        data['grainMin'][materialIndex],data['grainMax'][materialIndex],parOffset,data['parDiameterList'],\
+        data['coord1'],data['coord2'],data['coord3'],data['coord4'],data['maxEdgeLength'],data['max_dist'],\
+        data['nodes'],data['voxelTables'][materialIndex],data['voxelIDs'][materialIndex],\
+        cellList=data['cellList'],surfaceBVH=data['surfaceBVH'],tetTree=data['tetTree'],\
+        distanceField=data['distanceField'],seed=data['seed'],materialIndex=materialIndex,\
+        parIndex=index,firstCandidate=firstCandidate)
+
+    if node is None:
+        node = np.full((1,3),np.nan)
+
+    return np.append(node[0,:],[particleID,newMaxIter,firstCandidate+iterReq-1])
@@ -0,0 +1,114 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to generate a particle by drawing
+## candidates only from the cells of the void map that can still fit it.
+## The list of usable cells is rebuilt for each diameter class and pruned
+## as the cells fill up, so the cost per particle stays nearly constant as
+## the packing gets denser. The free radius at a point of a cell is at most
+## the free radius at the cell center plus the distance to it, so the points
+## that cannot fit the particle are dropped before they are tested, and the
+## others are tested in blocks (see check_LDPMCSL_candidates) with the depth
+## of their cell.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.check_LDPMCSL_candidates         import check_LDPMCSL_candidates
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_randomStream         import gen_LDPMCSL_randomStream
+
+
+def gen_particleVoid(parDiameter,voidMap,maxIter,minPar,parOffset,parDiameterList,\
+    nodes,cellList,surfaceBVH,distanceField=None,seed=None,parIndex=0):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - parDiameter:      Diameter of the particle
+    - voidMap:          Void map of the geometry (see gen_LDPMCSL_voidMap)
+    - maxIter:          Maximum number of iterations
+    - minPar:           Minimum particle diameter
+    - parOffset:        Minimum offset between particles
+    - parDiameterList:  List of particle diameters
+    - nodes:            List of nodes
+    - cellList:         Cell list of placed particles
+    - surfaceBVH:       Surface bounding volume hierarchy
+    - distanceField:    Signed distance field of the geometry (optional)
+    - seed:             Random seed of the generation (optional)
+    - parIndex:         Index of the particle in the particle list
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - node:             Node location of the particle (None if the particle
+                        could not be placed in maxIter trials)
+    - iterReq:          Number of candidates tested to place the particle
+    --------------------------------------------------------------------------
+    """
+
+    batchSize = 64
+    maxBatchSize = 4096
+    classRatio = 0.8
+
+    freeRadius = voidMap['freeRadius']
+    cellReach = voidMap['cellReach']
+    mapDims = voidMap['mapDims']
+
+    # Start a new diameter class once the particle is smaller than the
+    # current one, keeping every cell that fits the smallest diameter of
+    # the class
+    if parDiameter < voidMap['classDiameter']:
+        voidMap['classDiameter'] = classRatio*parDiameter
+        voidMap['activeCells'] = np.flatnonzero(freeRadius + cellReach >= voidMap['classDiameter']/2)
+
+    rng = gen_LDPMCSL_randomStream(seed,2,parIndex)
+
+    iterReq = 0
+    while True:
+
+        activeCells = voidMap['activeCells']
+
+        # The trial budget ran out or there is no free space left
+        if iterReq >= maxIter or len(activeCells) == 0:
+            return None,iterReq
+
+        # Random cells among the active ones
+        cellIDs = activeCells[rng.integers(len(activeCells), size=batchSize)]
+        cellFree = freeRadius[cellIDs] + cellReach
+
+        # Drop the cells that filled up for this class once most draws hit them
+        if np.count_nonzero(cellFree < voidMap['classDiameter']/2) > batchSize/2:
+            voidMap['activeCells'] = activeCells[freeRadius[activeCells] + cellReach >= voidMap['classDiameter']/2]
+
+        # Random points in the cells, keeping the points that may fit the
+        # particle
+        cellIndex = np.column_stack(np.unravel_index(cellIDs, mapDims))
+        candidates = voidMap['mapMin'] + voidMap['cellSize']*(cellIndex + rng.random((batchSize,3)))
+        centerDistance = np.linalg.norm(candidates - voidMap['mapMin'] - voidMap['cellSize']*(cellIndex + 0.5), axis=1)
+        fits = np.flatnonzero(freeRadius[cellIDs] + centerDistance >= parDiameter/2)
+
+        index = -1
+        if len(fits) > 0:
+            index = check_LDPMCSL_candidates(candidates[fits],parDiameter,minPar,parOffset,nodes,\
+                parDiameterList,cellList,surfaceBVH,distanceField,voidMap['cellDepth'][cellIDs[fits]])
+
+        if index >= 0:
+            iterReq = iterReq + fits[index] + 1
+            return candidates[fits[index]][np.newaxis,:],iterReq
+
+        # Draw more points at once while the particle does not fit
+        iterReq = iterReq + batchSize
+        batchSize = min(2*batchSize, maxBatchSize, max(int(maxIter - iterReq), 1))
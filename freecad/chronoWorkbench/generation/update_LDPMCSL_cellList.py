@@ -0,0 +1,60 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to add a newly placed particle to the
+## cell list
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def update_LDPMCSL_cellList(cellList, index, node, parDiameter):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - cellList:         Cell list (see gen_LDPMCSL_cellList)
+    - index:            Index of the particle in the nodes list
+    - node:             (x, y, z) coordinates of the particle center
+    - parDiameter:      Diameter of the particle
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - None (cellList is updated in place)
+    --------------------------------------------------------------------------
+    """
+
+    # Level of the diameter band of the particle
+    levelDiameter = cellList['levelDiameter']
+    level = min(np.searchsorted(levelDiameter, parDiameter), len(levelDiameter) - 1)
+    cellDims = cellList['cellDims'][level]
+
+    # Find the cell containing the particle center
+    cellIJK = np.floor((np.ravel(node) - cellList['cellMin']) / cellList['cellSize'][level]).astype(int)
+    cellIJK = np.clip(cellIJK, 0, cellDims - 1)
+    cell = cellList['cellStart'][level] + (cellIJK[0] * cellDims[1] + cellIJK[1]) * cellDims[2] + cellIJK[2]
+
+    # Widen the table if the cell is already full
+    cellTable = cellList['cellTable']
+    if cellList['cellCount'][cell] == cellTable.shape[1]:
+        grownTable = -np.ones((cellTable.shape[0], 2*cellTable.shape[1]), dtype=cellTable.dtype)
+        grownTable[:, :cellTable.shape[1]] = cellTable
+        cellList['cellTable'] = grownTable
+
+    # Store the particle index in the next free slot of the cell
+    cellList['cellTable'][cell, cellList['cellCount'][cell]] = index
+    cellList['cellCount'][cell] += 1
@@ -0,0 +1,58 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to update the placement controller once
+## a particle is placed. The acceptance rate is estimated from a running
+## mean of the trials per particle and the candidate buffer is sized so the
+## next particle is placed from one buffer in most cases.
+##
+## ===========================================================================
+
+import math
+import numpy as np
+
+
+def update_LDPMCSL_placementController(controller, iterReq, smoothing=0.05,
+    minBuffer=8, maxBuffer=4096):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - controller:       Placement controller (see
+                        gen_LDPMCSL_placementController), updated in place
+    - iterReq:          Number of trials used to place the particle
+    - smoothing:        Weight of the last particle in the running mean
+    - minBuffer:        Minimum number of candidates drawn at once
+    - maxBuffer:        Maximum number of candidates drawn at once
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - bufferSize:       Number of candidates to draw at once for the next
+                        particle
+    --------------------------------------------------------------------------
+    """
+
+    controller['nPlaced'] = controller['nPlaced'] + 1
+    controller['totalTrials'] = controller['totalTrials'] + int(iterReq)
+    controller['meanTrials'] = (1 - smoothing)*controller['meanTrials'] + smoothing*iterReq
+
+    # Number of candidates that hold a valid one with 95% probability at the
+    # current acceptance rate
+    acceptance = min(1/max(controller['meanTrials'], 1.0), 0.95)
+    bufferSize = math.ceil(math.log(0.05)/math.log(1 - acceptance))
+    controller['bufferSize'] = int(np.clip(bufferSize, minBuffer, maxBuffer))
+
+    return controller['bufferSize']
@@ -0,0 +1,66 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to add the depth of each tet to the tet
+## sampler: a lower bound of the distance from any point of the tet to the
+## surface. Since the signed distance changes by at most the distance moved,
+## the distance of the centroid minus the largest centroid-to-vertex
+## distance bounds it. Candidates drawn in tets deeper than the required
+## clearance skip the surface checks, so only the tets of the boundary band
+## pay for them.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_distanceFieldLookup import calc_LDPMCSL_distanceFieldLookup
+from freecad.chronoWorkbench.generation.calc_LDPMCSL_surfaceDistance     import calc_LDPMCSL_surfaceDistance
+
+
+def update_LDPMCSL_tetDepth(tetSampler, surfaceBVH, distanceField=None, chunkSize=65536):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - tetSampler:       Tet sampler (see gen_LDPMCSL_tetSampler)
+    - surfaceBVH:       Surface bounding volume hierarchy (see
+                        gen_LDPMCSL_surfaceBVH)
+    - distanceField:    Signed distance field (optional, see
+                        gen_LDPMCSL_distanceField)
+    - chunkSize:        Number of tets whose distance is computed at once
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - None (tetSampler is updated in place with tetDepth)
+    --------------------------------------------------------------------------
+    """
+
+    tetCoords = tetSampler['tetCoords']
+    centroids = np.mean(tetCoords, axis=1)
+    radius = np.max(np.linalg.norm(tetCoords - centroids[:,np.newaxis,:], axis=2), axis=1)
+
+    # Lower bound of the distance of each centroid, from the distance field
+    # if available, otherwise exact
+    distance = np.zeros(len(centroids))
+    for start in range(0, len(centroids), chunkSize):
+        chunk = slice(start, start + chunkSize)
+        if distanceField is None:
+            distance[chunk] = calc_LDPMCSL_surfaceDistance(surfaceBVH, centroids[chunk])
+        else:
+            [fieldDistance, errorBound] = calc_LDPMCSL_distanceFieldLookup(distanceField, centroids[chunk])
+            distance[chunk] = fieldDistance - errorBound
+
+    tetSampler['tetDepth'] = distance - radius
@@ -0,0 +1,63 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the function to remove the space taken by a newly
+## placed particle from the void map. Only the cells around the particle
+## are updated.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def update_LDPMCSL_voidMap(voidMap, node, parDiameter, parOffset):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - voidMap:          Void map (see gen_LDPMCSL_voidMap), updated in place
+    - node:             (x, y, z) coordinates of the placed particle
+    - parDiameter:      Diameter of the placed particle
+    - parOffset:        Minimum offset between particles
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - None
+    --------------------------------------------------------------------------
+    """
+
+    node = np.ravel(node)[0:3]
+    cellSize = voidMap['cellSize']
+    mapDims = voidMap['mapDims']
+
+    # Only cells whose free radius may drop below maxPar/2 are affected
+    reach = parDiameter/2 + parOffset + voidMap['maxPar']/2
+    cellMin = np.maximum(np.floor((node - reach - voidMap['mapMin'])/cellSize), 0).astype(int)
+    cellMax = np.minimum(np.floor((node + reach - voidMap['mapMin'])/cellSize), mapDims - 1).astype(int)
+    if np.any(cellMax < cellMin):
+        return
+
+    i = np.arange(cellMin[0], cellMax[0]+1)
+    j = np.arange(cellMin[1], cellMax[1]+1)
+    k = np.arange(cellMin[2], cellMax[2]+1)
+    cellI, cellJ, cellK = np.meshgrid(i, j, k, indexing='ij')
+    cellI, cellJ, cellK = cellI.ravel(), cellJ.ravel(), cellK.ravel()
+
+    centers = voidMap['mapMin'] + cellSize*(np.column_stack((cellI, cellJ, cellK)) + 0.5)
+    radius = np.linalg.norm(centers - node, axis=1) - parDiameter/2 - parOffset
+
+    cellIDs = (cellI*mapDims[1] + cellJ)*mapDims[2] + cellK
+    voidMap['freeRadius'][cellIDs] = np.minimum(voidMap['freeRadius'][cellIDs], radius)
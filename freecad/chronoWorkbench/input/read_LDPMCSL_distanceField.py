@@ -0,0 +1,63 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This function reads a signed distance field written by
+## mkData_LDPMCSL_distanceField if it was built for the same surface mesh.
+##
+## ===========================================================================
+
+import os
+import numpy as np
+
+
+def read_LDPMCSL_distanceField(filePath, meshHash):
+
+    """
+    Variable List:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    filePath:        file path of the distance field file to read
+    meshHash:        hash of the current surface mesh
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    distanceField:   distance field dictionary, or None if the file does not
+                     exist, cannot be read or belongs to another mesh
+    --------------------------------------------------------------------------
+    """
+
+    if not os.path.isfile(filePath):
+        return None
+
+    try:
+        with np.load(filePath) as data:
+            if str(data['meshHash']) != meshHash:
+                return None
+            if 'fieldShape' in data.files:
+                distanceField = {
+                    'fieldShape':   int(data['fieldShape']),
+                    'fieldParams':  data['fieldParams'],
+                    'fieldError':   float(data['fieldError']),
+                }
+            else:
+                distanceField = {
+                    'fieldMin':     data['fieldMin'],
+                    'fieldSpacing': float(data['fieldSpacing']),
+                    'fieldValues':  data['fieldValues'],
+                }
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return distanceField
@@ -49,6 +49,9 @@ def read_LDPMCSL_inputs(form):
     numIncrements       = form[0].numPIncBox.value()
     maxIter             = form[0].numIncBox.value()
     placementAlg        = form[0].placementAlg.currentText()
+    placementSeed       = form[0].placementSeed.text()
+    checkpointInterval  = form[0].checkpointInterval.value()
+    placementResume     = form[0].placementResume.currentText()
 
     # Geometry Settings
     geoType             = form[1].geometryType.currentText()
@@ -137,6 +140,8 @@ def read_LDPMCSL_inputs(form):
     HTCtoggle           = form[4].HTCtoggle.currentText()
     HTClength           = form[4].HTClength.text()
     HTClength           = float(HTClength.split(" ")[0].strip())
+
+    periodicToggle      = form[4].periodicToggle.currentText()
     
     multiMatToggle      = form[4].multiMatToggle.currentText()
     multiMatFile        = form[4].multiMatFile.text()
@@ -175,13 +180,13 @@ def read_LDPMCSL_inputs(form):
     modelType           = form[5].modelType.currentText()
 
     return setupFile, constitutiveEQ, matParaSet, \
-        numCPU, numIncrements,maxIter,placementAlg,\
+        numCPU, numIncrements,maxIter,placementAlg,placementSeed,checkpointInterval,placementResume,\
         geoType, dimensions, cadFile,\
         minPar, maxPar, fullerCoef, sieveCurveDiameter, sieveCurvePassing,\
         wcRatio, densityWater, cementC, flyashC, silicaC, scmC,\
         cementDensity, flyashDensity, silicaDensity, scmDensity, airFrac1, \
         fillerC, fillerDensity, airFrac2,\
-        HTCtoggle, HTClength,\
+        HTCtoggle, HTClength, periodicToggle,\
         multiMatToggle,aggFile,multiMatFile,multiMatRule,\
         grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP,\
         grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP,\
@@ -0,0 +1,58 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This function reads the particle diameters written by
+## mkData_LDPMCSL_particleDiameters if they were drawn for the same mix
+## design, grading and seed.
+##
+## ===========================================================================
+
+import os
+import numpy as np
+
+
+def read_LDPMCSL_particleDiameters(filePath, mixHash):
+
+    """
+    Variable List:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    filePath:        file path of the particle diameter file to read
+    mixHash:         hash of the current mix design, grading and seed
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    particleDiameters: particle diameter dictionary, or None if the file does
+                     not exist, cannot be read or belongs to another mix
+    --------------------------------------------------------------------------
+    """
+
+    if not os.path.isfile(filePath):
+        return None
+
+    try:
+        with np.load(filePath) as data:
+            if str(data['mixHash']) != mixHash:
+                return None
+            particleDiameters = {
+                'volFracPar':       float(data['volFracPar']),
+                'volFracParSim':    float(data['volFracParSim']),
+                'drawnVolume':      float(data['drawnVolume']),
+                'drawnDiameters':   data['drawnDiameters'],
+            }
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return particleDiameters
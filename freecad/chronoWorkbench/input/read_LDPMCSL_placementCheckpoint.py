@@ -0,0 +1,72 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This function reads a placement checkpoint written by
+## mkData_LDPMCSL_placementCheckpoint if it was written for the same
+## generation.
+##
+## ===========================================================================
+
+import os
+import json
+import numpy as np
+
+
+def read_LDPMCSL_placementCheckpoint(filePath, checkpointHash):
+
+    """
+    Variable List:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    filePath:        file path of the checkpoint file to read
+    checkpointHash:  hash of the geometry, seed and particle list of the
+                     current generation
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    checkpoint:      dictionary with the state of the placement, or None if
+                     the file does not exist, cannot be read or belongs to
+                     another generation
+    --------------------------------------------------------------------------
+    """
+
+    if not os.path.isfile(filePath):
+        return None
+
+    try:
+        with np.load(filePath) as data:
+            if str(data['checkpointHash']) != checkpointHash:
+                return None
+            checkpoint = {
+                'internalNodes': data['internalNodes'],
+                'placed':        data['placed'],
+                'particleID':    data['particleID'],
+                'nextParticle':  int(data['nextParticle']),
+                'material':      int(data['material']),
+                'newMaxIter':    int(data['newMaxIter']),
+                'controller':    json.loads(str(data['controller'])),
+                'serialEnd':     int(data['serialEnd']),
+                'voidMap':       None,
+            }
+            if 'voidFreeRadius' in data.files:
+                checkpoint['voidMap'] = {
+                    'freeRadius':    data['voidFreeRadius'],
+                    'activeCells':   data['voidActiveCells'],
+                    'classDiameter': float(data['voidClassDiameter']),
+                }
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return checkpoint
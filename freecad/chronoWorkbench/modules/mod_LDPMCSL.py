@@ -297,6 +297,12 @@ class inputWindow_LDPMCSL:
 
         paraFile = self.form[0].setupFile.text()
 
+        # Parameters missing from older files
+        placementSeed = ""
+        checkpointInterval = 0
+        placementResume = "Off"
+        periodicToggle = "Off"
+
         # Read parameters from file
         with open(Path(paraFile), "r") as f:
             for line in f:
@@ -312,6 +318,12 @@ class inputWindow_LDPMCSL:
                     maxIter = int(line.split("=")[1].strip())
                 elif "placementAlg" in line:
                     placementAlg = line.split("=")[1].strip()
+                elif "placementSeed" in line:
+                    placementSeed = line.split("=")[1].strip()
+                elif "checkpointInterval" in line:
+                    checkpointInterval = int(line.split("=")[1].strip())
+                elif "placementResume" in line:
+                    placementResume = line.split("=")[1].strip()
                 elif "geoType" in line:
                     geoType = line.split("=")[1].strip()
                 elif "dimensions" in line:
@@ -357,6 +369,8 @@ class inputWindow_LDPMCSL:
                     fillerDensity = float(line.split("=")[1].strip())
                 elif "airFrac2" in line:
                     airFrac2 = float(line.split("=")[1].strip())
+                elif "periodicToggle" in line:
+                    periodicToggle = line.split("=")[1].strip()
                 elif "outputDir" in line:
                     outputDir = line.split("=")[1].strip()
 
@@ -382,6 +396,9 @@ class inputWindow_LDPMCSL:
         self.form[0].numPIncBox.setValue(numIncrements)
         self.form[0].numIncBox.setValue(maxIter)
         self.form[0].placementAlg.setCurrentText(placementAlg)
+        self.form[0].placementSeed.setText(placementSeed)
+        self.form[0].checkpointInterval.setValue(checkpointInterval)
+        self.form[0].placementResume.setCurrentText(placementResume)
         self.form[1].geometryType.setCurrentText(geoType)
         if geoType == "Box":
             self.form[1].boxLength.setProperty('rawValue',(dimensions[0]))
@@ -452,6 +469,7 @@ class inputWindow_LDPMCSL:
         self.form[3].fillerContent.setText(str(fillerC))
         self.form[3].fillerDensity.setText(str(fillerDensity))
         self.form[3].airFracArb.setValue(airFrac2)
+        self.form[4].periodicToggle.setCurrentText(periodicToggle)
         self.form[5].outputDir.setText(outputDir)
 
 
@@ -492,13 +510,13 @@ class inputWindow_LDPMCSL:
 
         # Read in inputs from input panel just to get location for file output
         [setupFile, constitutiveEQ, matParaSet, \
-            numCPU, numIncrements,maxIter,placementAlg,\
+            numCPU, numIncrements,maxIter,placementAlg,placementSeed,checkpointInterval,placementResume,\
             geoType, dimensions, cadFile,\
             minPar, maxPar, fullerCoef, sieveCurveDiameter, sieveCurvePassing,\
             wcRatio, densityWater, cementC, flyashC, silicaC, scmC,\
             cementDensity, flyashDensity, silicaDensity, scmDensity, airFrac1, \
             fillerC, fillerDensity, airFrac2,\
-            htcToggle, htcLength,\
+            htcToggle, htcLength, periodicToggle,\
             multiMatToggle,aggFile,multiMatFile,multiMatRule,\
             grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP,\
             grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP,\
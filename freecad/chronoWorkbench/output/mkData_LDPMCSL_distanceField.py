@@ -0,0 +1,43 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to write the signed distance field of a geometry to a file so
+## that later runs on the same surface mesh can reuse it.
+##
+## ===========================================================================
+
+from pathlib import Path
+import numpy as np
+
+
+def mkData_LDPMCSL_distanceField(distanceField,meshHash,filePath):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - distanceField:    Signed distance field (see gen_LDPMCSL_distanceField
+                        or gen_LDPMCSL_analyticField)
+    - meshHash:         Hash of the surface mesh the field was built from
+    - filePath:         Path of the file to write
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - A compressed NumPy file with the distance field
+    --------------------------------------------------------------------------
+    """
+
+    with open(Path(filePath), 'wb') as f:
+        np.savez_compressed(f, meshHash=meshHash, **distanceField)
@@ -0,0 +1,51 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to write the particle diameters drawn for a mix design to a file
+## so that later runs with the same mix design, grading and seed can reuse
+## them. The file is written under a name of this process and then swapped
+## in, so processes writing the same file at once do not corrupt it.
+##
+## ===========================================================================
+
+import os
+from pathlib import Path
+import numpy as np
+
+
+def mkData_LDPMCSL_particleDiameters(particleDiameters,mixHash,filePath):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - particleDiameters: Particle diameters and volume fractions (see
+                        gen_LDPMCSL_particleDiameters)
+    - mixHash:          Hash of the mix design, grading and seed
+    - filePath:         Path of the file to write
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - A NumPy file with the particle diameters (not compressed, as random
+      diameters do not compress)
+    --------------------------------------------------------------------------
+    """
+
+    tempFile = Path(str(filePath) + '.' + str(os.getpid()) + '.tmp')
+
+    with open(tempFile, 'wb') as f:
+        np.savez(f, mixHash=mixHash, **particleDiameters)
+
+    os.replace(tempFile, Path(filePath))
@@ -0,0 +1,74 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to generate and write a data file of the tetrahedra of a periodic
+## LDPM/CSL model, for later use in Project Chrono. Each tet refers to the
+## particle nodes of the box, with the periodic shift of each of its nodes.
+##
+## ===========================================================================
+
+from pathlib import Path
+import numpy as np
+
+def mkData_LDPMCSL_periodicTets(geoName,tempPath,allTets,periodicIndex,periodicShift,boxLength):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - geoName:          Name of the geometry file
+    - tempPath:         Path to the temporary directory
+    - allTets:          Array of all tetrahedra in the model (one-indexed)
+    - periodicIndex:    Index of the particle of each node
+    - periodicShift:    Periodic shift of each node (in box lengths)
+    - boxLength:        Dimensions of the periodic box
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - A data file of all tetrahedra of the periodic model
+    --------------------------------------------------------------------------
+    """
+
+    allTets = allTets.astype(int)-1
+
+    periodicTets = np.hstack((periodicIndex[allTets],\
+        periodicShift[allTets].reshape(len(allTets),12)))
+
+    np.savetxt(Path(tempPath + geoName + \
+        '-data-periodicTets.dat'), periodicTets.astype(int), fmt='%i', delimiter=' ', comments=''\
+        ,header='\
+// ================================================================================\n\
+// CHRONO WORKBENCH - github.com/Concrete-Chrono-Development/chrono-preprocessor\n\
+//\n\
+// Copyright (c) 2023 \n\
+// All rights reserved. \n\
+//\n\
+// Use of the code that generated this file is governed by a BSD-style license that\n\
+// can be found in the LICENSE file at the top level of the distribution and at\n\
+// github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE\n\
+//\n\
+// ================================================================================\n\
+// Periodic Tetrahedra Data File\n\
+// ================================================================================\n\
+//\n\
+// Periodic Box Dimensions: ' + ' '.join('%.10g' % x for x in boxLength) + '\n\
+//\n\
+// Data Structure:\n\
+// Node 1 Node 2 Node 3 Node 4 Shift 1 (X Y Z) Shift 2 (X Y Z) Shift 3 (X Y Z) Shift 4 (X Y Z)\n\
+// Note: Node numbers are zero-indexed and refer to the first nodes of the node\n\
+// data file (the particles of the box). The position of node i of a tet is the\n\
+// position of its particle plus Shift i times the box dimensions.\n\
+//\n\
+// ================================================================================')
@@ -0,0 +1,83 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to write a checkpoint of the particle placement so that an
+## interrupted generation can continue from it. The random streams only
+## depend on the seed and the particle, so the placed particles, the next
+## particle and the trial budget are all that is needed to resume, with the
+## end of the size class handed back by the hybrid fill and the void map of
+## the void-tracking placement (its usable cells depend on the order the
+## particles were placed in). The file is written next to the previous checkpoint and then swapped in, so an
+## interruption while writing keeps the previous one.
+##
+## ===========================================================================
+
+import os
+import json
+from pathlib import Path
+import numpy as np
+
+
+def mkData_LDPMCSL_placementCheckpoint(filePath,checkpointHash,internalNodes,placed,particleID,\
+    nextParticle,material,newMaxIter,controller,serialEnd=0,voidMap=None):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - filePath:         Path of the file to write
+    - checkpointHash:   Hash of the geometry, seed and particle list of the
+                        generation
+    - internalNodes:    Nodes of the particles
+    - placed:           Mask of the placed particles
+    - particleID:       ID of each particle (multi-material)
+    - nextParticle:     Index of the next particle to place serially (in the
+                        list of the material)
+    - material:         Material being placed (multi-material)
+    - newMaxIter:       Current number of candidates drawn at once
+    - controller:       Placement controller (see
+                        gen_LDPMCSL_placementController)
+    - serialEnd:        End of the particles placed serially (hybrid
+                        placement)
+    - voidMap:          Void map of the placement (optional, see
+                        gen_LDPMCSL_voidMap)
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - A compressed NumPy file with the state of the placement
+    --------------------------------------------------------------------------
+    """
+
+    tempFile = Path(str(filePath) + '.tmp')
+
+    voidState = {}
+    if voidMap is not None:
+        voidState = {'voidFreeRadius': voidMap['freeRadius'],
+            'voidActiveCells': voidMap['activeCells'],
+            'voidClassDiameter': float(voidMap['classDiameter'])}
+
+    with open(tempFile, 'wb') as f:
+        np.savez_compressed(f, checkpointHash=checkpointHash,
+            internalNodes=internalNodes,
+            placed=placed,
+            particleID=particleID,
+            nextParticle=int(nextParticle),
+            material=int(material),
+            newMaxIter=int(newMaxIter),
+            controller=json.dumps(controller, default=lambda value: value.item()),
+            serialEnd=int(serialEnd),
+            **voidState)
+
+    os.replace(tempFile, Path(filePath))
@@ -0,0 +1,68 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to write a report of the particle placement when it did not go
+## as requested: the particle offset was relaxed or the placement stopped
+## before all particles were placed.
+##
+## ===========================================================================
+
+from pathlib import Path
+import numpy as np
+
+
+def mkData_LDPMCSL_placementReport(controller,parDiameterList,placed,filePath):
+
+    """
+    Variables:
+    --------------------------------------------------------------------------
+    ### Inputs ###
+    - controller:       Placement controller (see
+                        gen_LDPMCSL_placementController)
+    - parDiameterList:  List of the requested particle diameters
+    - placed:           Mask of the placed particles
+    - filePath:         Path of the file to write
+    --------------------------------------------------------------------------
+    ### Outputs ###
+    - report:           Text of the report, also written to a data file
+    --------------------------------------------------------------------------
+    """
+
+    parVolume = np.pi/6*np.asarray(parDiameterList)**3
+    volumePlaced = np.sum(parVolume[placed])/np.sum(parVolume)
+
+    lines = ['Particles placed: %d of %d' % (np.count_nonzero(placed), len(placed)),
+        'Particle volume placed: %.2f%%' % (100*volumePlaced),
+        'Particle offset: %g (requested %g, relaxed %d times)' % (controller['parOffset'],\
+            controller['initialOffset'], controller['relaxCount'])]
+
+    # Placement by collective rearrangement has no trials per particle
+    if controller['totalTrials'] > 0:
+        lines.append('Mean trials per particle: %.1f' % (controller['totalTrials']/max(controller['nPlaced'],1)))
+
+    if controller['failedIndex'] >= 0 and controller['totalTrials'] > 0:
+        lines.append('Placement stopped at particle %d (diameter %g) after %d trials' % (controller['failedIndex'],\
+            parDiameterList[controller['failedIndex']], controller['maxIter']))
+    elif controller['failedIndex'] >= 0:
+        lines.append('Placement stopped with particle %d (diameter %g) not placed' % (controller['failedIndex'],\
+            parDiameterList[controller['failedIndex']]))
+
+    report = '\n'.join(lines)
+
+    with open(Path(filePath), 'w') as f:
+        f.write(report + '\n')
+
+    return report
@@ -30,13 +30,13 @@ def mkParameters(self,elementSet,tempPath):
     # Read in inputs from input panel
     if elementSet == "LDPMCSL":
         [setupFile, constitutiveEQ, matParaSet, \
-            numCPU, numIncrements,maxIter,placementAlg,\
+            numCPU, numIncrements,maxIter,placementAlg,placementSeed,checkpointInterval,placementResume,\
             geoType, dimensions, cadFile,\
             minPar, maxPar, fullerCoef, sieveCurveDiameter, sieveCurvePassing,\
             wcRatio, densityWater, cementC, flyashC, silicaC, scmC,\
             cementDensity, flyashDensity, silicaDensity, scmDensity, airFrac1, \
             fillerC, fillerDensity, airFrac2,\
-            htcToggle, htcLength,\
+            htcToggle, htcLength, periodicToggle,\
             multiMatToggle,aggFile,multiMatFile,multiMatRule,\
             grainAggMin, grainAggMax, grainAggFuller, grainAggSieveD, grainAggSieveP,\
             grainITZMin, grainITZMax, grainITZFuller, grainITZSieveD, grainITZSieveP,\
@@ -93,6 +93,9 @@ def mkParameters(self,elementSet,tempPath):
             f.write("numIncrements = " + str(numIncrements) + "\n")
             f.write("maxIter = " + str(maxIter) + "\n")
             f.write("placementAlg = " + placementAlg + "\n")
+            f.write("placementSeed = " + placementSeed + "\n")
+            f.write("checkpointInterval = " + str(checkpointInterval) + "\n")
+            f.write("placementResume = " + placementResume + "\n")
             f.write("geoType = " + geoType + "\n")
             f.write("dimensions = " + str(dimensions) + "\n")
             f.write("cadFile = " + cadFile + "\n")
@@ -117,6 +120,7 @@ def mkParameters(self,elementSet,tempPath):
             f.write("airFrac2 = " + str(airFrac2) + "\n")
             f.write("htcToggle = " + htcToggle + "\n")
             f.write("htcLength = " + str(htcLength) + "\n")
+            f.write("periodicToggle = " + periodicToggle + "\n")
             f.write("multiMatToggle = " + multiMatToggle + "\n")
             f.write("multiMatFile = " + multiMatFile + "\n")
             f.write("aggFile = " + aggFile + "\n")
@@ -0,0 +1,73 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to attach, from a worker process, to arrays shared by
+## cwShareArrays. No data is copied.
+##
+## ===========================================================================
+
+import numpy as np
+from multiprocessing import shared_memory
+
+
+def cwAttachArrays(descriptors):
+
+        """
+        Variables:
+        --------------------------------------------------------------------------
+        ### Inputs ###
+        - descriptors:  Descriptors returned by cwShareArrays
+        --------------------------------------------------------------------------
+        ### Outputs ###
+        - arrays:       Same structure with numpy views into shared memory
+        - sharedMemory: List of the attached shared memory blocks (must be
+                        kept alive as long as the views are used)
+        --------------------------------------------------------------------------
+        """
+
+        sharedMemory = []
+
+        if isinstance(descriptors, dict):
+            arrays = {}
+            for key, value in descriptors.items():
+                [arrays[key], blocks] = cwAttachArrays(value)
+                sharedMemory.extend(blocks)
+
+        elif isinstance(descriptors, list):
+            arrays = []
+            for value in descriptors:
+                [array, blocks] = cwAttachArrays(value)
+                arrays.append(array)
+                sharedMemory.extend(blocks)
+
+        elif descriptors[0] == 'sharedArray':
+            [name, shape, dtype] = descriptors[1:4]
+
+            # Only the owner unlinks the blocks, so they are not tracked here
+            # when the Python version allows it (pool workers otherwise share
+            # the resource tracker of the owner)
+            try:
+                block = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                block = shared_memory.SharedMemory(name=name)
+
+            arrays = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            sharedMemory.append(block)
+
+        else:
+            arrays = descriptors[1]
+
+        return arrays, sharedMemory
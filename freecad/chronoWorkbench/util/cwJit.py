@@ -0,0 +1,46 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to compile a kernel with Numba when it is installed. Numba is an
+## optional dependency: without it no kernel is compiled and the callers use
+## their NumPy implementation instead.
+##
+## ===========================================================================
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def cwJit(kernel):
+
+        """
+        Variables:
+        --------------------------------------------------------------------------
+        ### Inputs ###
+        - kernel:       Python function written with loops over numpy arrays
+                        only (no dictionaries or Python objects)
+        --------------------------------------------------------------------------
+        ### Outputs ###
+        - Compiled function, or None if Numba is not installed
+        --------------------------------------------------------------------------
+        """
+
+        if numba is None:
+            return None
+
+        return numba.njit(cache=True, nogil=True)(kernel)
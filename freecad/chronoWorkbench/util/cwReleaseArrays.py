@@ -0,0 +1,66 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to copy arrays shared by cwShareArrays back into private memory
+## and free the shared memory blocks.
+##
+## ===========================================================================
+
+import numpy as np
+
+
+def cwReleaseArrays(shared, sharedMemory):
+
+        """
+        Variables:
+        --------------------------------------------------------------------------
+        ### Inputs ###
+        - shared:       Structure returned by cwShareArrays. Its dictionaries
+                        and lists are emptied so that no view into the shared
+                        memory is left (other references must be dropped by
+                        the caller beforehand).
+        - sharedMemory: List of the shared memory blocks to free
+        --------------------------------------------------------------------------
+        ### Outputs ###
+        - arrays:       Same structure with private copies of the arrays
+        --------------------------------------------------------------------------
+        """
+
+        def copyArrays(value):
+            if isinstance(value, dict):
+                copied = {key: copyArrays(item) for key, item in value.items()}
+                value.clear()
+                return copied
+            if isinstance(value, list):
+                copied = [copyArrays(item) for item in value]
+                value.clear()
+                return copied
+            if isinstance(value, np.ndarray):
+                return np.array(value)
+            return value
+
+        arrays = copyArrays(shared)
+        shared = None
+
+        for block in sharedMemory:
+            try:
+                block.close()
+            except BufferError:
+                # A view is still referenced; the block is freed with it
+                pass
+            block.unlink()
+
+        return arrays
@@ -0,0 +1,75 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## Function to move numpy arrays (alone or nested in dictionaries and lists)
+## into shared memory so worker processes can attach to them by name
+## instead of receiving a pickled copy.
+##
+## ===========================================================================
+
+import numpy as np
+from multiprocessing import shared_memory
+
+
+def cwShareArrays(arrays):
+
+        """
+        Variables:
+        --------------------------------------------------------------------------
+        ### Inputs ###
+        - arrays:       Numpy array, or dictionary/list holding numpy arrays
+                        and other (small, picklable) values
+        --------------------------------------------------------------------------
+        ### Outputs ###
+        - shared:       Same structure with every numpy array replaced by a
+                        view into shared memory
+        - sharedMemory: List of the shared memory blocks (kept by the owner
+                        and released with cwReleaseArrays)
+        - descriptors:  Same structure with every numpy array replaced by the
+                        name, shape and type of its block (see cwAttachArrays)
+        --------------------------------------------------------------------------
+        """
+
+        sharedMemory = []
+
+        if isinstance(arrays, dict):
+            shared = {}
+            descriptors = {}
+            for key, value in arrays.items():
+                [shared[key], blocks, descriptors[key]] = cwShareArrays(value)
+                sharedMemory.extend(blocks)
+
+        elif isinstance(arrays, (list, tuple)):
+            shared = []
+            descriptors = []
+            for value in arrays:
+                [sharedValue, blocks, descriptor] = cwShareArrays(value)
+                shared.append(sharedValue)
+                descriptors.append(descriptor)
+                sharedMemory.extend(blocks)
+
+        elif isinstance(arrays, np.ndarray) and not arrays.dtype.hasobject:
+            block = shared_memory.SharedMemory(create=True, size=max(arrays.nbytes, 1))
+            shared = np.ndarray(arrays.shape, dtype=arrays.dtype, buffer=block.buf)
+            shared[...] = arrays
+            sharedMemory.append(block)
+            descriptors = ('sharedArray', block.name, arrays.shape, arrays.dtype.str)
+
+        else:
+            shared = arrays
+            descriptors = ('value', arrays)
+
+        return shared, sharedMemory, descriptors
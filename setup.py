@@ -36,4 +36,5 @@ setup(name='freecad.chronoWorkbench',
       url="TBD",
       description="Chrono Workbench",
       install_requires=['numpy','math','time'], 
+      extras_require={'jit': ['numba']},
       include_package_data=True)
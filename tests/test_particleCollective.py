@@ -0,0 +1,125 @@
+## ===========================================================================
+## CHRONO WORKBENCH:github.com/Concrete-Chrono-Development/chrono-preprocessor
+##
+## Copyright (c) 2023
+## All rights reserved.
+##
+## Use of this source code is governed by a BSD-style license that can be
+## found in the LICENSE file at the top level of the distribution and at
+## github.com/Concrete-Chrono-Development/chrono-preprocessor/blob/main/LICENSE
+##
+## ===========================================================================
+## Developed by Northwestern University
+## For U.S. Army ERDC Contract No. W9132T22C0015
+## Primary Authors: Matthew Troemner
+## ===========================================================================
+##
+## This file contains the test comparing the collective rearrangement with
+## the random sequential addition (Trial-and-Error) on the same mix in a
+## cube, placed as in driver_LDPMCSL: the particles taken out of the jammed
+## packing are inserted one by one against it, relaxing the offset when the
+## trial budget runs out.
+##
+## ===========================================================================
+
+import numpy as np
+
+from freecad.chronoWorkbench.generation.check_LDPMCSL_packing              import check_LDPMCSL_packing
+from freecad.chronoWorkbench.generation.check_LDPMCSL_placementRetry       import check_LDPMCSL_placementRetry
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_cellList               import gen_LDPMCSL_cellList
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_placementController    import gen_LDPMCSL_placementController
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_surfaceBVH             import gen_LDPMCSL_surfaceBVH
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetSampler             import gen_LDPMCSL_tetSampler
+from freecad.chronoWorkbench.generation.gen_LDPMCSL_tetTree                import gen_LDPMCSL_tetTree
+from freecad.chronoWorkbench.generation.gen_particle                       import gen_particle
+from freecad.chronoWorkbench.generation.gen_particleCollective             import gen_particleCollective
+from freecad.chronoWorkbench.generation.update_LDPMCSL_cellList            import update_LDPMCSL_cellList
+from freecad.chronoWorkbench.generation.update_LDPMCSL_placementController import update_LDPMCSL_placementController
+
+
+def cubeMesh(nDiv, length):
+
+    # Tet mesh of a cube (six tets per sub-cube, 1-based) and its surface
+    # triangles oriented outward
+    grid = np.linspace(0, length, nDiv + 1)
+    vertices = np.stack(np.meshgrid(grid, grid, grid, indexing='ij'), axis=-1).reshape(-1, 3)
+    corner = lambda i, j, k: (i*(nDiv + 1) + j)*(nDiv + 1) + k
+    tets = []
+    for i in range(nDiv):
+        for j in range(nDiv):
+            for k in range(nDiv):
+                c = [corner(i+a, j+b, k+d) for a in (0, 1) for b in (0, 1) for d in (0, 1)]
+                for [a, b] in [(c[4], c[6]), (c[4], c[5]), (c[2], c[6]), (c[2], c[3]), (c[1], c[5]), (c[1], c[3])]:
+                    tets.append([c[0], a, b, c[7]])
+    tets = np.array(tets) + 1
+
+    faces = np.sort(np.vstack([tets[:, [0, 1, 2]], tets[:, [0, 1, 3]], tets[:, [0, 2, 3]], tets[:, [1, 2, 3]]]), axis=1)
+    [faces, counts] = np.unique(faces, axis=0, return_counts=True)
+    faces = faces[counts == 1] - 1
+    surfaceIndex = np.unique(faces)
+    remap = np.zeros(len(vertices), dtype=int)
+    remap[surfaceIndex] = np.arange(len(surfaceIndex))
+    [surfaceNodes, surfaceFaces] = [vertices[surfaceIndex], remap[faces]]
+    normal = np.cross(surfaceNodes[surfaceFaces[:, 1]] - surfaceNodes[surfaceFaces[:, 0]],\
+        surfaceNodes[surfaceFaces[:, 2]] - surfaceNodes[surfaceFaces[:, 0]])
+    flip = np.einsum('ij,ij->i', normal, surfaceNodes[surfaceFaces].mean(axis=1) - length/2) < 0
+    surfaceFaces[flip] = surfaceFaces[flip][:, [0, 2, 1]]
+
+    return vertices, tets, surfaceNodes, surfaceFaces
+
+
+def placeParticles(useCollective, nPar=1122, fraction=0.42, maxIter=10000, seed=7):
+
+    # Fuller-type mix of diameters 1 to 4 in a cube sized for the fraction
+    [minPar, maxPar] = [1.0, 4.0]
+    rng = np.random.default_rng(3)
+    parDiameterList = np.sort(minPar*(1 - rng.random(nPar)*(1 - (minPar/maxPar)**2.5))**(-1/2.5))[::-1]
+    length = (np.sum(np.pi/6*parDiameterList**3)/fraction)**(1/3)
+    [vertices, tets, surfaceNodes, surfaceFaces] = cubeMesh(10, length)
+    coords = [vertices[tets[:, i]-1] for i in range(4)]
+    [minC, maxC] = [np.min(vertices, axis=0), np.max(vertices, axis=0)]
+    parOffset = 0.2*minPar
+
+    surfaceBVH = gen_LDPMCSL_surfaceBVH(surfaceNodes, surfaceFaces)
+    tetSampler = gen_LDPMCSL_tetSampler(vertices, tets)
+    tetTree = gen_LDPMCSL_tetTree(vertices, tets)
+    cellList = gen_LDPMCSL_cellList(minC, maxC, maxPar, parOffset, minPar)
+    controller = gen_LDPMCSL_placementController(maxIter, parOffset)
+    newMaxIter = controller['bufferSize']
+
+    internalNodes = (np.zeros((nPar, 3)) + 2)*maxC
+    placed = np.zeros(nPar, dtype=bool)
+    if useCollective:
+        [internalNodes, placed] = gen_particleCollective(parDiameterList, vertices, tets, length**3, minPar,\
+            parOffset, surfaceBVH, None, tetSampler, seed)
+        for x in np.flatnonzero(placed):
+            update_LDPMCSL_cellList(cellList, x, internalNodes[x, :], parDiameterList[x])
+        controller['nPlaced'] = np.count_nonzero(placed)
+
+    for x in np.flatnonzero(~placed):
+        node = None
+        while node is None:
+            [newMaxIter, node, iterReq] = gen_particle(surfaceNodes, parDiameterList[x], vertices, tets, newMaxIter,\
+                maxIter, minPar, maxPar, controller['parOffset'], parDiameterList, *coords, 1.0, 0, internalNodes,\
+                cellList, surfaceBVH, tetTree, None, tetSampler, seed, x)
+            if node is None and not check_LDPMCSL_placementRetry(controller, x):
+                break
+        if node is None:
+            break
+        newMaxIter = update_LDPMCSL_placementController(controller, iterReq)
+        internalNodes[x, :] = node
+        update_LDPMCSL_cellList(cellList, x, node, parDiameterList[x])
+        placed[x] = True
+
+    check_LDPMCSL_packing(internalNodes[placed], parDiameterList[placed], minPar, controller['parOffset'], surfaceBVH)
+
+    return np.sum(parDiameterList[placed]**3)/np.sum(parDiameterList**3)
+
+
+def test_collectiveBeatsTrialAndError():
+
+    # Near jamming, the trial-and-error placement stops early while the
+    # collective rearrangement keeps most of the particle volume
+    collectiveFraction = placeParticles(True)
+    trialFraction = placeParticles(False)
+    assert collectiveFraction > trialFraction